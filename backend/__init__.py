@@ -1,17 +1,39 @@
-from .simbolo import Simbolo
-from .simbolo_comum import SimboloComum
-from .simbolo_especial import SimboloEspecial
-from .usuario import Usuario
-from .roleta import Roleta
-from .maquina import Maquina
-from .autenticacao import SistemaAutenticacao
+import importlib
 
-__all__ = [
-    'Simbolo',
-    'SimboloComum',
-    'SimboloEspecial',
-    'Usuario',
-    'Roleta',
-    'Maquina',
-    'SistemaAutenticacao'
-]
+
+# Cada nome é importado do seu módulo no primeiro acesso: quem só precisa de uma parte do backend
+# (a interface até a primeira tela, o simulador) não paga a importação do resto
+_MODULOS = {
+    'Simbolo': 'simbolo',
+    'SimboloComum': 'simbolo_comum',
+    'SimboloEspecial': 'simbolo_especial',
+    'Usuario': 'usuario',
+    'FluxoPadrao': 'gerador',
+    'FluxoAleatorio': 'gerador',
+    'Roleta': 'roleta',
+    'Maquina': 'maquina',
+    'RepositorioUsuarios': 'repositorio',
+    'RepositorioJson': 'repositorio_json',
+    'RepositorioSqlite': 'repositorio_sqlite',
+    'SistemaAutenticacao': 'autenticacao',
+    'GravadorAssincrono': 'gravador',
+    'RegistroEventos': 'eventos',
+    'ConsoleEventos': 'eventos',
+    'ArquivoEventos': 'eventos',
+    'Metricas': 'metricas',
+    'ServidorMetricas': 'metricas'
+}
+
+__all__ = list(_MODULOS)
+
+
+def __getattr__(nome: str):
+    if nome not in _MODULOS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f".{_MODULOS[nome]}", __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
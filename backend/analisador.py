@@ -0,0 +1,99 @@
+from fractions import Fraction
+from itertools import product
+from .regras import classificar_combinacao, CLASSES_COMBINACAO
+from .simbolo_especial import SimboloEspecial
+
+
+_cache_analises = {}
+_cache_tabelas = {}
+
+
+def chave_configuracao(roletas) -> tuple:
+    return tuple(
+        tuple(
+            (type(s).__name__, s.nome, s.icone, s.calcular_premio(1.0),
+             isinstance(s, SimboloEspecial) and s.eh_coringa)
+            for s in roleta.simbolos
+        ) + (tuple(roleta.pesos),)
+        for roleta in roletas
+    )
+
+
+def analisar_maquina(maquina) -> dict:
+    return analisar_roletas(maquina.roletas)
+
+
+def analisar_roletas(roletas) -> dict:
+    chave = chave_configuracao(roletas)
+    if chave not in _cache_analises:
+        _cache_analises[chave] = _analisar(roletas)
+    return _cache_analises[chave]
+
+
+def compilar_tabela(roletas) -> tuple:
+    chave = chave_configuracao(roletas)
+    if chave not in _cache_tabelas:
+        # As fitas repetem os mesmos objetos de símbolo: cada trinca distinta é classificada uma vez só
+        resultados = {}
+        tabela = []
+        for simbolos in product(*(roleta.simbolos for roleta in roletas)):
+            trinca = tuple(map(id, simbolos))
+            resultado = resultados.get(trinca)
+            if resultado is None:
+                classe, vencedor, fator = classificar_combinacao(simbolos)
+                resultado = resultados[trinca] = (False, 0.0, 0) if vencedor is None else \
+                    (True, vencedor.calcular_premio(1.0), fator)
+            tabela.append(resultado)
+        _cache_tabelas[chave] = tuple(tabela)
+    return _cache_tabelas[chave]
+
+
+def _analisar(roletas) -> dict:
+    fitas = [roleta.simbolos for roleta in roletas]
+    pesos = [[Fraction(peso) for peso in roleta.pesos] for roleta in roletas]
+    total = len(fitas[0]) * len(fitas[1]) * len(fitas[2])
+    peso_total = sum(pesos[0]) * sum(pesos[1]) * sum(pesos[2])
+    
+    # Cada combinação de paradas pesa o produto dos pesos das três paradas
+    contagem = {}
+    for simbolos, (peso1, peso2, peso3) in zip(product(*fitas), product(*pesos)):
+        classe, vencedor, fator = classificar_combinacao(simbolos)
+        chave = (classe, vencedor.nome if vencedor else "")
+        if chave not in contagem:
+            multiplicador = vencedor.calcular_premio(1.0) * fator if vencedor else 0.0
+            contagem[chave] = [vencedor, multiplicador, 0, Fraction(0)]
+        contagem[chave][2] += 1
+        contagem[chave][3] += peso1 * peso2 * peso3
+    
+    linhas = []
+    rtp = Fraction(0)
+    acertos = Fraction(0)
+    for (classe, nome), (vencedor, multiplicador, combinacoes, peso) in contagem.items():
+        probabilidade = peso / peso_total
+        contribuicao = probabilidade * Fraction(multiplicador)
+        rtp += contribuicao
+        if vencedor:
+            acertos += probabilidade
+        linhas.append({
+            "classe": classe,
+            "simbolo": nome,
+            "icone": vencedor.icone if vencedor else "",
+            "multiplicador": multiplicador,
+            "combinacoes": combinacoes,
+            "probabilidade": probabilidade,
+            "contribuicao": contribuicao
+        })
+    
+    linhas.sort(key=lambda l: (CLASSES_COMBINACAO.index(l["classe"]), -l["multiplicador"], l["simbolo"]))
+    return {
+        "combinacoes": total,
+        "rtp": rtp,
+        "frequencia_acertos": acertos,
+        "linhas": linhas
+    }
+
+
+def formatar_chance(probabilidade: Fraction) -> str:
+    if probabilidade == 0:
+        return "impossível"
+    return f"1 em {float(1 / probabilidade):,.0f}".replace(",", ".")
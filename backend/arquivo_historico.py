@@ -0,0 +1,54 @@
+import json
+import os
+from urllib.parse import quote
+from .colunas import COLUNAS_HISTORICO
+from .eventos import eventos, AVISO
+
+
+class ArquivoHistorico:
+    """Histórico antigo em disco, um arquivo binário em colunas por bloco de tamanho fixo."""
+    
+    def __init__(self, diretorio: str, tamanho_bloco: int = 1000):
+        self._diretorio = diretorio
+        self._tamanho_bloco = tamanho_bloco
+    
+    @property
+    def tamanho_bloco(self) -> int:
+        return self._tamanho_bloco
+    
+    def _caminho(self, nome: str, tipo: str, bloco: int, extensao: str = "col") -> str:
+        return os.path.join(self._diretorio, quote(nome, safe=""), f"{tipo}-{bloco}.{extensao}")
+    
+    def gravar(self, nome: str, tipo: str, bloco: int, itens: list):
+        # Gravar o mesmo bloco de novo é inofensivo: as posições arquivadas nunca mudam
+        caminho = self._caminho(nome, tipo, bloco)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = caminho + ".tmp"
+        with open(temporario, 'wb') as arquivo:
+            arquivo.write(COLUNAS_HISTORICO[tipo](itens).para_bytes())
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+    
+    def ler(self, nome: str, tipo: str, inicio: int, fim: int) -> list:
+        itens = []
+        for bloco in range(inicio // self._tamanho_bloco, -(-fim // self._tamanho_bloco)):
+            try:
+                conteudo = self._ler_bloco(nome, tipo, bloco)
+            except (IOError, ValueError):
+                eventos.emitir(AVISO, "bloco_indisponivel", usuario=nome, bloco=bloco,
+                               mensagem=f"⚠️ Aviso: Bloco {bloco} do histórico de '{nome}' indisponível.")
+                continue
+            base = bloco * self._tamanho_bloco
+            # Só os registros pedidos viram dicts
+            itens.extend(conteudo.faixa(max(inicio - base, 0), fim - base))
+        return itens
+    
+    def _ler_bloco(self, nome: str, tipo: str, bloco: int):
+        try:
+            with open(self._caminho(nome, tipo, bloco), 'rb') as arquivo:
+                return COLUNAS_HISTORICO[tipo].de_bytes(arquivo.read())
+        except FileNotFoundError:
+            # Blocos gravados antes do formato em colunas
+            with open(self._caminho(nome, tipo, bloco, "json"), 'r', encoding='utf-8') as arquivo:
+                return COLUNAS_HISTORICO[tipo](json.load(arquivo))
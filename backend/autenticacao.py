@@ -1,50 +1,68 @@
-import json
-import os
+import threading
+import weakref
 from .usuario import Usuario
+from .historico import HistoricoPaginado
+from .colunas import COLUNAS_HISTORICO
+from .indice_usuarios import CAMPOS_INDEXADOS, ROTULOS_CAMPOS, candidatos_chave_pix
+from .repositorio import RepositorioUsuarios
+from .repositorio_json import RepositorioJson
+from .repositorio_sqlite import RepositorioSqlite
+from .eventos import eventos, INFO, AVISO, ERRO
+from .metricas import metricas
+
+
+EXTENSOES_SQLITE = (".db", ".sqlite", ".sqlite3")
+# Entradas de cada histórico carregadas no login; as anteriores são lidas do repositório por página
+HISTORICO_EM_MEMORIA = 500
 
 
 class SistemaAutenticacao:
-    def __init__(self, arquivo_dados: str = "usuarios.json"):
+    def __init__(self, arquivo_dados: str = "usuarios.json", repositorio: RepositorioUsuarios = None):
         self._arquivo_dados = arquivo_dados
-        self._usuarios = self._carregar_usuarios()
-    
-    def _carregar_usuarios(self) -> dict:
-        if not os.path.exists(self._arquivo_dados):
-            return {}
-        
-        try:
-            with open(self._arquivo_dados, 'r', encoding='utf-8') as arquivo:
-                return json.load(arquivo)
-        except (json.JSONDecodeError, IOError):
-            print("⚠️ Aviso: Erro ao carregar dados de usuários. Criando novo arquivo.")
-            return {}
+        if repositorio is None:
+            if arquivo_dados.lower().endswith(EXTENSOES_SQLITE):
+                repositorio = RepositorioSqlite(arquivo_dados)
+            else:
+                repositorio = RepositorioJson(arquivo_dados)
+        self._repositorio = repositorio
+        # Estado já persistido visto por cada sessão (objeto Usuario), para gravar só o que mudou; por objeto,
+        # e não por nome, para que o login de uma segunda sessão não troque a base do compare-and-swap da primeira
+        self._sincronizado = weakref.WeakKeyDictionary()
+        # Sessões que perderam um compare-and-swap: gravar delas sobrescreveria a outra sessão
+        self._em_conflito = weakref.WeakSet()
+        # Só ficam aqui as travas em uso: a de um usuário que saiu é recolhida
+        self._travas = weakref.WeakValueDictionary()
+        self._trava_travas = threading.Lock()
     
-    def _salvar_usuarios(self):
-        try:
-            with open(self._arquivo_dados, 'w', encoding='utf-8') as arquivo:
-                json.dump(self._usuarios, arquivo, indent=4, ensure_ascii=False)
-        except IOError as e:
-            print(f"❌ Erro ao salvar dados: {e}")
+    @property
+    def repositorio(self) -> RepositorioUsuarios:
+        return self._repositorio
     
     def cadastrar(self, nome: str, senha: str, nome_completo: str = "", 
                   cpf: str = "", email: str = "", telefone: str = "") -> bool:
         if not nome or not senha:
-            print("❌ Erro: Nome e senha não podem estar vazios.")
+            eventos.emitir(AVISO, "cadastro_invalido", mensagem="❌ Erro: Nome e senha não podem estar vazios.")
             return False
         
         if len(nome) < 3:
-            print("❌ Erro: Nome deve ter pelo menos 3 caracteres.")
+            eventos.emitir(AVISO, "cadastro_invalido", mensagem="❌ Erro: Nome deve ter pelo menos 3 caracteres.")
             return False
         
         if len(senha) < 4:
-            print("❌ Erro: Senha deve ter pelo menos 4 caracteres.")
+            eventos.emitir(AVISO, "cadastro_invalido", mensagem="❌ Erro: Senha deve ter pelo menos 4 caracteres.")
+            return False
+        
+        if self._repositorio.existe(nome):
+            eventos.emitir(AVISO, "cadastro_duplicado", mensagem="❌ Erro: Usuário já existe.")
             return False
         
-        if nome in self._usuarios:
-            print("❌ Erro: Usuário já existe.")
+        campo = self._campo_em_uso({"cpf": cpf, "email": email, "telefone": telefone})
+        if campo:
+            eventos.emitir(AVISO, "cadastro_duplicado", campo=campo,
+                           mensagem=f"❌ Erro: {ROTULOS_CAMPOS[campo]} já cadastrado para outro usuário.")
             return False
         
-        self._usuarios[nome] = {
+        dados = {
             "senha": senha,
             "saldo": 10.0,
             "nome_completo": nome_completo,
@@ -55,19 +73,69 @@ class SistemaAutenticacao:
             "historico_transacoes": [],
             "historico_jogadas": []
         }
-        self._salvar_usuarios()
-        print(f"✅ Usuário '{nome}' cadastrado com sucesso! Bônus de R$10,00 creditado!")
+        try:
+            inserido = self._repositorio.inserir(nome, dados)
+        except OSError:
+            eventos.emitir(ERRO, "cadastro_falhou", mensagem="❌ Erro: Não foi possível salvar o cadastro.")
+            return False
+        if not inserido:
+            eventos.emitir(AVISO, "cadastro_duplicado", mensagem="❌ Erro: Usuário ou dados de cadastro já existem.")
+            return False
+        eventos.emitir(INFO, "cadastro", usuario=nome,
+                       mensagem=f"✅ Usuário '{nome}' cadastrado com sucesso! Bônus de R$10,00 creditado!")
         return True
     
+    def atualizar_cadastro(self, usuario: Usuario, cpf: str = None, email: str = None, telefone: str = None) -> bool:
+        campos = {campo: valor for campo, valor in (("cpf", cpf), ("email", email), ("telefone", telefone))
+                  if valor is not None}
+        campo = self._campo_em_uso(campos, ignorar=usuario.nome)
+        if campo:
+            eventos.emitir(AVISO, "cadastro_duplicado", campo=campo,
+                           mensagem=f"❌ Erro: {ROTULOS_CAMPOS[campo]} já cadastrado para outro usuário.")
+            return False
+        try:
+            atualizado = self._repositorio.atualizar_cadastro(usuario.nome, campos)
+        except OSError:
+            atualizado = False
+        if not atualizado:
+            eventos.emitir(AVISO, "cadastro_falhou", mensagem="❌ Erro: Não foi possível atualizar o cadastro.")
+            return False
+        usuario.atualizar_cadastro(**campos)
+        return True
+    
+    def _campo_em_uso(self, campos: dict, ignorar: str = None) -> str:
+        for campo in CAMPOS_INDEXADOS:
+            dono = self._repositorio.buscar_por(campo, campos.get(campo) or "")
+            if dono is not None and dono != ignorar:
+                return campo
+        return None
+    
+    def titular_chave_pix(self, chave: str) -> tuple:
+        """(nome, campo) do usuário cujo CPF, email ou telefone é a chave PIX, ou None."""
+        for campo, candidato in candidatos_chave_pix(chave).items():
+            dono = self._repositorio.buscar_por(campo, candidato)
+            if dono is not None:
+                return dono, campo
+        return None
+    
+    def campo_chave_pix(self, nome: str, chave: str) -> str:
+        """Campo do próprio usuário (cpf, email ou telefone) que corresponde à chave PIX, ou None."""
+        for campo, candidato in candidatos_chave_pix(chave).items():
+            if self._repositorio.buscar_por(campo, candidato) == nome:
+                return campo
+        return None
+    
+    def buscar_usuarios(self, campo: str, prefixo: str, limite: int = 20) -> list:
+        return self._repositorio.buscar_prefixo(campo, prefixo, limite)
+    
     def login(self, nome: str, senha: str) -> Usuario:
-        if nome not in self._usuarios:
-            print("❌ Erro: Usuário não encontrado.")
+        dados_usuario = self._repositorio.buscar(nome, recentes=HISTORICO_EM_MEMORIA)
+        if dados_usuario is None:
+            eventos.emitir(AVISO, "login_falhou", mensagem="❌ Erro: Usuário não encontrado.")
             return None
         
-        dados_usuario = self._usuarios[nome]
-        
         if dados_usuario["senha"] != senha:
-            print("❌ Erro: Senha incorreta.")
+            eventos.emitir(AVISO, "login_falhou", mensagem="❌ Erro: Senha incorreta.")
             return None
         
         usuario = Usuario(
@@ -81,19 +149,104 @@ class SistemaAutenticacao:
             chave_pix=dados_usuario.get("chave_pix", "")
         )
         
-        usuario._historico_transacoes = dados_usuario.get("historico_transacoes", [])
-        usuario._historico_jogadas = dados_usuario.get("historico_jogadas", [])
+        usuario._historico_transacoes = self._carregar_historico(nome, "transacoes", dados_usuario)
+        usuario._historico_jogadas = self._carregar_historico(nome, "jogadas", dados_usuario)
+        self._marcar_sincronizado(usuario)
         
-        print(f"✅ Login realizado com sucesso! Bem-vindo, {nome}!")
+        eventos.emitir(INFO, "login", usuario=nome, mensagem=f"✅ Login realizado com sucesso! Bem-vindo, {nome}!")
         return usuario
     
-    def atualizar_saldo(self, usuario: Usuario):
-        if usuario.nome in self._usuarios:
-            self._usuarios[usuario.nome]["saldo"] = usuario.get_saldo()
-            self._usuarios[usuario.nome]["historico_transacoes"] = usuario.get_historico_transacoes()
-            self._usuarios[usuario.nome]["historico_jogadas"] = usuario.get_historico_jogadas()
-            self._usuarios[usuario.nome]["chave_pix"] = usuario.chave_pix
-            self._salvar_usuarios()
+    def movimentar_saldo(self, usuario: Usuario, valor: float, tipo: str) -> bool:
+        # Lança no saldo e persiste na mesma seção crítica do usuário
+        with self._trava_usuario(usuario.nome):
+            if self.em_conflito(usuario) or not usuario.movimentar(valor, tipo):
+                return False
+            return self.atualizar_saldo(usuario)
+    
+    def _carregar_historico(self, nome: str, tipo: str, dados_usuario: dict) -> HistoricoPaginado:
+        recentes = dados_usuario.get("historico_" + tipo, [])
+        return HistoricoPaginado(
+            COLUNAS_HISTORICO[tipo],
+            capacidade=HISTORICO_EM_MEMORIA,
+            total=dados_usuario.get("total_" + tipo, len(recentes)),
+            recentes=recentes,
+            carregar=lambda inicio, fim: self._repositorio.historico(nome, tipo, inicio, fim)
+        )
+    
+    def em_conflito(self, usuario: Usuario) -> bool:
+        """True se esta sessão do usuário foi superada por outra; só um novo login volta a gravar."""
+        return usuario in self._em_conflito
+    
+    @metricas.cronometrado("persistencia")
+    def atualizar_saldo(self, usuario: Usuario) -> bool:
+        with self._trava_usuario(usuario.nome):
+            if usuario in self._em_conflito:
+                return False
+            sincronizado = self._sincronizado.get(usuario) or self._repositorio.resumo(usuario.nome)
+            if sincronizado is None:
+                return False
+            
+            # Fotografia consistente do usuário: nenhuma jogada pode entrar no meio
+            with usuario.trava:
+                saldo = usuario.get_saldo()
+                chave_pix = usuario.chave_pix
+                total_t = len(usuario._historico_transacoes)
+                total_j = len(usuario._historico_jogadas)
+                # Só as entradas novas do histórico são gravadas
+                inicio_t = min(sincronizado["transacoes"], total_t)
+                inicio_j = min(sincronizado["jogadas"], total_j)
+                novas_transacoes = usuario._historico_transacoes.faixa(inicio_t)
+                novas_jogadas = usuario._historico_jogadas.faixa(inicio_j)
+            
+            if (sincronizado["saldo"] == saldo and sincronizado["chave_pix"] == chave_pix
+                    and not novas_transacoes and not novas_jogadas
+                    and inicio_t == sincronizado["transacoes"] and inicio_j == sincronizado["jogadas"]):
+                return True
+            
+            try:
+                gravado = self._repositorio.atualizar(usuario.nome, saldo, chave_pix,
+                                                      inicio_t, novas_transacoes, inicio_j, novas_jogadas,
+                                                      esperado=sincronizado)
+            except OSError as e:
+                # Nada foi gravado: o estado sincronizado continua o mesmo e a próxima tentativa regrava tudo
+                eventos.emitir(ERRO, "gravacao_falhou", usuario=usuario.nome, erro=repr(e),
+                               mensagem=f"❌ Erro ao gravar dados de '{usuario.nome}': {e}")
+                return False
+            if not gravado:
+                self._sincronizado.pop(usuario, None)
+                self._em_conflito.add(usuario)
+                eventos.emitir(ERRO, "saldo_conflito", usuario=usuario.nome,
+                               mensagem=f"❌ Erro: O saldo de '{usuario.nome}' foi alterado por outra sessão. Faça login novamente.")
+                return False
+            
+            self._sincronizado[usuario] = {
+                "saldo": saldo,
+                "chave_pix": chave_pix,
+                "transacoes": total_t,
+                "jogadas": total_j
+            }
+            with usuario.trava:
+                usuario._historico_transacoes.marcar_persistido(total_t)
+                usuario._historico_jogadas.marcar_persistido(total_j)
+            return True
+    
+    def _trava_usuario(self, nome: str) -> threading.RLock:
+        with self._trava_travas:
+            trava = self._travas.get(nome)
+            if trava is None:
+                trava = self._travas[nome] = threading.RLock()
+            return trava
+    
+    def _marcar_sincronizado(self, usuario: Usuario):
+        self._sincronizado[usuario] = {
+            "saldo": usuario.get_saldo(),
+            "chave_pix": usuario.chave_pix,
+            "transacoes": len(usuario._historico_transacoes),
+            "jogadas": len(usuario._historico_jogadas)
+        }
     
     def listar_usuarios(self) -> list:
-        return list(self._usuarios.keys())
+        return self._repositorio.listar_nomes()
+    
+    def fechar(self):
+        self._repositorio.fechar()
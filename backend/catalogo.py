@@ -0,0 +1,35 @@
+from .simbolo_comum import SimboloComum
+from .simbolo_especial import SimboloEspecial
+
+
+# Uma única instância de cada símbolo do jogo, compartilhada por todas as roletas e máquinas.
+# Os ids são gravados no histórico de jogadas: nunca renumere nem reaproveite um id
+CEREJA = SimboloComum("Cereja", "🍒", multiplicador=2.0, id_fixo=0)
+LIMAO = SimboloComum("Limão", "🍋", multiplicador=2.5, id_fixo=1)
+LARANJA = SimboloComum("Laranja", "🍊", multiplicador=3.0, id_fixo=2)
+UVA = SimboloComum("Uva", "🍇", multiplicador=3.5, id_fixo=3)
+MELANCIA = SimboloComum("Melancia", "🍉", multiplicador=4.0, id_fixo=4)
+SINO = SimboloComum("Sino", "🔔", multiplicador=5.0, id_fixo=5)
+ESTRELA = SimboloComum("Estrela", "⭐", multiplicador=5.0, id_fixo=6)
+LEAO = SimboloEspecial("Leão", "🦁", multiplicador=20.0, eh_coringa=True, id_fixo=7)
+DIAMANTE = SimboloEspecial("Diamante", "💎", multiplicador=50.0, eh_coringa=False, id_fixo=8)
+
+CATALOGO = (CEREJA, LIMAO, LARANJA, UVA, MELANCIA, SINO, ESTRELA, LEAO, DIAMANTE)
+_IDS_POR_NOME = {simbolo.nome: simbolo.id for simbolo in CATALOGO}
+_POR_ID = {simbolo.id: simbolo for simbolo in CATALOGO}
+ID_DESCONHECIDO = 255
+
+
+def nome_simbolo(valor) -> str:
+    """Nome para exibição de um símbolo do histórico: id (formato atual) ou nome (registros antigos)."""
+    if isinstance(valor, int):
+        simbolo = _POR_ID.get(valor)
+        return simbolo.nome if simbolo else "?"
+    return valor
+
+
+def id_simbolo(valor) -> int:
+    """Id de um símbolo do histórico, aceitando também o nome gravado pelos registros antigos."""
+    if isinstance(valor, int):
+        return valor if valor in _POR_ID else ID_DESCONHECIDO
+    return _IDS_POR_NOME.get(valor, ID_DESCONHECIDO)
@@ -0,0 +1,164 @@
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from array import array
+from datetime import datetime
+from .catalogo import id_simbolo
+
+
+TIPOS_TRANSACAO = ("Depósito", "Saque", "Apostado", "Ganho")
+# Tipos fora da lista (bônus, ajustes, históricos antigos) são guardados como "Outro" em vez de recusados
+TIPO_OUTRO = "Outro"
+CODIGO_OUTRO = 0xFF
+_CODIGOS_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_TRANSACAO)}
+FORMATO_DATA = "%d/%m/%Y %H:%M:%S"
+SEM_SIMBOLOS = 0xFFFFFFFF
+_CABECALHO = struct.Struct("<4sBI")
+_ASSINATURA = b"HCOL"
+
+
+def agora_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def formatar_data(data) -> str:
+    # Datas novas são milissegundos desde a época; os registros antigos já vinham formatados
+    if isinstance(data, (int, float)):
+        return datetime.fromtimestamp(data / 1000).strftime(FORMATO_DATA)
+    return data or "N/A"
+
+
+def _para_ms(data) -> int:
+    if isinstance(data, (int, float)):
+        return int(data)
+    try:
+        return int(datetime.strptime(data, FORMATO_DATA).timestamp() * 1000)
+    except (TypeError, ValueError):
+        return 0
+
+
+# Faixa das colunas 'q' (int64): valores fora dela não podem ser gravados
+MAXIMO_INT64 = 2 ** 63 - 1
+
+
+def _centavos(valor: float) -> int:
+    centavos = round(valor * 100)
+    if not -MAXIMO_INT64 <= centavos <= MAXIMO_INT64:
+        raise OverflowError(f"Valor fora da faixa do histórico: {valor}")
+    return centavos
+
+
+def cabe_em_centavos(valor: float) -> bool:
+    """True se o valor pode ser gravado no histórico (finito e com centavos dentro de int64)."""
+    try:
+        _centavos(valor)
+    except (ValueError, OverflowError):
+        return False
+    return True
+
+
+class Colunas(ABC):
+    """Registros de histórico guardados coluna a coluna em arrays tipados, sem um dict por registro.
+    
+    Os registros entram e saem como dicts; por dentro são inteiros (centavos, milissegundos, ids).
+    """
+    
+    CAMPOS = ()
+    
+    def __init__(self, registros: list = ()):
+        self._colunas = tuple(array(tipo) for _, tipo in self.CAMPOS)
+        self.estender(registros)
+    
+    def __len__(self) -> int:
+        return len(self._colunas[0])
+    
+    def anexar(self, registro: dict):
+        self.estender((registro,))
+    
+    def estender(self, registros: list):
+        # Tudo é codificado e conferido antes: um registro recusado não deixa colunas de tamanhos diferentes
+        linhas = [self._codificar(registro) for registro in registros]
+        if not linhas:
+            return
+        novas = tuple(array(coluna.typecode, valores) for coluna, valores in zip(self._colunas, zip(*linhas)))
+        for coluna, valores in zip(self._colunas, novas):
+            coluna.extend(valores)
+    
+    def faixa(self, inicio: int, fim: int) -> list:
+        decodificar = self._decodificar
+        return [decodificar(*valores) for valores in zip(*(coluna[inicio:fim] for coluna in self._colunas))]
+    
+    def descartar_inicio(self, quantidade: int):
+        for coluna in self._colunas:
+            del coluna[:quantidade]
+    
+    def para_bytes(self) -> bytes:
+        ordem = 0 if sys.byteorder == "little" else 1
+        return b"".join([_CABECALHO.pack(_ASSINATURA, ordem, len(self))] + [c.tobytes() for c in self._colunas])
+    
+    @classmethod
+    def de_bytes(cls, dados: bytes) -> "Colunas":
+        if len(dados) < _CABECALHO.size:
+            raise ValueError("Bloco de histórico truncado.")
+        assinatura, ordem, quantidade = _CABECALHO.unpack_from(dados)
+        if assinatura != _ASSINATURA:
+            raise ValueError("Bloco de histórico com formato desconhecido.")
+        colunas = cls()
+        posicao = _CABECALHO.size
+        for coluna in colunas._colunas:
+            tamanho = quantidade * coluna.itemsize
+            coluna.frombytes(dados[posicao:posicao + tamanho])
+            posicao += tamanho
+            if ordem != (0 if sys.byteorder == "little" else 1):
+                coluna.byteswap()
+        if posicao != len(dados):
+            raise ValueError("Bloco de histórico truncado.")
+        return colunas
+    
+    @abstractmethod
+    def _codificar(self, registro: dict) -> tuple:
+        pass
+    
+    @abstractmethod
+    def _decodificar(self, *valores) -> dict:
+        pass
+
+
+class ColunasTransacoes(Colunas):
+    CAMPOS = (("tipo", "B"), ("valor", "q"), ("saldo_apos", "q"), ("data", "q"))
+    
+    def _codificar(self, registro: dict) -> tuple:
+        return (_CODIGOS_TIPO.get(registro.get("tipo"), CODIGO_OUTRO), _centavos(registro.get("valor", 0.0)),
+                _centavos(registro.get("saldo_apos", 0.0)), _para_ms(registro.get("data")))
+    
+    def _decodificar(self, tipo: int, valor: int, saldo_apos: int, data: int) -> dict:
+        nome = TIPOS_TRANSACAO[tipo] if tipo < len(TIPOS_TRANSACAO) else TIPO_OUTRO
+        return {"tipo": nome, "valor": valor / 100, "data": data, "saldo_apos": saldo_apos / 100}
+
+
+class ColunasJogadas(Colunas):
+    # As três paradas vão num único inteiro: um byte por id de símbolo
+    CAMPOS = (("aposta", "q"), ("premio", "q"), ("simbolos", "I"), ("data", "q"))
+    
+    def _codificar(self, registro: dict) -> tuple:
+        simbolos = registro.get("simbolos") or []
+        if len(simbolos) == 3:
+            primeiro, segundo, terceiro = (id_simbolo(s) & 0xFF for s in simbolos)
+            trinca = (primeiro << 16) | (segundo << 8) | terceiro
+        else:
+            trinca = SEM_SIMBOLOS
+        return (_centavos(registro.get("aposta", 0.0)), _centavos(registro.get("premio", 0.0)),
+                trinca, _para_ms(registro.get("data")))
+    
+    def _decodificar(self, aposta: int, premio: int, trinca: int, data: int) -> dict:
+        return {
+            "aposta": aposta / 100,
+            "premio": premio / 100,
+            "lucro": (premio - aposta) / 100,
+            "simbolos": [] if trinca == SEM_SIMBOLOS else [trinca >> 16, (trinca >> 8) & 0xFF, trinca & 0xFF],
+            "data": data
+        }
+
+
+COLUNAS_HISTORICO = {"transacoes": ColunasTransacoes, "jogadas": ColunasJogadas}
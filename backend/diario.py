@@ -0,0 +1,193 @@
+import json
+import os
+import threading
+from .eventos import eventos, AVISO, ERRO
+
+
+class DiarioUsuarios:
+    """Diário de alterações dos usuários, compactado em segundo plano no snapshot JSON."""
+    
+    def __init__(self, arquivo_snapshot: str, limite_registros: int = 1000, sincronizar_disco: bool = True):
+        self._arquivo_snapshot = arquivo_snapshot
+        self._arquivo_diario = arquivo_snapshot + ".diario"
+        self._arquivo_antigo = self._arquivo_diario + ".antigo"
+        self._limite_registros = limite_registros
+        self._sincronizar_disco = sincronizar_disco
+        self._registros = 0
+        self._trava = threading.RLock()
+        self._compactacao = None
+    
+    @property
+    def arquivo_diario(self) -> str:
+        return self._arquivo_diario
+    
+    @property
+    def trava(self) -> threading.RLock:
+        return self._trava
+    
+    def reaplicar(self, usuarios: dict) -> int:
+        reaplicados = 0
+        for caminho in (self._arquivo_antigo, self._arquivo_diario):
+            for registro in self._ler_registros(caminho):
+                aplicar_registro(usuarios, registro)
+                reaplicados += 1
+        
+        if os.path.exists(self._arquivo_antigo):
+            # Uma compactação foi interrompida: termina agora, antes de aceitar novos registros
+            self._escrever_snapshot(usuarios)
+            os.remove(self._arquivo_antigo)
+            if os.path.exists(self._arquivo_diario):
+                os.remove(self._arquivo_diario)
+            self._registros = 0
+        else:
+            self._registros = reaplicados
+        return reaplicados
+    
+    def registrar(self, registro: dict, usuarios: dict):
+        """Grava o registro no diário e só depois o aplica em `usuarios`; uma falha de disco é repassada."""
+        linha = (json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n").encode('utf-8')
+        with self._trava:
+            with open(self._arquivo_diario, 'ab') as arquivo:
+                tamanho = arquivo.tell()
+                try:
+                    arquivo.write(linha)
+                    arquivo.flush()
+                    if self._sincronizar_disco:
+                        os.fsync(arquivo.fileno())
+                except OSError:
+                    # Sem o pedaço gravado, o próximo registro não fica atrás de uma linha incompleta
+                    try:
+                        arquivo.truncate(tamanho)
+                    except OSError:
+                        pass
+                    raise
+            aplicar_registro(usuarios, registro)
+            self._registros += 1
+            if self._registros >= self._limite_registros:
+                try:
+                    self._iniciar_compactacao(usuarios)
+                except OSError as e:
+                    # O registro já está no diário; a compactação é tentada de novo no próximo limite
+                    eventos.emitir(ERRO, "compactacao_falhou", mensagem=f"❌ Erro ao compactar dados: {e}")
+    
+    def compactar(self, usuarios: dict):
+        with self._trava:
+            self._iniciar_compactacao(usuarios)
+        self.aguardar()
+    
+    def aguardar(self):
+        compactacao = self._compactacao
+        if compactacao:
+            compactacao.join()
+    
+    def _iniciar_compactacao(self, usuarios: dict):
+        if self._compactacao and self._compactacao.is_alive():
+            return
+        if not os.path.exists(self._arquivo_diario):
+            return
+        
+        # Rotaciona o diário e tira a cópia do estado no mesmo instante, sob a trava
+        if os.path.exists(self._arquivo_antigo):
+            # Sobrou de uma compactação que falhou: o diário atual vai para o fim dele e os dois saem juntos
+            self._mesclar_no_antigo()
+        else:
+            os.replace(self._arquivo_diario, self._arquivo_antigo)
+        estado = copiar_estado(usuarios)
+        self._registros = 0
+        self._compactacao = threading.Thread(target=self._compactar, args=(estado,), daemon=True)
+        self._compactacao.start()
+    
+    def _mesclar_no_antigo(self):
+        with open(self._arquivo_diario, 'rb') as origem, open(self._arquivo_antigo, 'ab') as destino:
+            destino.write(origem.read())
+            destino.flush()
+            os.fsync(destino.fileno())
+        os.remove(self._arquivo_diario)
+    
+    def _compactar(self, estado: dict):
+        try:
+            self._escrever_snapshot(estado)
+            os.remove(self._arquivo_antigo)
+        except OSError as e:
+            # O diário antigo continua em disco e será reaplicado na próxima inicialização
+            eventos.emitir(ERRO, "compactacao_falhou", mensagem=f"❌ Erro ao compactar dados: {e}")
+    
+    def _escrever_snapshot(self, estado: dict):
+        temporario = self._arquivo_snapshot + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(estado, arquivo, ensure_ascii=False, separators=(",", ":"))
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self._arquivo_snapshot)
+    
+    def _ler_registros(self, caminho: str):
+        if not os.path.exists(caminho):
+            return
+        
+        with open(caminho, 'rb+') as arquivo:
+            posicao = 0
+            for linha in arquivo:
+                try:
+                    if not linha.endswith(b"\n"):
+                        raise ValueError("linha sem terminador")
+                    registro = json.loads(linha.decode('utf-8'))
+                except ValueError:
+                    # Linha incompleta gravada durante uma queda: descarta ela e tudo que vier depois
+                    eventos.emitir(AVISO, "diario_truncado",
+                                   mensagem="⚠️ Aviso: Registro incompleto no diário de usuários ignorado.")
+                    arquivo.truncate(posicao)
+                    return
+                posicao += len(linha)
+                yield registro
+
+
+def copiar_estado(usuarios: dict) -> dict:
+    # Os itens do histórico nunca são alterados depois de criados, basta copiar as listas
+    return {
+        nome: {
+            **dados,
+            "historico_transacoes": list(dados.get("historico_transacoes", [])),
+            "historico_jogadas": list(dados.get("historico_jogadas", []))
+        }
+        for nome, dados in usuarios.items()
+    }
+
+
+def aplicar_registro(usuarios: dict, registro: dict):
+    # Os registros guardam valores absolutos, então reaplicar um registro já compactado é inofensivo
+    operacao = registro.get("op")
+    nome = registro.get("nome")
+    
+    if operacao == "cadastro":
+        usuarios[nome] = registro["dados"]
+        return
+    
+    if operacao == "atualizacao" and nome in usuarios:
+        dados = usuarios[nome]
+        dados["saldo"] = registro["saldo"]
+        dados["chave_pix"] = registro.get("chave_pix", dados.get("chave_pix", ""))
+        _substituir_historico(dados, "transacoes", registro["t"], registro["transacoes"])
+        _substituir_historico(dados, "jogadas", registro["j"], registro["jogadas"])
+        return
+    
+    if operacao == "perfil" and nome in usuarios:
+        usuarios[nome].update(registro["campos"])
+        return
+    
+    if operacao == "arquivamento" and nome in usuarios:
+        # As entradas até "ate" já estão no arquivo de histórico e saem do snapshot
+        dados = usuarios[nome]
+        chave = "arquivadas_" + registro["tipo"]
+        descartar = registro["ate"] - dados.get(chave, 0)
+        if descartar > 0:
+            del dados.setdefault("historico_" + registro["tipo"], [])[:descartar]
+            dados[chave] = registro["ate"]
+
+
+def _substituir_historico(dados: dict, tipo: str, inicio: int, itens: list):
+    # "inicio" é a posição absoluta; as entradas arquivadas não estão mais na lista
+    arquivadas = dados.get("arquivadas_" + tipo, 0)
+    if inicio < arquivadas:
+        itens = itens[arquivadas - inicio:]
+        inicio = arquivadas
+    dados.setdefault("historico_" + tipo, [])[inicio - arquivadas:] = itens
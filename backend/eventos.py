@@ -0,0 +1,160 @@
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+
+DEBUG = 10
+INFO = 20
+AVISO = 30
+ERRO = 40
+DESATIVADO = 100
+NOMES_NIVEIS = {DEBUG: "debug", INFO: "info", AVISO: "aviso", ERRO: "erro"}
+
+
+class Evento(NamedTuple):
+    momento: float
+    nivel: int
+    nome: str
+    campos: dict
+
+
+class RegistroEventos:
+    """Eventos estruturados com nível: guardados num buffer circular e repassados aos assinantes.
+    
+    Abaixo do nível mínimo, emitir() retorna na primeira comparação; com desativar() nada é registrado.
+    """
+    
+    def __init__(self, capacidade: int = 4096, nivel: int = INFO):
+        # deque com maxlen: append é atômico no CPython, então emitir não precisa de trava
+        self._buffer = deque(maxlen=capacidade)
+        self._assinantes = ()
+        self._nivel = nivel
+    
+    @property
+    def nivel(self) -> int:
+        return self._nivel
+    
+    @nivel.setter
+    def nivel(self, nivel: int):
+        self._nivel = nivel
+    
+    def desativar(self):
+        self._nivel = DESATIVADO
+    
+    def emitir(self, nivel: int, nome: str, **campos):
+        if nivel < self._nivel:
+            return
+        evento = Evento(time.time(), nivel, nome, campos)
+        self._buffer.append(evento)
+        for minimo, assinante in self._assinantes:
+            if nivel >= minimo:
+                assinante(evento)
+    
+    def assinar(self, assinante, nivel: int = DEBUG):
+        # Copia na escrita: quem está emitindo continua iterando a tupla antiga
+        self._assinantes = self._assinantes + ((nivel, assinante),)
+    
+    def cancelar(self, assinante):
+        self._assinantes = tuple(par for par in self._assinantes if par[1] is not assinante)
+    
+    def recentes(self, quantidade: int = None) -> list:
+        eventos = list(self._buffer)
+        return eventos if quantidade is None else eventos[-quantidade:]
+
+
+class ConsoleEventos:
+    """Assinante que escreve os eventos no console, com um formato por nome de evento."""
+    
+    formatos = {}
+    
+    def __init__(self, saida=None):
+        self._saida = saida
+    
+    @classmethod
+    def formato(cls, nome: str):
+        def registrar(funcao):
+            cls.formatos[nome] = funcao
+            return funcao
+        return registrar
+    
+    def __call__(self, evento: Evento):
+        formatar = self.formatos.get(evento.nome)
+        if formatar is not None:
+            texto = formatar(evento.campos)
+        else:
+            texto = evento.campos.get("mensagem") or f"{evento.nome} {evento.campos}"
+        print(texto, file=self._saida or sys.stdout)
+
+
+class ArquivoEventos:
+    """Assinante que grava os eventos como JSON, uma linha cada, em lotes numa thread própria."""
+    
+    def __init__(self, caminho: str, intervalo: float = 0.5, tamanho_lote: int = 1000):
+        self._caminho = caminho
+        self._intervalo = intervalo
+        self._tamanho_lote = tamanho_lote
+        self._fila = queue.SimpleQueue()
+        self._ativo = True
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+    
+    def __call__(self, evento: Evento):
+        self._fila.put(evento)
+    
+    def fechar(self):
+        self._ativo = False
+        self._fila.put(None)
+        self._thread.join()
+    
+    def _executar(self):
+        with open(self._caminho, 'a', encoding='utf-8') as arquivo:
+            while True:
+                lote = self._coletar()
+                if lote:
+                    arquivo.write("".join(_linha_json(evento) for evento in lote))
+                    arquivo.flush()
+                if not self._ativo and self._fila.empty():
+                    return
+    
+    def _coletar(self) -> list:
+        # Espera o primeiro evento e junta o que chegar até o intervalo ou o tamanho do lote
+        lote = []
+        try:
+            evento = self._fila.get(timeout=self._intervalo)
+        except queue.Empty:
+            return lote
+        limite = time.monotonic() + self._intervalo
+        while evento is not None:
+            lote.append(evento)
+            if len(lote) >= self._tamanho_lote:
+                break
+            try:
+                evento = self._fila.get(timeout=max(limite - time.monotonic(), 0))
+            except queue.Empty:
+                break
+        return lote
+
+
+def _linha_json(evento: Evento) -> str:
+    return json.dumps({
+        "momento": evento.momento,
+        "nivel": NOMES_NIVEIS.get(evento.nivel, evento.nivel),
+        "evento": evento.nome,
+        **evento.campos
+    }, ensure_ascii=False, default=str) + "\n"
+
+
+# Registro global do jogo. Por padrão só avisos e erros aparecem no console;
+# quem quiser as mensagens de cada jogada assina o console no nível INFO (veja main.py).
+eventos = RegistroEventos()
+console = ConsoleEventos()
+eventos.assinar(console, AVISO)
+
+
+def mostrar_no_console(nivel: int = INFO):
+    eventos.cancelar(console)
+    eventos.assinar(console, nivel)
@@ -0,0 +1,105 @@
+import random
+
+
+ESCALA_53_BITS = 2.0 ** -53
+
+
+class FluxoPadrao:
+    """Sorteio com o módulo random global: rápido, mas sem semente nem reprodução."""
+    
+    def __init__(self):
+        self._contador = 0
+    
+    @property
+    def contador(self) -> int:
+        return self._contador
+    
+    def uniforme(self) -> float:
+        self._contador += 1
+        return random.random()
+    
+    def uniformes(self, quantidade: int) -> list[float]:
+        self._contador += quantidade
+        return [random.random() for _ in range(quantidade)]
+
+
+class FluxoAleatorio:
+    """Fluxo PCG64 com semente: o sorteio número n depende só de (semente, fluxo, n).
+    
+    Cada sorteio consome exatamente uma saída de 64 bits do gerador, então qualquer giro
+    pode ser refeito com reproduzir_uniforme sem gerar os anteriores.
+    """
+    
+    def __init__(self, semente: int, fluxo: int = 0, tamanho_buffer: int = 4096):
+        import numpy as np
+        self._np = np
+        self._semente = semente
+        self._fluxo = fluxo
+        self._gerador = _criar_gerador(semente, fluxo)
+        self._tamanho_buffer = tamanho_buffer
+        self._buffer = np.empty(0, dtype=np.uint64)
+        self._lista = []
+        self._posicao = 0
+        self._contador = 0
+    
+    @property
+    def semente(self) -> int:
+        return self._semente
+    
+    @property
+    def fluxo(self) -> int:
+        return self._fluxo
+    
+    @property
+    def contador(self) -> int:
+        return self._contador
+    
+    def uniforme(self) -> float:
+        # Caminho de um giro só, em Python puro: chamar o NumPy para um único valor custa mais que o sorteio
+        if self._posicao >= len(self._lista):
+            self._recarregar(self._tamanho_buffer)
+        bruto = self._lista[self._posicao]
+        self._posicao += 1
+        self._contador += 1
+        return (bruto >> 11) * ESCALA_53_BITS
+    
+    def uniformes(self, quantidade: int) -> list[float]:
+        return _para_uniformes(self.brutos(quantidade)).tolist()
+    
+    def brutos(self, quantidade: int):
+        # Serve o que sobrou do buffer; um pedido grande vem direto do gerador, sem virar a lista de uniforme()
+        partes = [self._buffer[self._posicao:self._posicao + quantidade]]
+        self._posicao += len(partes[0])
+        restantes = quantidade - len(partes[0])
+        if restantes >= self._tamanho_buffer:
+            partes.append(self._gerador.random_raw(restantes))
+        elif restantes > 0:
+            self._recarregar(self._tamanho_buffer)
+            partes.append(self._buffer[:restantes])
+            self._posicao = restantes
+        self._contador += quantidade
+        return partes[0] if len(partes) == 1 else self._np.concatenate(partes)
+    
+    def _recarregar(self, quantidade: int):
+        self._buffer = self._gerador.random_raw(quantidade)
+        self._lista = self._buffer.tolist()
+        self._posicao = 0
+
+
+def _criar_gerador(semente: int, fluxo: int):
+    import numpy as np
+    # Subfluxos independentes por roleta: mesma semente, chave de derivação diferente
+    return np.random.PCG64(np.random.SeedSequence(semente, spawn_key=(fluxo,)))
+
+
+def _para_uniformes(brutos):
+    import numpy as np
+    # Os 53 bits altos viram um double exato em [0, 1)
+    return (brutos >> np.uint64(11)) * ESCALA_53_BITS
+
+
+def reproduzir_uniforme(semente: int, fluxo: int, contador: int) -> float:
+    """Refaz o sorteio número `contador` (a partir de 0) do fluxo, em tempo constante."""
+    gerador = _criar_gerador(semente, fluxo)
+    gerador.advance(contador)
+    return float(_para_uniformes(gerador.random_raw(1))[0])
@@ -0,0 +1,122 @@
+import threading
+import time
+from .eventos import eventos, ERRO
+from .metricas import metricas
+
+
+class GravadorAssincrono:
+    """Grava em segundo plano os usuários alterados, agrupando rajadas em uma única gravação."""
+    
+    def __init__(self, sistema_auth, intervalo: float = 0.2):
+        self._sistema_auth = sistema_auth
+        self._intervalo = intervalo
+        self._pendentes = {}
+        self._condicao = threading.Condition()
+        # Cada marcação recebe um número; o descarregar espera a gravação alcançar o número da chamada
+        self._marcacoes = 0
+        self._gravadas = 0
+        # Última marcação de cada usuário pendente e, para quem a gravação falhou, a marcação que falhou
+        self._marca_usuario = {}
+        self._falhas_usuario = {}
+        self._urgente = False
+        self._ativo = True
+        self._lotes = 0
+        self._usuarios_gravados = 0
+        self._falhas = 0
+        self._latencia_total = 0.0
+        self._latencia_maxima = 0.0
+        self._ultima_latencia = 0.0
+        self._fila_maxima = 0
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+    
+    def marcar(self, usuario):
+        if self._sistema_auth.em_conflito(usuario):
+            return  # Gravar de novo sobrescreveria a sessão que venceu o conflito
+        with self._condicao:
+            self._pendentes[usuario.nome] = usuario
+            self._marcacoes += 1
+            self._marca_usuario[usuario.nome] = self._marcacoes
+            self._fila_maxima = max(self._fila_maxima, len(self._pendentes))
+            self._condicao.notify_all()
+    
+    def descarregar(self, timeout: float = None, usuario=None) -> bool:
+        """Espera as marcações feitas até agora serem gravadas; False se alguma delas falhou ou o tempo esgotou.
+        
+        Com `usuario`, só a gravação dele decide o resultado.
+        """
+        with self._condicao:
+            desde, alvo = self._gravadas, self._marcacoes
+            if self._gravadas < alvo:
+                self._urgente = True
+                self._condicao.notify_all()
+            self._condicao.wait_for(lambda: self._gravadas >= alvo or not self._thread.is_alive(), timeout)
+            if self._gravadas < alvo:
+                return False  # Tempo esgotado ou thread de gravação parada
+            falhas = self._falhas_usuario.values() if usuario is None else [self._falhas_usuario.get(usuario.nome, 0)]
+            return not any(desde < marca <= alvo for marca in falhas)
+    
+    def fechar(self, timeout: float = None):
+        self.descarregar(timeout)
+        with self._condicao:
+            self._ativo = False
+            self._condicao.notify_all()
+        self._thread.join(timeout)
+    
+    def estatisticas(self) -> dict:
+        with self._condicao:
+            return {
+                "fila": len(self._pendentes),
+                "fila_maxima": self._fila_maxima,
+                "lotes": self._lotes,
+                "usuarios_gravados": self._usuarios_gravados,
+                "falhas": self._falhas,
+                "latencia_media_ms": self._latencia_total / self._lotes * 1000 if self._lotes else 0.0,
+                "latencia_maxima_ms": self._latencia_maxima * 1000,
+                "ultima_latencia_ms": self._ultima_latencia * 1000
+            }
+    
+    def _executar(self):
+        while True:
+            with self._condicao:
+                self._condicao.wait_for(lambda: self._pendentes or not self._ativo)
+                if not self._pendentes and not self._ativo:
+                    return
+                # Janela de agrupamento: marcações que chegarem nela entram no mesmo lote
+                if not self._urgente:
+                    self._condicao.wait_for(lambda: self._urgente or not self._ativo, self._intervalo)
+                lote, self._pendentes = self._pendentes, {}
+                marcas = {nome: self._marca_usuario.pop(nome) for nome in lote}
+                alvo = self._marcacoes
+                self._urgente = False
+            
+            inicio = time.perf_counter()
+            falhas = 0
+            falharam = []
+            for usuario in lote.values():
+                try:
+                    if not self._sistema_auth.atualizar_saldo(usuario):
+                        falhas += 1
+                        falharam.append(usuario.nome)
+                except Exception as e:
+                    falhas += 1
+                    falharam.append(usuario.nome)
+                    eventos.emitir(ERRO, "gravacao_falhou", usuario=usuario.nome,
+                                   mensagem=f"❌ Erro ao gravar dados de '{usuario.nome}': {e}")
+            duracao = time.perf_counter() - inicio
+            metricas.observar("gravacao_lote", duracao)
+            metricas.contar("falhas_gravacao", falhas)
+            
+            with self._condicao:
+                for nome in lote:
+                    self._falhas_usuario.pop(nome, None)
+                for nome in falharam:
+                    self._falhas_usuario[nome] = marcas[nome]
+                self._gravadas = alvo
+                self._lotes += 1
+                self._usuarios_gravados += len(lote)
+                self._falhas += falhas
+                self._latencia_total += duracao
+                self._latencia_maxima = max(self._latencia_maxima, duracao)
+                self._ultima_latencia = duracao
+                self._condicao.notify_all()
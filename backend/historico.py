@@ -0,0 +1,73 @@
+from .colunas import Colunas
+
+
+class HistoricoPaginado:
+    """Histórico com as entradas recentes em memória, em colunas, e as antigas buscadas sob demanda."""
+    
+    def __init__(self, colunas: type[Colunas], capacidade: int = 500, total: int = 0, recentes: list = None,
+                 carregar=None):
+        self._capacidade = capacidade
+        self._recentes = colunas(recentes or [])
+        self._total = max(total, len(self._recentes))
+        # Entradas abaixo desta posição já estão gravadas e podem sair da memória
+        self._persistido = self._total
+        self._carregar = carregar
+        self._descartar_persistidas()
+    
+    def __len__(self) -> int:
+        return self._total
+    
+    @property
+    def inicio_memoria(self) -> int:
+        return self._total - len(self._recentes)
+    
+    def adicionar(self, item: dict):
+        self._recentes.anexar(item)
+        self._total += 1
+        self._descartar_persistidas()
+    
+    def estender(self, itens: list):
+        self._recentes.estender(itens)
+        self._total += len(itens)
+        self._descartar_persistidas()
+    
+    def marcar_persistido(self, posicao: int):
+        self._persistido = max(self._persistido, min(posicao, self._total))
+        self._descartar_persistidas()
+    
+    def faixa(self, inicio: int, fim: int = None) -> list:
+        inicio = max(inicio, 0)
+        fim = self._total if fim is None else min(fim, self._total)
+        if inicio >= fim:
+            return []
+        
+        base = self.inicio_memoria
+        if inicio >= base:
+            return self._recentes.faixa(inicio - base, fim - base)
+        
+        antigas = self._carregar(inicio, min(fim, base)) if self._carregar else []
+        return antigas + self._recentes.faixa(0, max(fim - base, 0))
+    
+    def pagina(self, pagina: int = 0, tamanho: int = 20) -> list:
+        # A página 0 traz as entradas mais recentes, da mais nova para a mais antiga
+        return self.mais_recentes(pagina * tamanho, tamanho)
+    
+    def mais_recentes(self, deslocamento: int, quantidade: int) -> list:
+        fim = self._total - deslocamento
+        itens = self.faixa(fim - quantidade, fim)
+        itens.reverse()
+        return itens
+    
+    def total_paginas(self, tamanho: int = 20) -> int:
+        return -(-self._total // tamanho)
+    
+    def recentes(self) -> list:
+        return self._recentes.faixa(0, len(self._recentes))
+    
+    def _descartar_persistidas(self):
+        # Sem onde buscar as antigas, tudo fica em memória; entradas ainda não gravadas nunca saem
+        if self._carregar is None:
+            return
+        excesso = min(len(self._recentes) - self._capacidade, self._persistido - self.inicio_memoria)
+        if excesso > 0:
+            self._recentes.descartar_inicio(excesso)
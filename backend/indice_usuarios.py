@@ -0,0 +1,89 @@
+import bisect
+import re
+
+
+CAMPOS_INDEXADOS = ("cpf", "email", "telefone")
+ROTULOS_CAMPOS = {"cpf": "CPF", "email": "Email", "telefone": "Telefone"}
+_SEPARADORES = re.compile(r"[\s.\-()/]")
+
+
+def normalizar_cpf(cpf: str) -> str:
+    return "".join(c for c in cpf if c.isdigit())
+
+
+def normalizar_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def normalizar_telefone(telefone: str) -> str:
+    return "".join(c for c in telefone if c.isdigit())
+
+
+NORMALIZADORES = {"cpf": normalizar_cpf, "email": normalizar_email, "telefone": normalizar_telefone}
+
+
+def normalizar(campo: str, valor: str) -> str:
+    return NORMALIZADORES[campo](valor or "")
+
+
+def candidatos_chave_pix(chave: str) -> dict:
+    """Formas normalizadas em que uma chave PIX digitada pode aparecer em cada índice."""
+    candidatos = {"email": normalizar_email(chave)}
+    digitos = _SEPARADORES.sub("", chave)
+    if digitos.isdigit():
+        candidatos["cpf"] = digitos
+        candidatos["telefone"] = digitos
+    return candidatos
+
+
+class IndiceUsuarios:
+    """Índices únicos de CPF, email e telefone normalizados, com busca exata e por prefixo."""
+    
+    def __init__(self):
+        self._por_campo = {campo: {} for campo in CAMPOS_INDEXADOS}
+        # Chaves ordenadas de cada campo, para a busca por prefixo usar bisect
+        self._ordenadas = {campo: [] for campo in CAMPOS_INDEXADOS}
+    
+    def conflito(self, dados: dict, ignorar: str = None) -> str:
+        """Primeiro campo de `dados` que já pertence a outro usuário, ou None."""
+        for campo in CAMPOS_INDEXADOS:
+            chave = normalizar(campo, dados.get(campo, ""))
+            dono = self._por_campo[campo].get(chave)
+            if chave and dono is not None and dono != ignorar:
+                return campo
+        return None
+    
+    def adicionar(self, nome: str, dados: dict) -> str:
+        # Dados antigos podem ter duplicatas: o primeiro cadastro fica com a chave
+        repetido = None
+        for campo in CAMPOS_INDEXADOS:
+            chave = normalizar(campo, dados.get(campo, ""))
+            if not chave:
+                continue
+            if chave in self._por_campo[campo]:
+                repetido = repetido or campo
+                continue
+            self._por_campo[campo][chave] = nome
+            bisect.insort(self._ordenadas[campo], chave)
+        return repetido
+    
+    def remover(self, nome: str, dados: dict):
+        for campo in CAMPOS_INDEXADOS:
+            chave = normalizar(campo, dados.get(campo, ""))
+            if chave and self._por_campo[campo].get(chave) == nome:
+                del self._por_campo[campo][chave]
+                ordenadas = self._ordenadas[campo]
+                del ordenadas[bisect.bisect_left(ordenadas, chave)]
+    
+    def buscar(self, campo: str, valor: str) -> str:
+        return self._por_campo[campo].get(normalizar(campo, valor))
+    
+    def buscar_prefixo(self, campo: str, prefixo: str, limite: int = 20) -> list:
+        ordenadas = self._ordenadas[campo]
+        prefixo = normalizar(campo, prefixo)
+        nomes = []
+        posicao = bisect.bisect_left(ordenadas, prefixo)
+        while posicao < len(ordenadas) and len(nomes) < limite and ordenadas[posicao].startswith(prefixo):
+            nomes.append(self._por_campo[campo][ordenadas[posicao]])
+            posicao += 1
+        return nomes
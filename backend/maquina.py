@@ -1,61 +1,201 @@
+import math
+import operator
 import time
+from array import array
 from .roleta import Roleta
+from .gerador import FluxoAleatorio, reproduzir_uniforme
 from .usuario import Usuario
-from .simbolo_especial import SimboloEspecial
+from .regras import classificar_combinacao
+from .analisador import analisar_maquina, compilar_tabela, formatar_chance
+from .colunas import cabe_em_centavos
+from .eventos import eventos, ConsoleEventos, INFO, AVISO, ERRO
+from .metricas import metricas
+
+
+# Giros sorteados de uma vez no lote: a memória não cresce com a quantidade pedida
+TAMANHO_BLOCO_LOTE = 4096
 
 
 class Maquina:
     
-    def __init__(self):
-        self._roleta1 = Roleta()
-        self._roleta2 = Roleta()
-        self._roleta3 = Roleta()
+    def __init__(self, semente: int = None, modo: str = "fita"):
+        # Com semente, cada roleta tem seu subfluxo e o giro n pode ser refeito a partir de (semente, n)
+        self._semente = semente
+        geradores = [FluxoAleatorio(semente, fluxo) if semente is not None else None for fluxo in range(3)]
+        self._roleta1 = Roleta(geradores[0], modo)
+        self._roleta2 = Roleta(geradores[1], modo)
+        self._roleta3 = Roleta(geradores[2], modo)
         self._valor_aposta = 0.0
         self._usuario_logado = None
+        self._versao_tabela = None
+        self._compilar_tabela()
+    
+    @property
+    def roletas(self) -> tuple[Roleta, Roleta, Roleta]:
+        return (self._roleta1, self._roleta2, self._roleta3)
+    
+    @property
+    def semente(self) -> int:
+        return self._semente
+    
+    @property
+    def giros(self) -> int:
+        # As três roletas sorteiam juntas, então o contador da primeira numera os giros
+        return self._roleta1.gerador.contador
+    
+    def reproduzir_giro(self, giro: int) -> list:
+        """Refaz as paradas do giro número `giro` sem alterar o estado atual das roletas."""
+        if self._semente is None:
+            raise ValueError("Só é possível reproduzir giros de uma máquina criada com semente.")
+        return [
+            roleta.parada(reproduzir_uniforme(self._semente, fluxo, giro))
+            for fluxo, roleta in enumerate(self.roletas)
+        ]
+    
+    def _compilar_tabela(self):
+        # Resultado de cada trinca de paradas, indexado por (p1 * n2 + p2) * n3 + p3
+        self._tabela = compilar_tabela(self.roletas)
+        self._maior_fator = max((multiplicador * fator for ganhou, multiplicador, fator in self._tabela if ganhou),
+                                default=0.0)
+        self._paradas2 = len(self._roleta2.simbolos)
+        self._paradas3 = len(self._roleta3.simbolos)
+        self._versao_tabela = (self._roleta1.versao, self._roleta2.versao, self._roleta3.versao)
+    
+    def _resolver_paradas(self, parada1: int, parada2: int, parada3: int) -> tuple[bool, float]:
+        if self._versao_tabela != (self._roleta1.versao, self._roleta2.versao, self._roleta3.versao):
+            self._compilar_tabela()
+        
+        ganhou, multiplicador, fator = self._tabela[(parada1 * self._paradas2 + parada2) * self._paradas3 + parada3]
+        return ganhou, self._valor_aposta * multiplicador * fator
+    
+    def _premio_cabe(self, usuario: Usuario, valor_aposta: float) -> bool:
+        # O maior prêmio possível e o saldo depois dele precisam caber no histórico antes de a aposta sair
+        if self._versao_tabela != (self._roleta1.versao, self._roleta2.versao, self._roleta3.versao):
+            self._compilar_tabela()
+        premio_maximo = valor_aposta * self._maior_fator
+        return cabe_em_centavos(premio_maximo) and \
+            cabe_em_centavos(usuario.get_saldo() - valor_aposta + premio_maximo)
     
     def definir_usuario(self, usuario: Usuario):
         self._usuario_logado = usuario
     
+    @metricas.cronometrado("jogada")
     def jogar(self, valor_aposta: float) -> dict:
         if not self._usuario_logado:
-            print("❌ Erro: Nenhum usuário logado.")
+            eventos.emitir(AVISO, "sem_usuario", mensagem="❌ Erro: Nenhum usuário logado.")
             return {"ganhou": False, "premio": 0.0, "simbolos": []}
         
-        if not self._usuario_logado.pode_apostar(valor_aposta):
-            print(f"❌ Saldo insuficiente! Saldo atual: R$ {self._usuario_logado.get_saldo():.2f}")
-            return {"ganhou": False, "premio": 0.0, "simbolos": []}
+        usuario = self._usuario_logado
+        with usuario.trava:
+            if usuario.pode_apostar(valor_aposta) and not self._premio_cabe(usuario, valor_aposta):
+                eventos.emitir(AVISO, "valor_invalido", mensagem="❌ Erro: Valor de aposta fora da faixa permitida.")
+                return {"ganhou": False, "premio": 0.0, "simbolos": []}
+            if not usuario.pode_apostar(valor_aposta) or not usuario.movimentar(-valor_aposta, "Apostado"):
+                eventos.emitir(AVISO, "saldo_insuficiente", usuario=usuario.nome, aposta=valor_aposta,
+                               saldo=usuario.get_saldo())
+                return {"ganhou": False, "premio": 0.0, "simbolos": []}
+            
+            self._valor_aposta = valor_aposta
+            giro = self.giros
+            
+            with metricas.cronometro("sorteio"):
+                parada1 = self._roleta1.girar_indice()
+                parada2 = self._roleta2.girar_indice()
+                parada3 = self._roleta3.girar_indice()
+            
+            simbolos = [self._roleta1.resultado_atual, self._roleta2.resultado_atual, self._roleta3.resultado_atual]
+            
+            with metricas.cronometro("avaliacao"):
+                ganhou, premio = self._resolver_paradas(parada1, parada2, parada3)
+            
+            with metricas.cronometro("historico"):
+                if ganhou and not usuario.movimentar(premio, "Ganho"):
+                    # Não deveria acontecer depois de _premio_cabe; a jogada fica registrada sem o prêmio
+                    eventos.emitir(ERRO, "premio_recusado", usuario=usuario.nome, giro=giro, premio=premio,
+                                   saldo=usuario.get_saldo())
+                    ganhou, premio = False, 0.0
+                usuario.registrar_jogada(valor_aposta, premio if ganhou else 0, simbolos)
+            metricas.contar("jogadas")
+            if ganhou:
+                metricas.contar("vitorias")
+            eventos.emitir(INFO, "jogada", usuario=usuario.nome, giro=giro, aposta=valor_aposta,
+                           premio=premio if ganhou else 0.0, simbolos=simbolos, saldo=usuario.get_saldo())
         
-        self._valor_aposta = valor_aposta
-        saldo_antes = self._usuario_logado.get_saldo()
-        self._usuario_logado._Usuario__saldo -= valor_aposta
-        self._usuario_logado._adicionar_transacao("Apostado", -valor_aposta)
+        return {
+            "ganhou": ganhou,
+            "premio": premio,
+            "simbolos": simbolos,
+            "giro": giro
+        }
+    
+    @metricas.cronometrado("lote")
+    def jogar_lote(self, quantidade: int, valor_aposta: float, sistema_auth=None) -> dict:
+        resultado = {
+            "jogadas": 0,
+            "total_apostado": 0.0,
+            "total_premios": 0.0,
+            "paradas": array('H'),  # 3 paradas por jogada
+            "premios": array('d'),
+            "saldo": 0.0,
+            "interrompido": False,
+            "primeiro_giro": self.giros
+        }
         
-        simbolo1 = self._roleta1.girar()
-        simbolo2 = self._roleta2.girar()
-        simbolo3 = self._roleta3.girar()
+        if not self._usuario_logado:
+            eventos.emitir(AVISO, "sem_usuario", mensagem="❌ Erro: Nenhum usuário logado.")
+            return resultado
         
-        simbolos = [simbolo1, simbolo2, simbolo3]
+        resultado["saldo"] = self._usuario_logado.get_saldo()
+        try:
+            quantidade = operator.index(quantidade)
+        except TypeError:
+            return resultado
+        if not (valor_aposta > 0 and math.isfinite(valor_aposta)) or quantidade <= 0:
+            return resultado
         
-        self._exibir_resultado(simbolos)
+        self._valor_aposta = valor_aposta
+        fitas = [roleta.simbolos for roleta in self.roletas]
         
-        ganhou, premio = self._verificar_vitoria(simbolos)
+        paradas = resultado["paradas"]
+        premios = resultado["premios"]
         
-        if ganhou:
-            self._usuario_logado._Usuario__saldo += premio
-            self._usuario_logado._adicionar_transacao("Ganho", premio)
-            print(f"\n🎉 PARABÉNS! Você ganhou R$ {premio:.2f}!")
-            print(f"💰 Saldo atual: R$ {self._usuario_logado.get_saldo():.2f}")
-        else:
-            print(f"\n😢 Não foi desta vez! Tente novamente!")
-            print(f"💰 Saldo atual: R$ {self._usuario_logado.get_saldo():.2f}")
+        def resolver():
+            # Cada bloco só é sorteado quando a liquidação pede mais jogadas
+            restantes = quantidade
+            while restantes > 0:
+                bloco = min(TAMANHO_BLOCO_LOTE, restantes)
+                restantes -= bloco
+                sorteios = zip(
+                    self._roleta1.girar_indices(bloco),
+                    self._roleta2.girar_indices(bloco),
+                    self._roleta3.girar_indices(bloco)
+                )
+                for parada1, parada2, parada3 in sorteios:
+                    ganhou, premio = self._resolver_paradas(parada1, parada2, parada3)
+                    paradas.extend((parada1, parada2, parada3))
+                    premios.append(premio)
+                    yield premio, [fitas[0][parada1].id, fitas[1][parada2].id, fitas[2][parada3].id]
         
-        self._usuario_logado.registrar_jogada(valor_aposta, premio if ganhou else 0, simbolos)
+        # Quem decide onde parar é a liquidação, com a mesma conta de saldo que fica gravada
+        liquidadas = self._usuario_logado.registrar_lote(valor_aposta, resolver())
+        resultado["interrompido"] = liquidadas < quantidade
+        # A jogada que encerrou o lote sem ser liquidada já foi sorteada; ela sai do resultado
+        del paradas[3 * liquidadas:]
+        del premios[liquidadas:]
         
-        return {
-            "ganhou": ganhou,
-            "premio": premio,
-            "simbolos": simbolos
-        }
+        resultado["jogadas"] = liquidadas
+        metricas.contar("jogadas", liquidadas)
+        resultado["total_apostado"] = valor_aposta * liquidadas
+        resultado["total_premios"] = sum(premios)
+        resultado["saldo"] = self._usuario_logado.get_saldo()
+        
+        if sistema_auth is not None:
+            sistema_auth.atualizar_saldo(self._usuario_logado)
+        
+        eventos.emitir(INFO, "lote", usuario=self._usuario_logado.nome, jogadas=resultado["jogadas"],
+                       apostado=resultado["total_apostado"], premios=resultado["total_premios"],
+                       saldo=resultado["saldo"])
+        return resultado
     
     def _animar_giro(self):
         animacao = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
@@ -65,63 +205,59 @@ class Maquina:
                 time.sleep(0.05)
         print("\r" + " " * 50 + "\r", end="")  # Limpa a linha
     
-    def _exibir_resultado(self, simbolos: list):
-        print("\n╔═══════════════════════════════╗")
-        print("║    🎰 RESULTADO DO GIRO 🎰    ║")
-        print("╠═══════════════════════════════╣")
-        print(f"║       {simbolos[0]}  |  {simbolos[1]}  |  {simbolos[2]}       ║")
-        print("╚═══════════════════════════════╝")
-    
     def _verificar_vitoria(self, simbolos: list) -> tuple[bool, float]:
-        simbolo1, simbolo2, simbolo3 = simbolos
-        
-        coringas = [s for s in simbolos if isinstance(s, SimboloEspecial) and s.eh_coringa]
+        classe, simbolo_vencedor, fator = classificar_combinacao(simbolos)
         
-        if simbolo1.nome == simbolo2.nome == simbolo3.nome:
-            premio = simbolo1.calcular_premio(self._valor_aposta) * 3  # Prêmio triplo
-            return True, premio
+        if simbolo_vencedor is None:
+            return False, 0.0
         
-        if len(coringas) >= 1:
-            nao_coringas = [s for s in simbolos if not (isinstance(s, SimboloEspecial) and s.eh_coringa)]
-            
-            if len(nao_coringas) >= 2 and nao_coringas[0].nome == nao_coringas[1].nome:
-                premio = nao_coringas[0].calcular_premio(self._valor_aposta) * 2
-                return True, premio
-        
-        if simbolo1.nome == simbolo2.nome or simbolo2.nome == simbolo3.nome or simbolo1.nome == simbolo3.nome:
-            if simbolo1.nome == simbolo2.nome:
-                simbolo_vencedor = simbolo1
-            elif simbolo2.nome == simbolo3.nome:
-                simbolo_vencedor = simbolo2
-            else:
-                simbolo_vencedor = simbolo1
-            
-            premio = simbolo_vencedor.calcular_premio(self._valor_aposta)
-            return True, premio
-        
-        return False, 0.0
+        premio = simbolo_vencedor.calcular_premio(self._valor_aposta) * fator
+        return True, premio
     
     def exibir_tabela_premios(self):
-        """Exibe a tabela de prêmios possíveis."""
+        """Exibe a tabela de prêmios com as probabilidades exatas das roletas atuais."""
+        analise = analisar_maquina(self)
+        descricoes = {"trinca": "3 iguais", "coringa": "2 + coringa", "par": "2 iguais"}
+        
         print("\n╔═══════════════════════════════════════════════════╗")
         print("║            📊 TABELA DE PRÊMIOS 📊                ║")
         print("╠═══════════════════════════════════════════════════╣")
-        print("║  SÍMBOLOS COMUNS:                                 ║")
-        print("║  🍒 Cereja   - 2x  (2 iguais) / 6x  (3 iguais)   ║")
-        print("║  🍋 Limão    - 2.5x (2 iguais) / 7.5x (3 iguais) ║")
-        print("║  🍊 Laranja  - 3x  (2 iguais) / 9x  (3 iguais)   ║")
-        print("║  🍇 Uva      - 3.5x (2 iguais) / 10.5x (3 iguais)║")
-        print("║  🍉 Melancia - 4x  (2 iguais) / 12x (3 iguais)   ║")
-        print("║  🔔 Sino     - 5x  (2 iguais) / 15x (3 iguais)   ║")
-        print("║  ⭐ Estrela  - 5x  (2 iguais) / 15x (3 iguais)   ║")
-        print("║                                                   ║")
-        print("║  SÍMBOLOS ESPECIAIS:                              ║")
-        print("║  🦁 Leão     - 20x (2 iguais) / 60x (3 iguais)   ║")
-        print("║               (Funciona como CORINGA!)            ║")
-        print("║  💎 Diamante - 50x (2 iguais) / 150x (3 iguais)  ║")
-        print("║               (JACKPOT MÁXIMO!)                   ║")
+        for linha in analise["linhas"]:
+            if linha["classe"] == "nenhum":
+                continue
+            print(f"║  {linha['icone']} {linha['simbolo']:<9} {descricoes[linha['classe']]:<11}"
+                  f"{linha['multiplicador']:>6g}x {formatar_chance(linha['probabilidade']):>12}  ║")
+        print("╠═══════════════════════════════════════════════════╣")
+        print(f"║  🦁 Leão funciona como CORINGA!                   ║")
+        print(f"║  Chance de ganhar: {float(analise['frequencia_acertos']) * 100:6.2f}%                        ║")
+        print(f"║  Retorno ao jogador (RTP): {float(analise['rtp']) * 100:8.2f}%              ║")
         print("╚═══════════════════════════════════════════════════╝")
     
     def __str__(self) -> str:
         """Retorna representação em string da máquina."""
         return f"🎰 Máquina Caça-níquel | Aposta atual: R$ {self._valor_aposta:.2f}"
+
+
+@ConsoleEventos.formato("jogada")
+def _exibir_resultado(campos: dict) -> str:
+    simbolos = campos["simbolos"]
+    if campos["premio"] > 0:
+        mensagem = f"🎉 PARABÉNS! Você ganhou R$ {campos['premio']:.2f}!"
+    else:
+        mensagem = "😢 Não foi desta vez! Tente novamente!"
+    return "\n".join([
+        "\n╔═══════════════════════════════╗",
+        "║    🎰 RESULTADO DO GIRO 🎰    ║",
+        "╠═══════════════════════════════╣",
+        f"║       {simbolos[0]}  |  {simbolos[1]}  |  {simbolos[2]}       ║",
+        "╚═══════════════════════════════╝",
+        "",
+        mensagem,
+        f"💰 Saldo atual: R$ {campos['saldo']:.2f}"
+    ])
+
+
+@ConsoleEventos.formato("lote")
+def _exibir_lote(campos: dict) -> str:
+    return (f"🎰 {campos['jogadas']} jogadas: apostado R$ {campos['apostado']:.2f}, "
+            f"prêmios R$ {campos['premios']:.2f}. Saldo atual: R$ {campos['saldo']:.2f}")
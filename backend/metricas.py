@@ -0,0 +1,227 @@
+import bisect
+import functools
+import json
+import threading
+import time
+
+
+# Limites superiores dos baldes de latência, em segundos (de 1 µs a 10 s)
+LIMITES_PADRAO = tuple(base * 10.0 ** expoente for expoente in range(-6, 1) for base in (1, 2.5, 5)) + (10.0,)
+PREFIXO = "leaozinho"
+
+
+class Histograma:
+    """Latências agrupadas em baldes fixos, como os histogramas do Prometheus."""
+    
+    def __init__(self, limites: tuple = LIMITES_PADRAO):
+        self.limites = limites
+        self.baldes = [0] * (len(limites) + 1)
+        self.quantidade = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+    
+    def observar(self, segundos: float):
+        self.baldes[bisect.bisect_left(self.limites, segundos)] += 1
+        self.quantidade += 1
+        self.soma += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+    
+    def quantil(self, fracao: float) -> float:
+        """Estimativa pelo limite superior do balde que contém o quantil."""
+        if not self.quantidade:
+            return 0.0
+        alvo = fracao * self.quantidade
+        acumulado = 0
+        for limite, quantidade in zip(self.limites, self.baldes):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return min(limite, self.maximo)
+        return self.maximo
+    
+    def resumo(self) -> dict:
+        return {
+            "quantidade": self.quantidade,
+            "soma_s": self.soma,
+            "media_ms": self.soma / max(self.quantidade, 1) * 1000,
+            "p50_ms": self.quantil(0.50) * 1000,
+            "p95_ms": self.quantil(0.95) * 1000,
+            "p99_ms": self.quantil(0.99) * 1000,
+            "maximo_ms": self.maximo * 1000
+        }
+
+
+class _CronometroNulo:
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *erro):
+        return False
+
+
+_NULO = _CronometroNulo()
+
+
+class _Cronometro:
+    __slots__ = ("_metricas", "_nome", "_inicio")
+    
+    def __init__(self, metricas: "Metricas", nome: str):
+        self._metricas = metricas
+        self._nome = nome
+    
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+    
+    def __exit__(self, *erro):
+        self._metricas.observar(self._nome, time.perf_counter() - self._inicio)
+        return False
+
+
+class Metricas:
+    """Contadores e histogramas de latência por fase (giro, avaliação, persistência, renderização).
+    
+    Desativadas, cronometro() devolve sempre o mesmo objeto vazio e as demais chamadas
+    retornam na primeira comparação.
+    """
+    
+    def __init__(self, ativo: bool = False):
+        self._ativo = ativo
+        self._trava = threading.Lock()
+        self._contadores = {}
+        self._histogramas = {}
+    
+    @property
+    def ativo(self) -> bool:
+        return self._ativo
+    
+    def ativar(self):
+        self._ativo = True
+    
+    def desativar(self):
+        self._ativo = False
+    
+    def limpar(self):
+        with self._trava:
+            self._contadores = {}
+            self._histogramas = {}
+    
+    def contar(self, nome: str, quantidade: int = 1):
+        if not self._ativo:
+            return
+        with self._trava:
+            self._contadores[nome] = self._contadores.get(nome, 0) + quantidade
+    
+    def observar(self, nome: str, segundos: float):
+        if not self._ativo:
+            return
+        with self._trava:
+            histograma = self._histogramas.get(nome)
+            if histograma is None:
+                histograma = self._histogramas[nome] = Histograma()
+            histograma.observar(segundos)
+    
+    def cronometro(self, nome: str):
+        """Mede o bloco `with` e registra a duração no histograma `nome`."""
+        if not self._ativo:
+            return _NULO
+        return _Cronometro(self, nome)
+    
+    def cronometrado(self, nome: str):
+        """Decorador: mede cada chamada da função no histograma `nome`."""
+        def decorar(funcao):
+            @functools.wraps(funcao)
+            def medir(*args, **kwargs):
+                if not self._ativo:
+                    return funcao(*args, **kwargs)
+                inicio = time.perf_counter()
+                try:
+                    return funcao(*args, **kwargs)
+                finally:
+                    self.observar(nome, time.perf_counter() - inicio)
+            return medir
+        return decorar
+    
+    def instantaneo(self) -> dict:
+        with self._trava:
+            return {
+                "momento": time.time(),
+                "contadores": dict(self._contadores),
+                "fases": {nome: histograma.resumo() for nome, histograma in self._histogramas.items()}
+            }
+    
+    def salvar_json(self, caminho: str):
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(self.instantaneo(), arquivo, ensure_ascii=False, indent=2)
+    
+    def texto_prometheus(self) -> str:
+        linhas = []
+        with self._trava:
+            for nome, valor in sorted(self._contadores.items()):
+                linhas.append(f"# TYPE {PREFIXO}_{nome}_total counter")
+                linhas.append(f"{PREFIXO}_{nome}_total {valor}")
+            if self._histogramas:
+                familia = f"{PREFIXO}_duracao_segundos"
+                linhas.append(f"# TYPE {familia} histogram")
+                for nome, histograma in sorted(self._histogramas.items()):
+                    acumulado = 0
+                    for limite, quantidade in zip(histograma.limites, histograma.baldes):
+                        acumulado += quantidade
+                        linhas.append(f'{familia}_bucket{{fase="{nome}",le="{limite:g}"}} {acumulado}')
+                    linhas.append(f'{familia}_bucket{{fase="{nome}",le="+Inf"}} {histograma.quantidade}')
+                    linhas.append(f'{familia}_sum{{fase="{nome}"}} {histograma.soma!r}')
+                    linhas.append(f'{familia}_count{{fase="{nome}"}} {histograma.quantidade}')
+        return "\n".join(linhas) + "\n"
+
+
+class ServidorMetricas:
+    """Endpoint HTTP local: /metrics no formato texto do Prometheus e /metrics.json com o instantâneo."""
+    
+    def __init__(self, metricas: "Metricas", porta: int, host: str = "127.0.0.1"):
+        # http.server só é importado por quem liga o endpoint: custa mais que o resto do backend junto
+        from http.server import ThreadingHTTPServer
+        self._servidor = ThreadingHTTPServer((host, porta), _criar_tratador(metricas))
+        self._servidor.daemon_threads = True
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+    
+    @property
+    def endereco(self) -> str:
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}/metrics"
+    
+    def fechar(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        self._thread.join()
+
+
+def _criar_tratador(metricas: "Metricas"):
+    from http.server import BaseHTTPRequestHandler
+    
+    class TratadorMetricas(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                corpo = metricas.texto_prometheus().encode('utf-8')
+                tipo = "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path == "/metrics.json":
+                corpo = json.dumps(metricas.instantaneo(), ensure_ascii=False).encode('utf-8')
+                tipo = "application/json; charset=utf-8"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+        
+        def log_message(self, formato, *args):
+            pass
+    return TratadorMetricas
+
+
+# Instância global, desligada até alguém chamar ativar() (veja servidor.py --metricas)
+metricas = Metricas()
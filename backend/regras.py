@@ -0,0 +1,32 @@
+from .simbolo import Simbolo
+from .simbolo_especial import SimboloEspecial
+
+
+CLASSES_COMBINACAO = ("trinca", "coringa", "par", "nenhum")
+
+
+def classificar_combinacao(simbolos: list) -> tuple[str, Simbolo, int]:
+    simbolo1, simbolo2, simbolo3 = simbolos
+    
+    coringas = [s for s in simbolos if isinstance(s, SimboloEspecial) and s.eh_coringa]
+    
+    if simbolo1.id == simbolo2.id == simbolo3.id:
+        return "trinca", simbolo1, 3  # Prêmio triplo
+    
+    if len(coringas) >= 1:
+        nao_coringas = [s for s in simbolos if not (isinstance(s, SimboloEspecial) and s.eh_coringa)]
+        
+        if len(nao_coringas) >= 2 and nao_coringas[0].id == nao_coringas[1].id:
+            return "coringa", nao_coringas[0], 2
+    
+    if simbolo1.id == simbolo2.id or simbolo2.id == simbolo3.id or simbolo1.id == simbolo3.id:
+        if simbolo1.id == simbolo2.id:
+            simbolo_vencedor = simbolo1
+        elif simbolo2.id == simbolo3.id:
+            simbolo_vencedor = simbolo2
+        else:
+            simbolo_vencedor = simbolo1
+        
+        return "par", simbolo_vencedor, 1
+    
+    return "nenhum", None, 0
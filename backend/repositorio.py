@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+
+
+class RepositorioUsuarios(ABC):
+    
+    @abstractmethod
+    def existe(self, nome: str) -> bool:
+        pass
+    
+    @abstractmethod
+    def buscar(self, nome: str, recentes: int = None) -> dict:
+        """Com recentes, traz só as últimas entradas do histórico e os totais em total_transacoes/total_jogadas."""
+        pass
+    
+    @abstractmethod
+    def resumo(self, nome: str) -> dict:
+        pass
+    
+    @abstractmethod
+    def inserir(self, nome: str, dados: dict) -> bool:
+        """Retorna False se o nome, CPF, email ou telefone já pertencerem a outro usuário."""
+        pass
+    
+    @abstractmethod
+    def atualizar_cadastro(self, nome: str, campos: dict) -> bool:
+        """Altera CPF, email ou telefone mantendo os índices; False se algum já for de outro usuário."""
+        pass
+    
+    @abstractmethod
+    def buscar_por(self, campo: str, valor: str) -> str:
+        """Nome do usuário com esse CPF, email ou telefone, comparado na forma normalizada."""
+        pass
+    
+    @abstractmethod
+    def buscar_prefixo(self, campo: str, prefixo: str, limite: int = 20) -> list:
+        pass
+    
+    @abstractmethod
+    def atualizar(self, nome: str, saldo: float, chave_pix: str,
+                  inicio_transacoes: int, transacoes: list,
+                  inicio_jogadas: int, jogadas: list, esperado: dict = None) -> bool:
+        """Com esperado (um resumo), False se o saldo ou os totais de histórico gravados forem outros.
+        
+        Uma falha de gravação é repassada como OSError.
+        """
+        pass
+    
+    @abstractmethod
+    def historico(self, nome: str, tipo: str, inicio: int, fim: int) -> list:
+        """Entradas de "transacoes" ou "jogadas" nas posições [inicio, fim)."""
+        pass
+    
+    @abstractmethod
+    def listar_nomes(self) -> list:
+        pass
+    
+    def fechar(self):
+        pass
+    
+    def copiar_para(self, destino: "RepositorioUsuarios") -> int:
+        copiados = 0
+        for nome in self.listar_nomes():
+            if not destino.existe(nome):
+                destino.inserir(nome, self.buscar(nome))
+                copiados += 1
+        return copiados
@@ -0,0 +1,193 @@
+import json
+import os
+from datetime import datetime
+from .repositorio import RepositorioUsuarios
+from .diario import DiarioUsuarios
+from .arquivo_historico import ArquivoHistorico
+from .indice_usuarios import IndiceUsuarios, CAMPOS_INDEXADOS
+from .eventos import eventos, AVISO, ERRO
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Entradas de histórico mantidas no snapshot por usuário; as mais antigas vão para o arquivo em blocos
+LIMITE_HISTORICO_MEMORIA = 2000
+TIPOS_HISTORICO = ("transacoes", "jogadas")
+
+
+def _travar_processo(caminho: str):
+    # Só um processo por vez pode escrever no mesmo arquivo de dados
+    arquivo = open(caminho, 'a+')
+    try:
+        if fcntl:
+            fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            arquivo.seek(0)
+            msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        arquivo.close()
+        raise RuntimeError(f"Os dados em '{caminho}' já estão em uso por outro processo.")
+    return arquivo
+
+
+class RepositorioJson(RepositorioUsuarios):
+    
+    def __init__(self, arquivo_dados: str = "usuarios.json"):
+        self._arquivo_dados = arquivo_dados
+        self._trava_processo = _travar_processo(arquivo_dados + ".trava")
+        self._diario = DiarioUsuarios(arquivo_dados)
+        self._arquivo_historico = ArquivoHistorico(arquivo_dados + ".historico")
+        self._usuarios = self._carregar_usuarios()
+        # Migração: o arquivo antigo (ou o último snapshot) é a base e o diário é reaplicado por cima
+        self._diario.reaplicar(self._usuarios)
+        self._indice = IndiceUsuarios()
+        for nome, dados in self._usuarios.items():
+            repetido = self._indice.adicionar(nome, dados)
+            if repetido:
+                eventos.emitir(AVISO, "indice_repetido", usuario=nome, campo=repetido,
+                               mensagem=f"⚠️ Aviso: {repetido} de '{nome}' já pertence a outro usuário; o índice mantém o primeiro cadastro.")
+    
+    def _carregar_usuarios(self) -> dict:
+        if not os.path.exists(self._arquivo_dados):
+            return {}
+        
+        try:
+            with open(self._arquivo_dados, 'r', encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except (json.JSONDecodeError, IOError):
+            # Guarda o arquivo danificado em vez de sobrescrevê-lo no próximo snapshot
+            copia = f"{self._arquivo_dados}.corrompido-{datetime.now():%Y%m%d%H%M%S}"
+            os.replace(self._arquivo_dados, copia)
+            eventos.emitir(AVISO, "dados_corrompidos",
+                           mensagem=f"⚠️ Aviso: Erro ao carregar dados de usuários. Arquivo preservado em '{copia}'.")
+            return {}
+    
+    def _registrar(self, registro: dict):
+        # Se o diário não gravar, nada muda em memória e o erro chega a quem pediu a gravação
+        try:
+            self._diario.registrar(registro, self._usuarios)
+        except OSError as e:
+            eventos.emitir(ERRO, "gravacao_falhou", mensagem=f"❌ Erro ao salvar dados: {e}")
+            raise
+    
+    def compactar(self):
+        self._diario.compactar(self._usuarios)
+    
+    def existe(self, nome: str) -> bool:
+        return nome in self._usuarios
+    
+    def buscar(self, nome: str, recentes: int = None) -> dict:
+        with self._diario.trava:
+            dados = self._usuarios.get(nome)
+            if dados is None:
+                return None
+            copia = {chave: valor for chave, valor in dados.items() if not chave.startswith("arquivadas_")}
+            for tipo in TIPOS_HISTORICO:
+                total = self._total_historico(dados, tipo)
+                inicio = 0 if recentes is None else max(total - recentes, 0)
+                copia["historico_" + tipo] = self._faixa_historico(nome, dados, tipo, inicio, total)
+                if recentes is not None:
+                    copia["total_" + tipo] = total
+        return copia
+    
+    def historico(self, nome: str, tipo: str, inicio: int, fim: int) -> list:
+        with self._diario.trava:
+            dados = self._usuarios.get(nome)
+            if dados is None:
+                return []
+            return self._faixa_historico(nome, dados, tipo, inicio, fim)
+    
+    def resumo(self, nome: str) -> dict:
+        dados = self._usuarios.get(nome)
+        if dados is None:
+            return None
+        return {
+            "saldo": dados.get("saldo", 0.0),
+            "chave_pix": dados.get("chave_pix", ""),
+            "transacoes": self._total_historico(dados, "transacoes"),
+            "jogadas": self._total_historico(dados, "jogadas")
+        }
+    
+    def _total_historico(self, dados: dict, tipo: str) -> int:
+        return dados.get("arquivadas_" + tipo, 0) + len(dados.get("historico_" + tipo, []))
+    
+    def _faixa_historico(self, nome: str, dados: dict, tipo: str, inicio: int, fim: int) -> list:
+        arquivadas = dados.get("arquivadas_" + tipo, 0)
+        fim = min(fim, self._total_historico(dados, tipo))
+        if inicio >= fim:
+            return []
+        frias = self._arquivo_historico.ler(nome, tipo, inicio, min(fim, arquivadas)) if inicio < arquivadas else []
+        return frias + dados.get("historico_" + tipo, [])[max(inicio - arquivadas, 0):fim - arquivadas]
+    
+    def _arquivar_historico(self, nome: str):
+        # Move blocos inteiros para o arquivo antes de registrar no diário que saíram do snapshot
+        dados = self._usuarios[nome]
+        bloco = self._arquivo_historico.tamanho_bloco
+        for tipo in TIPOS_HISTORICO:
+            while len(dados.get("historico_" + tipo, [])) >= LIMITE_HISTORICO_MEMORIA + bloco:
+                arquivadas = dados.get("arquivadas_" + tipo, 0)
+                self._arquivo_historico.gravar(nome, tipo, arquivadas // bloco, dados["historico_" + tipo][:bloco])
+                self._registrar({"op": "arquivamento", "nome": nome, "tipo": tipo, "ate": arquivadas + bloco})
+    
+    def inserir(self, nome: str, dados: dict) -> bool:
+        with self._diario.trava:
+            if nome in self._usuarios or self._indice.conflito(dados):
+                return False
+            self._registrar({"op": "cadastro", "nome": nome, "dados": dados})
+            self._indice.adicionar(nome, dados)
+        return True
+    
+    def atualizar_cadastro(self, nome: str, campos: dict) -> bool:
+        campos = {campo: valor for campo, valor in campos.items() if campo in CAMPOS_INDEXADOS}
+        with self._diario.trava:
+            dados = self._usuarios.get(nome)
+            if dados is None or self._indice.conflito(campos, ignorar=nome):
+                return False
+            self._indice.remover(nome, dados)
+            try:
+                self._registrar({"op": "perfil", "nome": nome, "campos": campos})
+            finally:
+                self._indice.adicionar(nome, dados)
+        return True
+    
+    def buscar_por(self, campo: str, valor: str) -> str:
+        return self._indice.buscar(campo, valor)
+    
+    def buscar_prefixo(self, campo: str, prefixo: str, limite: int = 20) -> list:
+        with self._diario.trava:
+            return self._indice.buscar_prefixo(campo, prefixo, limite)
+    
+    def atualizar(self, nome: str, saldo: float, chave_pix: str,
+                  inicio_transacoes: int, transacoes: list,
+                  inicio_jogadas: int, jogadas: list, esperado: dict = None) -> bool:
+        with self._diario.trava:
+            # Os totais entram na comparação: o saldo pode ter voltado ao mesmo valor com lançamentos no meio
+            if esperado is not None and any(self.resumo(nome)[campo] != esperado[campo]
+                                            for campo in ("saldo", "transacoes", "jogadas")):
+                return False
+            self._registrar({
+                "op": "atualizacao",
+                "nome": nome,
+                "saldo": saldo,
+                "chave_pix": chave_pix,
+                "t": inicio_transacoes,
+                "transacoes": transacoes,
+                "j": inicio_jogadas,
+                "jogadas": jogadas
+            })
+            try:
+                self._arquivar_historico(nome)
+            except OSError as e:
+                eventos.emitir(ERRO, "arquivamento_falhou", usuario=nome, mensagem=f"❌ Erro ao arquivar histórico: {e}")
+        return True
+    
+    def listar_nomes(self) -> list:
+        return list(self._usuarios.keys())
+    
+    def fechar(self):
+        self._diario.aguardar()
+        self._trava_processo.close()
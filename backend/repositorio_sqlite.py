@@ -0,0 +1,256 @@
+import json
+import sqlite3
+import threading
+from .repositorio import RepositorioUsuarios
+from .indice_usuarios import CAMPOS_INDEXADOS, normalizar
+from .eventos import eventos, AVISO
+
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    nome TEXT PRIMARY KEY,
+    senha TEXT NOT NULL,
+    saldo REAL NOT NULL,
+    nome_completo TEXT NOT NULL DEFAULT '',
+    cpf TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    telefone TEXT NOT NULL DEFAULT '',
+    chave_pix TEXT NOT NULL DEFAULT '',
+    cpf_normalizado TEXT NOT NULL DEFAULT '',
+    email_normalizado TEXT NOT NULL DEFAULT '',
+    telefone_normalizado TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS transacoes (
+    usuario TEXT NOT NULL REFERENCES usuarios(nome),
+    posicao INTEGER NOT NULL,
+    tipo TEXT NOT NULL,
+    valor REAL NOT NULL,
+    data TEXT NOT NULL,
+    saldo_apos REAL NOT NULL,
+    PRIMARY KEY (usuario, posicao)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS jogadas (
+    usuario TEXT NOT NULL REFERENCES usuarios(nome),
+    posicao INTEGER NOT NULL,
+    aposta REAL NOT NULL,
+    premio REAL NOT NULL,
+    lucro REAL NOT NULL,
+    simbolos TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (usuario, posicao)
+) WITHOUT ROWID;
+"""
+
+SQL_EXISTE = "SELECT 1 FROM usuarios WHERE nome = ?"
+SQL_BUSCAR = ("SELECT senha, saldo, nome_completo, cpf, email, telefone, chave_pix "
+              "FROM usuarios WHERE nome = ?")
+# As posições são contíguas a partir de 0, então MAX + 1 dá o total sem varrer o histórico
+SQL_RESUMO = ("SELECT saldo, chave_pix, "
+              "(SELECT COALESCE(MAX(posicao) + 1, 0) FROM transacoes WHERE usuario = ?), "
+              "(SELECT COALESCE(MAX(posicao) + 1, 0) FROM jogadas WHERE usuario = ?) "
+              "FROM usuarios WHERE nome = ?")
+SQL_TRANSACOES = ("SELECT tipo, valor, data, saldo_apos FROM transacoes "
+                  "WHERE usuario = ? AND posicao >= ? AND posicao < ? ORDER BY posicao")
+SQL_JOGADAS = ("SELECT aposta, premio, lucro, simbolos, data FROM jogadas "
+               "WHERE usuario = ? AND posicao >= ? AND posicao < ? ORDER BY posicao")
+SQL_INSERIR_USUARIO = ("INSERT INTO usuarios (nome, senha, saldo, nome_completo, cpf, email, telefone, chave_pix, "
+                       "cpf_normalizado, email_normalizado, telefone_normalizado) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+SQL_ATUALIZAR_USUARIO = "UPDATE usuarios SET saldo = ?, chave_pix = ? WHERE nome = ?"
+# Compare-and-swap: o saldo pode ter voltado ao mesmo valor, então os totais de histórico também são conferidos
+SQL_ATUALIZAR_USUARIO_SE_INALTERADO = (
+    "UPDATE usuarios SET saldo = ?, chave_pix = ? WHERE nome = ? AND saldo = ? "
+    "AND (SELECT COALESCE(MAX(posicao) + 1, 0) FROM transacoes WHERE usuario = usuarios.nome) = ? "
+    "AND (SELECT COALESCE(MAX(posicao) + 1, 0) FROM jogadas WHERE usuario = usuarios.nome) = ?"
+)
+SQL_CORTAR_TRANSACOES = "DELETE FROM transacoes WHERE usuario = ? AND posicao >= ?"
+SQL_CORTAR_JOGADAS = "DELETE FROM jogadas WHERE usuario = ? AND posicao >= ?"
+SQL_INSERIR_TRANSACAO = ("INSERT INTO transacoes (usuario, posicao, tipo, valor, data, saldo_apos) "
+                         "VALUES (?, ?, ?, ?, ?, ?)")
+SQL_INSERIR_JOGADA = ("INSERT INTO jogadas (usuario, posicao, aposta, premio, lucro, simbolos, data) "
+                      "VALUES (?, ?, ?, ?, ?, ?, ?)")
+SQL_LISTAR = "SELECT nome FROM usuarios ORDER BY rowid"
+# Índices únicos só entre os preenchidos: vários usuários antigos podem não ter telefone, por exemplo
+SQL_CRIAR_INDICE = ("CREATE {unico} INDEX IF NOT EXISTS usuarios_{campo} "
+                    "ON usuarios ({campo}_normalizado) WHERE {campo}_normalizado != ''")
+SQL_BUSCAR_POR = "SELECT nome FROM usuarios WHERE {campo}_normalizado = ? ORDER BY rowid LIMIT 1"
+SQL_BUSCAR_PREFIXO = ("SELECT nome FROM usuarios WHERE {campo}_normalizado >= ? AND {campo}_normalizado < ? "
+                      "AND {campo}_normalizado != '' ORDER BY {campo}_normalizado LIMIT ?")
+SQL_ATUALIZAR_CAMPO = "UPDATE usuarios SET {campo} = ?, {campo}_normalizado = ? WHERE nome = ?"
+
+
+def _data(valor: str):
+    # A coluna é TEXT: os milissegundos voltam como texto; datas antigas já formatadas ficam como estão
+    return int(valor) if valor.isdigit() else valor
+
+
+def _transacao(linha: tuple) -> dict:
+    tipo, valor, data, saldo_apos = linha
+    return {"tipo": tipo, "valor": valor, "data": _data(data), "saldo_apos": saldo_apos}
+
+
+def _jogada(linha: tuple) -> dict:
+    aposta, premio, lucro, simbolos, data = linha
+    return {"aposta": aposta, "premio": premio, "lucro": lucro, "simbolos": json.loads(simbolos), "data": _data(data)}
+
+
+class RepositorioSqlite(RepositorioUsuarios):
+    
+    def __init__(self, arquivo_dados: str = "usuarios.db"):
+        self._arquivo_dados = arquivo_dados
+        self._conexao = sqlite3.connect(arquivo_dados, check_same_thread=False)
+        self._trava = threading.Lock()
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.execute("PRAGMA foreign_keys=ON")
+        self._conexao.executescript(ESQUEMA)
+        self._migrar_indices()
+        self._conexao.commit()
+    
+    def _migrar_indices(self):
+        # Bancos criados antes dos índices não têm as colunas normalizadas: cria e preenche uma vez
+        colunas = {linha[1] for linha in self._conexao.execute("PRAGMA table_info(usuarios)")}
+        for campo in CAMPOS_INDEXADOS:
+            if campo + "_normalizado" not in colunas:
+                self._conexao.execute(f"ALTER TABLE usuarios ADD COLUMN {campo}_normalizado TEXT NOT NULL DEFAULT ''")
+                self._conexao.executemany(SQL_ATUALIZAR_CAMPO.format(campo=campo), (
+                    (valor, normalizar(campo, valor), nome)
+                    for nome, valor in self._conexao.execute(f"SELECT nome, {campo} FROM usuarios").fetchall()
+                ))
+            try:
+                self._conexao.execute(SQL_CRIAR_INDICE.format(unico="UNIQUE", campo=campo))
+            except sqlite3.IntegrityError:
+                eventos.emitir(AVISO, "indice_repetido", campo=campo,
+                               mensagem=f"⚠️ Aviso: Há {campo} repetido entre usuários antigos; o índice de {campo} não será único.")
+                self._conexao.execute(SQL_CRIAR_INDICE.format(unico="", campo=campo))
+    
+    def existe(self, nome: str) -> bool:
+        with self._trava:
+            return self._conexao.execute(SQL_EXISTE, (nome,)).fetchone() is not None
+    
+    def buscar(self, nome: str, recentes: int = None) -> dict:
+        with self._trava:
+            linha = self._conexao.execute(SQL_BUSCAR, (nome,)).fetchone()
+            if linha is None:
+                return None
+            _, _, total_t, total_j = self._conexao.execute(SQL_RESUMO, (nome, nome, nome)).fetchone()
+            inicio_t = 0 if recentes is None else max(total_t - recentes, 0)
+            inicio_j = 0 if recentes is None else max(total_j - recentes, 0)
+            transacoes = self._conexao.execute(SQL_TRANSACOES, (nome, inicio_t, total_t)).fetchall()
+            jogadas = self._conexao.execute(SQL_JOGADAS, (nome, inicio_j, total_j)).fetchall()
+        
+        senha, saldo, nome_completo, cpf, email, telefone, chave_pix = linha
+        dados = {
+            "senha": senha,
+            "saldo": saldo,
+            "nome_completo": nome_completo,
+            "cpf": cpf,
+            "email": email,
+            "telefone": telefone,
+            "chave_pix": chave_pix,
+            "historico_transacoes": [_transacao(linha) for linha in transacoes],
+            "historico_jogadas": [_jogada(linha) for linha in jogadas]
+        }
+        if recentes is not None:
+            dados["total_transacoes"] = total_t
+            dados["total_jogadas"] = total_j
+        return dados
+    
+    def historico(self, nome: str, tipo: str, inicio: int, fim: int) -> list:
+        if tipo == "transacoes":
+            with self._trava:
+                return [_transacao(linha) for linha in self._conexao.execute(SQL_TRANSACOES, (nome, inicio, fim))]
+        with self._trava:
+            return [_jogada(linha) for linha in self._conexao.execute(SQL_JOGADAS, (nome, inicio, fim))]
+    
+    def resumo(self, nome: str) -> dict:
+        with self._trava:
+            linha = self._conexao.execute(SQL_RESUMO, (nome, nome, nome)).fetchone()
+        if linha is None:
+            return None
+        saldo, chave_pix, n_transacoes, n_jogadas = linha
+        return {"saldo": saldo, "chave_pix": chave_pix, "transacoes": n_transacoes, "jogadas": n_jogadas}
+    
+    def inserir(self, nome: str, dados: dict) -> bool:
+        try:
+            with self._trava, self._conexao:
+                self._conexao.execute(SQL_INSERIR_USUARIO, (
+                    nome,
+                    dados["senha"],
+                    dados.get("saldo", 0.0),
+                    dados.get("nome_completo", ""),
+                    dados.get("cpf", ""),
+                    dados.get("email", ""),
+                    dados.get("telefone", ""),
+                    dados.get("chave_pix", ""),
+                    *(normalizar(campo, dados.get(campo, "")) for campo in CAMPOS_INDEXADOS)
+                ))
+                self._inserir_historico(nome, 0, dados.get("historico_transacoes", []),
+                                        0, dados.get("historico_jogadas", []))
+        except sqlite3.IntegrityError:
+            # Nome repetido ou CPF/email/telefone já usado por outro usuário
+            return False
+        return True
+    
+    def atualizar_cadastro(self, nome: str, campos: dict) -> bool:
+        try:
+            with self._trava, self._conexao:
+                for campo, valor in campos.items():
+                    if campo in CAMPOS_INDEXADOS:
+                        self._conexao.execute(SQL_ATUALIZAR_CAMPO.format(campo=campo),
+                                              (valor, normalizar(campo, valor), nome))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+    
+    def buscar_por(self, campo: str, valor: str) -> str:
+        chave = normalizar(campo, valor)
+        if not chave:
+            return None
+        with self._trava:
+            linha = self._conexao.execute(SQL_BUSCAR_POR.format(campo=campo), (chave,)).fetchone()
+        return linha[0] if linha else None
+    
+    def buscar_prefixo(self, campo: str, prefixo: str, limite: int = 20) -> list:
+        prefixo = normalizar(campo, prefixo)
+        with self._trava:
+            return [nome for (nome,) in self._conexao.execute(
+                SQL_BUSCAR_PREFIXO.format(campo=campo), (prefixo, prefixo + "\U0010ffff", limite)
+            )]
+    
+    def atualizar(self, nome: str, saldo: float, chave_pix: str,
+                  inicio_transacoes: int, transacoes: list,
+                  inicio_jogadas: int, jogadas: list, esperado: dict = None) -> bool:
+        with self._trava, self._conexao:
+            if esperado is None:
+                self._conexao.execute(SQL_ATUALIZAR_USUARIO, (saldo, chave_pix, nome))
+            elif self._conexao.execute(SQL_ATUALIZAR_USUARIO_SE_INALTERADO, (
+                    saldo, chave_pix, nome, esperado["saldo"], esperado["transacoes"], esperado["jogadas"]
+            )).rowcount == 0:
+                # Outro processo alterou o saldo ou o histórico desde a última leitura
+                return False
+            self._conexao.execute(SQL_CORTAR_TRANSACOES, (nome, inicio_transacoes))
+            self._conexao.execute(SQL_CORTAR_JOGADAS, (nome, inicio_jogadas))
+            self._inserir_historico(nome, inicio_transacoes, transacoes, inicio_jogadas, jogadas)
+        return True
+    
+    def _inserir_historico(self, nome: str, inicio_transacoes: int, transacoes: list,
+                           inicio_jogadas: int, jogadas: list):
+        self._conexao.executemany(SQL_INSERIR_TRANSACAO, (
+            (nome, inicio_transacoes + i, t.get("tipo", ""), t.get("valor", 0.0),
+             t.get("data", ""), t.get("saldo_apos", 0.0))
+            for i, t in enumerate(transacoes)
+        ))
+        self._conexao.executemany(SQL_INSERIR_JOGADA, (
+            (nome, inicio_jogadas + i, j.get("aposta", 0.0), j.get("premio", 0.0), j.get("lucro", 0.0),
+             json.dumps(j.get("simbolos", []), ensure_ascii=False), j.get("data", ""))
+            for i, j in enumerate(jogadas)
+        ))
+    
+    def listar_nomes(self) -> list:
+        with self._trava:
+            return [nome for (nome,) in self._conexao.execute(SQL_LISTAR)]
+    
+    def fechar(self):
+        with self._trava:
+            self._conexao.close()
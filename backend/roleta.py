@@ -1,43 +1,105 @@
-import random
+from itertools import count
+from .gerador import FluxoPadrao
 from .simbolo import Simbolo
-from .simbolo_comum import SimboloComum
-from .simbolo_especial import SimboloEspecial
+from .catalogo import CEREJA, LIMAO, LARANJA, UVA, MELANCIA, SINO, ESTRELA, LEAO, DIAMANTE
+
+
+_versoes = count(1)
 
 
 class Roleta:
+    """Roleta com sorteio O(1) em dois modos.
     
-    def __init__(self):
-        self._simbolos = self._criar_simbolos()
-        self._resultado_atual = None
+    "fita": as paradas são as posições da fita física, na ordem de exibição, todas com a mesma chance.
+    "virtual": cada parada tem um peso (inteiro ou fracionário), sorteado pelo método alias de Walker.
+    """
     
-    def _criar_simbolos(self) -> list[Simbolo]:
-        simbolos = []
-        
-        simbolos_comuns = [
-            SimboloComum("Cereja", "🍒", multiplicador=2.0),
-            SimboloComum("Limão", "🍋", multiplicador=2.5),
-            SimboloComum("Laranja", "🍊", multiplicador=3.0),
-            SimboloComum("Uva", "🍇", multiplicador=3.5),
-            SimboloComum("Melancia", "🍉", multiplicador=4.0),
-            SimboloComum("Sino", "🔔", multiplicador=5.0),
-            SimboloComum("Estrela", "⭐", multiplicador=5.0),
-        ]
+    MODOS = ("fita", "virtual")
+    
+    def __init__(self, gerador=None, modo: str = "fita"):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de roleta inválido: {modo}")
+        self._resultado_atual = None
+        self._gerador = gerador if gerador is not None else FluxoPadrao()
         
-        for simbolo in simbolos_comuns:
-            simbolos.extend([simbolo] * 2)  # Cada símbolo comum aparece 2 vezes
+        tabela = self._criar_simbolos()
+        if modo == "fita":
+            self.definir_simbolos([simbolo for simbolo, peso in tabela for _ in range(peso)])
+        else:
+            self.definir_simbolos([simbolo for simbolo, _ in tabela], [peso for _, peso in tabela])
+    
+    def _criar_simbolos(self) -> list[tuple[Simbolo, int]]:
+        simbolos_comuns = [CEREJA, LIMAO, LARANJA, UVA, MELANCIA, SINO, ESTRELA]
         
-        leao = SimboloEspecial("Leão", "🦁", multiplicador=20.0, eh_coringa=True)
-        diamante = SimboloEspecial("Diamante", "💎", multiplicador=50.0, eh_coringa=False)
+        # Peso de cada símbolo: no modo fita, quantas vezes ele aparece na fita
+        tabela = [(simbolo, 2) for simbolo in simbolos_comuns]
         
-        simbolos.extend([leao] * 4)
+        tabela.append((LEAO, 4))
         
-        simbolos.append(diamante)
+        tabela.append((DIAMANTE, 1))
         
-        return simbolos
+        return tabela
     
     def girar(self) -> Simbolo:
-        self._resultado_atual = random.choice(self._simbolos)
-        return self._resultado_atual
+        return self._simbolos[self.girar_indice()]
+    
+    def girar_indice(self) -> int:
+        indice = self.parada(self._gerador.uniforme())
+        self._resultado_atual = self._simbolos[indice]
+        return indice
+    
+    def girar_indices(self, quantidade: int) -> list[int]:
+        indices = [self.parada(u) for u in self._gerador.uniformes(quantidade)]
+        if indices:
+            self._resultado_atual = self._simbolos[indices[-1]]
+        return indices
+    
+    def parada(self, uniforme: float) -> int:
+        """Converte um valor em [0, 1) na parada sorteada: uma coluna e, no modo virtual, um limiar."""
+        quantidade = len(self._simbolos)
+        posicao = uniforme * quantidade
+        coluna = min(int(posicao), quantidade - 1)
+        if self._alias is None or posicao - coluna < self._limiares[coluna]:
+            return coluna
+        return self._alias[coluna]
+    
+    def definir_simbolos(self, simbolos: list[Simbolo], pesos: list[float] = None):
+        if not simbolos:
+            raise ValueError("A roleta precisa de pelo menos um símbolo.")
+        if pesos is not None:
+            if len(pesos) != len(simbolos):
+                raise ValueError("A tabela de pesos precisa ter um peso por símbolo.")
+            if any(peso < 0 for peso in pesos) or sum(pesos) <= 0:
+                raise ValueError("Os pesos precisam ser não negativos e somar mais que zero.")
+        
+        self._simbolos = list(simbolos)
+        self._pesos = list(pesos) if pesos is not None else None
+        self._limiares, self._alias = _montar_alias(pesos) if pesos is not None else (None, None)
+        self._resultado_atual = None
+        self._versao = next(_versoes)
+    
+    def definir_gerador(self, gerador):
+        self._gerador = gerador
+    
+    @property
+    def gerador(self):
+        return self._gerador
+    
+    @property
+    def simbolos(self) -> list[Simbolo]:
+        return list(self._simbolos)
+    
+    @property
+    def pesos(self) -> list[float]:
+        return list(self._pesos) if self._pesos is not None else [1] * len(self._simbolos)
+    
+    @property
+    def modo(self) -> str:
+        return "fita" if self._pesos is None else "virtual"
+    
+    @property
+    def versao(self) -> int:
+        return self._versao
     
     @property
     def resultado_atual(self) -> Simbolo:
@@ -47,3 +109,25 @@ class Roleta:
         if self._resultado_atual:
             return str(self._resultado_atual)
         return "❓"
+
+
+def _montar_alias(pesos: list[float]) -> tuple[list[float], list[int]]:
+    """Tabela de Vose: cada coluna guarda a chance de ficar com ela mesma e para quem passar o resto."""
+    quantidade = len(pesos)
+    total = float(sum(pesos))
+    escalados = [peso * quantidade / total for peso in pesos]
+    limiares = [1.0] * quantidade
+    alias = list(range(quantidade))
+    
+    pequenos = [i for i, valor in enumerate(escalados) if valor < 1.0]
+    grandes = [i for i, valor in enumerate(escalados) if valor >= 1.0]
+    while pequenos and grandes:
+        pequeno = pequenos.pop()
+        grande = grandes[-1]
+        limiares[pequeno] = escalados[pequeno]
+        alias[pequeno] = grande
+        escalados[grande] -= 1.0 - escalados[pequeno]
+        if escalados[grande] < 1.0:
+            pequenos.append(grandes.pop())
+    # Sobras só por arredondamento: ficam com limiar 1
+    return limiares, alias
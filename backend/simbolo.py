@@ -1,9 +1,49 @@
+import threading
 from abc import ABC, abstractmethod
 
+# Cada nome de símbolo tem um id, o mesmo em todas as instâncias com esse nome. Os do catálogo são fixos,
+# porque vão para o histórico gravado; os demais nomes recebem ids de sessão, a partir daqui, nunca gravados
+PRIMEIRO_ID_SESSAO = 0x100
+_ids = {}
+_instancias = {}
+_trava_ids = threading.Lock()
+
+
+def _registrar_id(nome: str, id_fixo: int) -> int:
+    atual = _ids.get(nome)
+    if id_fixo is None:
+        if atual is None:
+            atual = _ids[nome] = PRIMEIRO_ID_SESSAO + sum(1 for i in _ids.values() if i >= PRIMEIRO_ID_SESSAO)
+        return atual
+    if atual is not None and atual != id_fixo:
+        raise ValueError(f"O símbolo '{nome}' já tem o id {atual}.")
+    dono = _instancias.get(id_fixo)
+    if id_fixo >= PRIMEIRO_ID_SESSAO or (dono is not None and dono.nome != nome):
+        raise ValueError(f"Id de símbolo inválido ou já usado: {id_fixo}")
+    _ids[nome] = id_fixo
+    return id_fixo
+
+
 class Simbolo(ABC):
-    def __init__(self, nome: str, icone: str):
+    __slots__ = ("_nome", "_icone", "_id")
+    
+    def __init__(self, nome: str, icone: str, id_fixo: int = None):
         self._nome = nome
         self._icone = icone
+        if id_fixo is None:
+            # O catálogo registra os ids fixos antes: um símbolo com o nome de um deles fica com o mesmo id
+            from . import catalogo  # noqa: F401
+        with _trava_ids:
+            self._id = _registrar_id(nome, id_fixo)
+            _instancias.setdefault(self._id, self)
+    
+    @staticmethod
+    def por_id(id_simbolo: int) -> "Simbolo":
+        return _instancias[id_simbolo]
+    
+    @property
+    def id(self) -> int:
+        return self._id
     
     @property
     def nome(self) -> str:
@@ -2,9 +2,10 @@ from .simbolo import Simbolo
 
 
 class SimboloComum(Simbolo):
+    __slots__ = ("_multiplicador",)
     
-    def __init__(self, nome: str, icone: str, multiplicador: float = 2.0):
-        super().__init__(nome, icone)
+    def __init__(self, nome: str, icone: str, multiplicador: float = 2.0, id_fixo: int = None):
+        super().__init__(nome, icone, id_fixo)
         self._multiplicador = multiplicador
     
     def calcular_premio(self, valor_aposta: float) -> float:
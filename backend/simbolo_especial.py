@@ -2,9 +2,11 @@ from .simbolo import Simbolo
 
 
 class SimboloEspecial(Simbolo):
-
-    def __init__(self, nome: str, icone: str, multiplicador: float = 10.0, eh_coringa: bool = False):
-        super().__init__(nome, icone)
+    __slots__ = ("_multiplicador", "_eh_coringa")
+    
+    def __init__(self, nome: str, icone: str, multiplicador: float = 10.0, eh_coringa: bool = False,
+                 id_fixo: int = None):
+        super().__init__(nome, icone, id_fixo)
         self._multiplicador = multiplicador
         self._eh_coringa = eh_coringa
     
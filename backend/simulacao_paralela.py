@@ -0,0 +1,136 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from fractions import Fraction
+
+import numpy as np
+
+from .maquina import Maquina
+from .analisador import chave_configuracao
+from .simulador import SimuladorRTP, AgregadoRTP, resumir_estatisticas
+
+
+# Primeiro elemento da chave de derivação dos fragmentos: não colide com os subfluxos (0, 1, 2) das roletas
+FLUXO_SIMULACAO = 0x51
+VERSAO_CHECKPOINT = 1
+
+
+def _simular_fragmento(modo: str, semente: int, indice: int, giros: int, tamanho_bloco: int) -> dict:
+    # Cada fragmento tem seu próprio fluxo PCG64: o resultado não depende de qual processo o executou
+    sequencia = np.random.SeedSequence(semente, spawn_key=(FLUXO_SIMULACAO, indice))
+    simulador = SimuladorRTP(Maquina(modo=modo), semente=sequencia, tamanho_bloco=tamanho_bloco)
+    return simulador.agregar(giros).para_dict()
+
+
+class SimulacaoParalela:
+    """Divide uma simulação de RTP em fragmentos com sementes determinísticas e roda em vários processos.
+    
+    Cada fragmento concluído vai para o checkpoint, então uma execução interrompida continua de onde parou.
+    """
+    
+    def __init__(self, giros: int, semente: int = None, modo: str = "fita", processos: int = None,
+                 giros_por_fragmento: int = 10_000_000, checkpoint: str = None, tamanho_bloco: int = 1_000_000):
+        self._giros = giros
+        # Sem semente, sorteia uma e guarda no checkpoint para a retomada usar os mesmos fluxos
+        self._semente = semente if semente is not None else np.random.SeedSequence().entropy
+        self._modo = modo
+        self._processos = processos or os.cpu_count() or 1
+        self._giros_por_fragmento = giros_por_fragmento
+        self._checkpoint = checkpoint
+        self._tamanho_bloco = tamanho_bloco
+        maquina = Maquina(modo=modo)
+        self._simulador = SimuladorRTP(maquina)
+        self._configuracao = repr(chave_configuracao(maquina.roletas))
+        self._concluidos = {}
+    
+    @property
+    def semente(self) -> int:
+        return self._semente
+    
+    @property
+    def fragmentos(self) -> int:
+        return -(-self._giros // self._giros_por_fragmento)
+    
+    def _giros_fragmento(self, indice: int) -> int:
+        return min(self._giros_por_fragmento, self._giros - indice * self._giros_por_fragmento)
+    
+    def _parametros(self) -> dict:
+        return {
+            "versao": VERSAO_CHECKPOINT,
+            "semente": self._semente,
+            "giros": self._giros,
+            "giros_por_fragmento": self._giros_por_fragmento,
+            "modo": self._modo,
+            "configuracao": self._configuracao
+        }
+    
+    def _carregar_checkpoint(self):
+        if not self._checkpoint or not os.path.exists(self._checkpoint):
+            return
+        with open(self._checkpoint, 'r', encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+        if dados.get("parametros") != self._parametros():
+            raise ValueError(f"O checkpoint '{self._checkpoint}' é de outra simulação (semente, giros ou roletas diferentes).")
+        self._concluidos = {int(indice): AgregadoRTP.de_dict(agregado)
+                            for indice, agregado in dados["concluidos"].items()}
+    
+    def _salvar_checkpoint(self):
+        if not self._checkpoint:
+            return
+        temporario = self._checkpoint + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                "parametros": self._parametros(),
+                "concluidos": {str(indice): agregado.para_dict() for indice, agregado in sorted(self._concluidos.items())}
+            }, arquivo)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self._checkpoint)
+    
+    def executar(self, ao_concluir=None) -> dict:
+        """Roda os fragmentos pendentes; `ao_concluir(concluidos, total)` é chamado a cada fragmento."""
+        self._carregar_checkpoint()
+        pendentes = [indice for indice in range(self.fragmentos) if indice not in self._concluidos]
+        argumentos = [(self._modo, self._semente, indice, self._giros_fragmento(indice), self._tamanho_bloco)
+                      for indice in pendentes]
+        
+        inicio = time.perf_counter()
+        if self._processos == 1:
+            for indice, args in zip(pendentes, argumentos):
+                self._concluir(indice, _simular_fragmento(*args), ao_concluir)
+        elif pendentes:
+            with ProcessPoolExecutor(min(self._processos, len(pendentes))) as executor:
+                futuros = {executor.submit(_simular_fragmento, *args): indice for indice, args in zip(pendentes, argumentos)}
+                for futuro in as_completed(futuros):
+                    self._concluir(futuros[futuro], futuro.result(), ao_concluir)
+        duracao = time.perf_counter() - inicio
+        
+        # Soma na ordem dos fragmentos: o resultado é o mesmo qualquer que seja a ordem de conclusão
+        total = AgregadoRTP(len(self._simulador.nomes))
+        for indice in sorted(self._concluidos):
+            total.combinar(self._concluidos[indice])
+        return self._resumir(total, duracao, sum(a[3] for a in argumentos))
+    
+    def _concluir(self, indice: int, agregado: dict, ao_concluir):
+        self._concluidos[indice] = AgregadoRTP.de_dict(agregado)
+        self._salvar_checkpoint()
+        if ao_concluir:
+            ao_concluir(len(self._concluidos), self.fragmentos)
+    
+    def _resumir(self, total: AgregadoRTP, duracao: float, giros_executados: int) -> dict:
+        resultado = resumir_estatisticas(total.giros, total.media, total.m2, total.acertos, duracao)
+        resultado["giros_por_segundo"] = giros_executados / duracao if duracao else 0.0
+        premios = self._simulador.premios_codigo
+        histograma = {}
+        for codigo, quantidade in enumerate(total.contagens.tolist()):
+            if quantidade:
+                histograma[float(premios[codigo])] = histograma.get(float(premios[codigo]), 0) + quantidade
+        resultado["semente"] = self._semente
+        resultado["fragmentos"] = self.fragmentos
+        resultado["classes"] = total.contagem_classes()
+        resultado["premios"] = dict(sorted(histograma.items()))
+        # Os prêmios são múltiplos exatos da aposta: pelas contagens o RTP sai sem erro de arredondamento
+        soma = sum(Fraction(valor) * quantidade for valor, quantidade in histograma.items())
+        resultado["rtp_contagens"] = float(soma / total.giros) if total.giros else 0.0
+        return resultado
@@ -0,0 +1,215 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+from .maquina import Maquina
+from .roleta import Roleta
+from .simbolo_especial import SimboloEspecial
+
+
+Z_95 = 1.959963984540054
+CLASSES = ("nenhum", "par", "coringa", "trinca")
+
+
+class SimuladorRTP:
+    """Simula giros em lote com NumPy, sem usuário, histórico nem prints."""
+    
+    def __init__(self, maquina: Maquina = None, semente: int = None, tamanho_bloco: int = 1_000_000):
+        maquina = maquina or Maquina()
+        self._gerador = np.random.default_rng(semente)
+        self._tamanho_bloco = tamanho_bloco
+        
+        # Os ids do catálogo viram índices densos; cada roleta vira um vetor de índices por parada
+        ids = {}
+        nomes = []
+        multiplicadores = []
+        coringas = []
+        self._fitas = []
+        self._probabilidades = []
+        for roleta in maquina.roletas:
+            fita = []
+            for simbolo in roleta.simbolos:
+                if simbolo.id not in ids:
+                    ids[simbolo.id] = len(ids)
+                    nomes.append(simbolo.nome)
+                    multiplicadores.append(simbolo.calcular_premio(1.0))
+                    coringas.append(isinstance(simbolo, SimboloEspecial) and simbolo.eh_coringa)
+                fita.append(ids[simbolo.id])
+            self._fitas.append(np.array(fita, dtype=np.uint8))
+            pesos = np.array(roleta.pesos, dtype=np.float64)
+            self._probabilidades.append(None if roleta.modo == "fita" else pesos / pesos.sum())
+        
+        self._nomes = nomes
+        self._multiplicadores = np.array(multiplicadores, dtype=np.float64)
+        self._coringas = np.array(coringas, dtype=bool)
+        # Cada resultado vira um código classe * n + símbolo vencedor; o prêmio é uma consulta por código
+        self._premios_codigo = np.concatenate([
+            np.zeros(len(nomes)), self._multiplicadores, 2.0 * self._multiplicadores, 3.0 * self._multiplicadores
+        ])
+    
+    @property
+    def nomes(self) -> list:
+        return list(self._nomes)
+    
+    @property
+    def premios_codigo(self) -> np.ndarray:
+        return self._premios_codigo.copy()
+    
+    def descrever_codigo(self, codigo: int) -> tuple:
+        """(classe, nome do símbolo vencedor) de um código de resultado."""
+        classe, vencedor = divmod(codigo, len(self._nomes))
+        return CLASSES[classe], (self._nomes[vencedor] if classe else None)
+    
+    def sortear(self, quantidade: int) -> tuple:
+        return tuple(
+            fita[self._gerador.integers(0, len(fita), size=quantidade, dtype=np.uint8)]
+            if probabilidades is None else
+            fita[self._gerador.choice(len(fita), size=quantidade, p=probabilidades)]
+            for fita, probabilidades in zip(self._fitas, self._probabilidades)
+        )
+    
+    def avaliar(self, ids1, ids2, ids3):
+        return self._premios_codigo[self.codificar(ids1, ids2, ids3)]
+    
+    def codificar(self, ids1, ids2, ids3):
+        # Mesmas regras de Maquina._verificar_vitoria, em ordem de prioridade: trinca, coringa + par, par
+        n = len(self._nomes)
+        iguais12 = ids1 == ids2
+        iguais23 = ids2 == ids3
+        iguais13 = ids1 == ids3
+        trinca = iguais12 & iguais23
+        
+        c1 = self._coringas[ids1]
+        c2 = self._coringas[ids2]
+        c3 = self._coringas[ids3]
+        um_coringa = (c1.view(np.uint8) + c2.view(np.uint8) + c3.view(np.uint8)) == 1
+        par_com_coringa = um_coringa & ((c1 & iguais23) | (c2 & iguais13) | (c3 & iguais12))
+        
+        # Sem trinca existe no máximo um par: se envolve a roleta 1 o vencedor é ids1, senão ids2
+        vencedor = np.where(iguais12 | iguais13, ids1, ids2)
+        vencedor_coringa = np.where(c1, ids2, ids1)
+        par = iguais12 | iguais23 | iguais13
+        
+        codigo = np.zeros(len(ids1), dtype=np.uint8)
+        np.copyto(codigo, vencedor + n, where=par)
+        np.copyto(codigo, vencedor_coringa + 2 * n, where=par_com_coringa)
+        np.copyto(codigo, ids1 + 3 * n, where=trinca)
+        return codigo
+    
+    def simular(self, giros: int) -> dict:
+        inicio = time.perf_counter()
+        agregado = self.agregar(giros)
+        return resumir_estatisticas(agregado.giros, agregado.media, agregado.m2, agregado.acertos,
+                                    time.perf_counter() - inicio)
+    
+    def agregar(self, giros: int) -> "AgregadoRTP":
+        agregado = AgregadoRTP(len(self._nomes))
+        restantes = giros
+        while restantes > 0:
+            quantidade = min(restantes, self._tamanho_bloco)
+            codigos = self.codificar(*self.sortear(quantidade))
+            agregado.adicionar(codigos, self._premios_codigo[codigos])
+            restantes -= quantidade
+        return agregado
+
+
+class AgregadoRTP:
+    """Estatísticas combináveis de um conjunto de giros: contagem por código de resultado e momentos de Welford.
+    
+    As contagens somam exatamente; média e M2 são combinadas pela fórmula de Chan et al.
+    """
+    
+    def __init__(self, simbolos: int, giros: int = 0, media: float = 0.0, m2: float = 0.0, contagens=None):
+        self.simbolos = simbolos
+        self.giros = giros
+        self.media = media
+        self.m2 = m2
+        self.contagens = (np.zeros(len(CLASSES) * simbolos, dtype=np.int64) if contagens is None
+                          else np.asarray(contagens, dtype=np.int64))
+    
+    @property
+    def acertos(self) -> int:
+        return self.giros - int(self.contagens[:self.simbolos].sum())
+    
+    def contagem_classes(self) -> dict:
+        por_classe = self.contagens.reshape(len(CLASSES), self.simbolos).sum(axis=1)
+        return {classe: int(quantidade) for classe, quantidade in zip(CLASSES, por_classe)}
+    
+    def adicionar(self, codigos, premios):
+        media = float(premios.mean())
+        self.combinar(AgregadoRTP(
+            self.simbolos, len(premios), media, float(np.square(premios - media).sum()),
+            np.bincount(codigos, minlength=len(self.contagens))
+        ))
+    
+    def combinar(self, outro: "AgregadoRTP"):
+        if not outro.giros:
+            return
+        total = self.giros + outro.giros
+        delta = outro.media - self.media
+        self.media += delta * outro.giros / total
+        self.m2 += outro.m2 + delta * delta * self.giros * outro.giros / total
+        self.giros = total
+        self.contagens = self.contagens + outro.contagens
+    
+    def para_dict(self) -> dict:
+        return {"simbolos": self.simbolos, "giros": self.giros, "media": self.media, "m2": self.m2,
+                "contagens": self.contagens.tolist()}
+    
+    @classmethod
+    def de_dict(cls, dados: dict) -> "AgregadoRTP":
+        return cls(dados["simbolos"], dados["giros"], dados["media"], dados["m2"], dados["contagens"])
+
+
+def resumir_estatisticas(giros: int, media: float, m2: float, acertos: int, duracao: float = 0.0) -> dict:
+    variancia = m2 / (giros - 1) if giros > 1 else 0.0
+    desvio = math.sqrt(variancia)
+    margem = Z_95 * desvio / math.sqrt(giros) if giros else 0.0
+    return {
+        "giros": giros,
+        "rtp": media,
+        "frequencia_acertos": acertos / giros if giros else 0.0,
+        "variancia": variancia,
+        "desvio_padrao": desvio,
+        "intervalo_confianca_95": (media - margem, media + margem),
+        "duracao": duracao,
+        "giros_por_segundo": giros / duracao if duracao else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação Monte Carlo do RTP da máquina")
+    parser.add_argument("--giros", type=int, default=10_000_000)
+    parser.add_argument("--semente", type=int, default=None)
+    parser.add_argument("--modo", choices=Roleta.MODOS, default="fita")
+    parser.add_argument("--processos", type=int, default=1, help="processos em paralelo (0 = um por núcleo)")
+    parser.add_argument("--fragmento", type=int, default=10_000_000, help="giros por fragmento da simulação paralela")
+    parser.add_argument("--checkpoint", default=None, metavar="ARQUIVO",
+                        help="guarda os fragmentos concluídos; rodar de novo com o mesmo arquivo retoma a simulação")
+    args = parser.parse_args()
+    
+    if args.processos != 1 or args.checkpoint:
+        from .simulacao_paralela import SimulacaoParalela
+        simulacao = SimulacaoParalela(args.giros, args.semente, args.modo, args.processos or None,
+                                      args.fragmento, args.checkpoint)
+        resultado = simulacao.executar(
+            lambda concluidos, total: print(f"\r⏳ Fragmentos: {concluidos}/{total}", end="", flush=True)
+        )
+        print(f"\r🌱 Semente: {resultado['semente']} ({resultado['fragmentos']} fragmentos)")
+    else:
+        resultado = SimuladorRTP(Maquina(modo=args.modo), semente=args.semente).simular(args.giros)
+    baixo, alto = resultado["intervalo_confianca_95"]
+    print(f"🎰 Giros simulados:     {resultado['giros']:,}")
+    print(f"💰 RTP:                 {resultado['rtp'] * 100:.3f}%  (IC 95%: {baixo * 100:.3f}% – {alto * 100:.3f}%)")
+    print(f"🎯 Frequência de acerto: {resultado['frequencia_acertos'] * 100:.3f}%")
+    print(f"📈 Variância:           {resultado['variancia']:.4f}  (desvio padrão {resultado['desvio_padrao']:.4f})")
+    print(f"⚡ Velocidade:          {resultado['giros_por_segundo'] / 1e6:.1f} M giros/s")
+    if "classes" in resultado:
+        print("🏷️ Classes:             " + ", ".join(f"{classe} {quantidade:,}" for classe, quantidade in resultado["classes"].items()))
+        print("💵 Prêmios (× aposta):  " + ", ".join(f"{valor:g}: {quantidade:,}" for valor, quantidade in resultado["premios"].items()))
+
+
+if __name__ == "__main__":
+    main()
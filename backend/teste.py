@@ -1,8 +1,25 @@
-from simbolo import Simbolo, SimboloComum, SimboloEspecial
-from usuario import Usuario
-from roleta import Roleta
-from maquina import Maquina
-from autenticacao import SistemaAutenticacao
+import asyncio
+import json
+import os
+import shutil
+import sys
+from itertools import product
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import Simbolo, SimboloComum, SimboloEspecial
+from backend.simbolo import PRIMEIRO_ID_SESSAO
+from backend.catalogo import CEREJA, LIMAO, LARANJA, DIAMANTE, nome_simbolo
+from backend import Usuario
+from backend import Roleta
+from backend import Maquina
+from backend.maquina import TAMANHO_BLOCO_LOTE
+from backend.analisador import analisar_roletas
+from backend.colunas import ColunasTransacoes
+from backend import SistemaAutenticacao, GravadorAssincrono
+from backend.eventos import eventos, mostrar_no_console, RegistroEventos, INFO, AVISO
+from backend.metricas import Metricas
+from servidor import ServidorJogo, Sessao
 
 
 def testar_simbolos():
@@ -31,6 +48,14 @@ def testar_simbolos():
     for simbolo in simbolos:
         print(f"  - {simbolo.nome}: R${simbolo.calcular_premio(aposta):.2f}")
     
+    assert cereja.id == Roleta().simbolos[0].id and leao.id != cereja.id
+    assert Roleta().simbolos[0] is Roleta().simbolos[0]
+    print(f"\n✓ Catálogo compartilhado: {cereja.nome} tem id {cereja.id} em todas as roletas")
+    
+    avulso = SimboloComum("Avulso", "❔")
+    assert DIAMANTE.id == 8 and avulso.id >= PRIMEIRO_ID_SESSAO and nome_simbolo(DIAMANTE.id) == "Diamante"
+    print(f"✓ Ids fixos no catálogo; símbolos fora dele ficam com ids de sessão ({avulso.id})")
+    
     print("\n✅ TESTE DE SÍMBOLOS CONCLUÍDO COM SUCESSO!")
 
 
@@ -49,6 +74,8 @@ def testar_usuario():
     print(f"\n✓ Teste de depósito:")
     usuario.depositar(50.0)
     print(f"  - Saldo após depósito: R${usuario.get_saldo():.2f}")
+    ultimo = eventos.recentes(1)[0]
+    assert ultimo.nome == "deposito" and ultimo.campos["valor"] == 50.0
     
     print(f"\n✓ Teste de depósito inválido (valor negativo):")
     usuario.depositar(-10.0)
@@ -61,6 +88,32 @@ def testar_usuario():
     print(f"\n✓ Teste de saque inválido (saldo insuficiente):")
     usuario.sacar(200.0)
     
+    saldo = usuario.get_saldo()
+    assert not usuario.depositar(float("inf")) and not usuario.sacar(float("nan"))
+    assert usuario.movimentar(5.0, "Bônus") and usuario.get_saldo() == saldo + 5.0
+    assert usuario.get_historico_transacoes()[-1]["tipo"] == "Outro"
+    transacoes = len(usuario.get_historico_transacoes())
+    assert not usuario.depositar(1e17) and not usuario.depositar(1e308)
+    assert usuario.get_saldo() == saldo + 5.0 and len(usuario.get_historico_transacoes()) == transacoes
+    colunas = ColunasTransacoes()
+    try:
+        colunas.anexar({"tipo": "Depósito", "valor": 1.0, "saldo_apos": 1e17})
+    except OverflowError:
+        pass
+    assert len(colunas) == 0 and all(len(coluna) == 0 for coluna in colunas._colunas)
+    print(f"\n✓ Valores não finitos ou fora da faixa do histórico recusados; tipo desconhecido registrado como 'Outro'")
+    
+    registro = RegistroEventos(capacidade=2, nivel=AVISO)
+    recebidos = []
+    registro.assinar(recebidos.append)
+    registro.emitir(INFO, "ignorado")
+    for numero in range(3):
+        registro.emitir(AVISO, "aviso", numero=numero)
+    registro.desativar()
+    registro.emitir(AVISO, "desativado")
+    print(f"\n✓ Eventos: {len(recebidos)} entregues, {len(registro.recentes())} no buffer circular")
+    assert [e.campos["numero"] for e in registro.recentes()] == [1, 2] and len(recebidos) == 3
+    
     print(f"\n✓ Teste de verificação de senha:")
     print(f"  - Senha correta: {usuario.verificar_senha('senha123')}")
     print(f"  - Senha incorreta: {usuario.verificar_senha('senha_errada')}")
@@ -87,6 +140,13 @@ def testar_roleta():
     for nome, quantidade in resultados.items():
         print(f"  - {nome}: {quantidade} vezes")
     
+    virtual = Roleta(modo="virtual")
+    assert len(virtual.simbolos) == 9 and analisar_roletas([virtual] * 3)["rtp"] == analisar_roletas([roleta] * 3)["rtp"]
+    virtual.definir_simbolos(virtual.simbolos[:2], [0.25, 0.75])
+    sorteios = virtual.girar_indices(20000)
+    print(f"\n✓ Roleta virtual com pesos 0.25/0.75: {sorteios.count(1) / len(sorteios):.1%} na segunda parada")
+    assert 0.72 < sorteios.count(1) / len(sorteios) < 0.78
+    
     print("\n✅ TESTE DE ROLETA CONCLUÍDO COM SUCESSO!")
 
 
@@ -113,12 +173,94 @@ def testar_maquina():
     
     print(f"\n✓ Saldo final: R${usuario.get_saldo():.2f}")
     
+    # Aposta cujo maior prêmio não caberia no histórico: recusada antes de debitar
+    milionario = Usuario("Milionario", "senha")
+    assert milionario.depositar(9e16)
+    maquina.definir_usuario(milionario)
+    assert maquina.jogar(9e16)["simbolos"] == [] and milionario.get_saldo() == 9e16
+    assert len(milionario.get_historico_transacoes()) == 1 and milionario.get_historico_jogadas() == []
+    maquina.definir_usuario(usuario)
+    print("✓ Aposta fora da faixa do histórico recusada sem debitar")
+    
+    medidas = Metricas()
+    medido = medidas.cronometrado("giro")(lambda: maquina.jogar_lote(10, 1.0))
+    medido()
+    medidas.ativar()
+    for _ in range(3):
+        medido()
+    fases = medidas.instantaneo()["fases"]
+    print(f"\n✓ Métricas: {fases['giro']['quantidade']} lotes medidos, média {fases['giro']['media_ms']:.3f} ms")
+    assert fases["giro"]["quantidade"] == 3 and 'leaozinho_duracao_segundos_count{fase="giro"} 3' in medidas.texto_prometheus()
+    
+    # Lote maior que o saldo: com fitas que nunca pagam, para quando o saldo não cobre a aposta e grava uma vez só
+    apostador = Usuario("Apostador", "senha", saldo_inicial=5.0)
+    maquina_lote = Maquina()
+    for roleta, simbolo in zip(maquina_lote.roletas, (CEREJA, LIMAO, LARANJA)):
+        roleta.definir_simbolos([simbolo])
+    maquina_lote.definir_usuario(apostador)
+    gravacoes = []
+    
+    class SistemaContado:
+        def atualizar_saldo(self, usuario):
+            gravacoes.append(usuario.get_saldo())
+            return True
+    
+    giros_antes = maquina_lote.giros
+    lote = maquina_lote.jogar_lote(10**9, 1.0, sistema_auth=SistemaContado())
+    assert lote["interrompido"] and lote["jogadas"] == 5 and apostador.get_saldo() == 0.0
+    assert len(apostador.get_historico_jogadas()) == lote["jogadas"] and gravacoes == [apostador.get_saldo()]
+    assert maquina_lote.giros - giros_antes < lote["jogadas"] + TAMANHO_BLOCO_LOTE
+    giros_antes = maquina_lote.giros
+    assert maquina_lote.jogar_lote(10, float("nan"))["jogadas"] == 0 and maquina_lote.giros == giros_antes
+    assert maquina_lote.jogar_lote(2.5, 1.0)["jogadas"] == 0 and maquina_lote.jogar_lote("3", 1.0)["jogadas"] == 0
+    print(f"✓ Lote interrompido após {lote['jogadas']} jogadas, com uma gravação; aposta NaN e quantidade não inteira recusadas")
+    
+    # Lote cujo prêmio não caberia no histórico: para antes dele e devolve só o que foi liquidado
+    milionario = Usuario("Milionario", "senha")
+    assert milionario.depositar(9e16)
+    maquina_cheia = Maquina()
+    for roleta in maquina_cheia.roletas:
+        roleta.definir_simbolos([DIAMANTE])
+    maquina_cheia.definir_usuario(milionario)
+    lote = maquina_cheia.jogar_lote(2000, 9e16)
+    assert lote["jogadas"] == 0 and lote["interrompido"] and len(lote["premios"]) == 0 and len(lote["paradas"]) == 0
+    assert milionario.get_saldo() == 9e16 and milionario.get_historico_jogadas() == []
+    print("✓ Lote com prêmio fora da faixa do histórico encerrado sem exceção")
+    
     print("\n✅ TESTE DE MÁQUINA CONCLUÍDO COM SUCESSO!")
 
 
+def testar_tabela_resultados():
+    print("\n" + "="*60)
+    print("TESTE 5: TABELA DE RESULTADOS (todas as combinações)")
+    print("="*60)
+    
+    maquina = Maquina()
+    roletas = maquina.roletas
+    fitas = [roleta.simbolos for roleta in roletas]
+    total = len(fitas[0]) * len(fitas[1]) * len(fitas[2])
+    
+    for aposta in [5.0, 10.0, 20.0, 50.0, 100.0, 0.01, 7.3]:
+        maquina._valor_aposta = aposta
+        for p1, p2, p3 in product(*(range(len(fita)) for fita in fitas)):
+            esperado = maquina._verificar_vitoria([fitas[0][p1], fitas[1][p2], fitas[2][p3]])
+            obtido = maquina._resolver_paradas(p1, p2, p3)
+            assert obtido == esperado, f"Divergência em {(p1, p2, p3)} com aposta {aposta}: {obtido} != {esperado}"
+    print(f"\n✓ {total} combinações conferidas com _verificar_vitoria para 7 valores de aposta")
+    
+    diamante = SimboloEspecial("Diamante", "💎", multiplicador=50.0)
+    roletas[2].definir_simbolos([diamante] * 3)
+    maquina._valor_aposta = 10.0
+    esperado = maquina._verificar_vitoria([diamante, diamante, diamante])
+    assert maquina._resolver_paradas(len(fitas[0]) - 1, len(fitas[1]) - 1, 0) == esperado
+    print("✓ Tabela recompilada após trocar os símbolos de uma roleta")
+    
+    print("\n✅ TESTE DE TABELA DE RESULTADOS CONCLUÍDO COM SUCESSO!")
+
+
 def testar_autenticacao():
     print("\n" + "="*60)
-    print("TESTE 5: SISTEMA DE AUTENTICAÇÃO")
+    print("TESTE 6: SISTEMA DE AUTENTICAÇÃO")
     print("="*60)
     
     sistema = SistemaAutenticacao("usuarios_teste.json")
@@ -138,31 +280,276 @@ def testar_autenticacao():
     if not usuario_falso:
         print("  - Login negado corretamente!")
     
+    print(f"\n✓ Teste de CPF e email únicos:")
+    assert sistema.cadastrar("usuario_cpf", "senha123", cpf="529.982.247-25", email="Ana@Email.com")
+    assert not sistema.cadastrar("outro_cpf", "senha123", cpf="52998224725")
+    assert not sistema.cadastrar("outro_email", "senha123", email=" ana@email.COM ")
+    assert sistema.titular_chave_pix("529.982.247-25") == ("usuario_cpf", "cpf")
+    assert sistema.buscar_usuarios("email", "ana@") == ["usuario_cpf"]
+    print("  - Duplicatas recusadas e chave PIX encontrada pelo índice")
+    
     if usuario:
         print(f"\n✓ Teste de atualização de saldo:")
         usuario.depositar(500.0)
         sistema.atualizar_saldo(usuario)
         print(f"  - Saldo atualizado no sistema")
     
+    print(f"\n✓ Teste de conflito entre sessões:")
+    primeiro, segundo = SistemaAutenticacao("conflito_teste.db"), SistemaAutenticacao("conflito_teste.db")
+    primeiro.cadastrar("conflito", "senha123")
+    sessao_a, sessao_b = primeiro.login("conflito", "senha123"), segundo.login("conflito", "senha123")
+    sessao_a.depositar(100.0)
+    assert primeiro.atualizar_saldo(sessao_a)
+    sessao_b.depositar(5.0)
+    assert not segundo.atualizar_saldo(sessao_b) and not segundo.atualizar_saldo(sessao_b)
+    assert segundo.login("conflito", "senha123").get_saldo() == 110.0
+    print("  - Sessão superada não sobrescreve o saldo gravado pela outra")
+    
+    # Saldo que volta ao mesmo valor (ABA): os totais de histórico denunciam a gravação da outra sessão
+    sessao_a, sessao_b = primeiro.login("conflito", "senha123"), segundo.login("conflito", "senha123")
+    sessao_a.depositar(40.0)
+    sessao_a.sacar(40.0)
+    assert primeiro.atualizar_saldo(sessao_a)
+    sessao_b.depositar(3.0)
+    assert not segundo.atualizar_saldo(sessao_b)
+    assert primeiro.repositorio.resumo("conflito")["transacoes"] == len(sessao_a.get_historico_transacoes())
+    resumo = sistema.repositorio.resumo("usuario_teste")
+    assert not sistema.repositorio.atualizar("usuario_teste", resumo["saldo"], "", resumo["transacoes"], [],
+                                             resumo["jogadas"], [], esperado=dict(resumo, transacoes=0))
+    print("  - Saldo que voltou ao mesmo valor também é detectado como conflito")
+    
+    # Duas sessões da mesma conta no mesmo sistema: cada uma tem a sua base do compare-and-swap
+    primeiro.cadastrar("mesmo_sistema", "senha123")
+    sessao_a, sessao_b = primeiro.login("mesmo_sistema", "senha123"), primeiro.login("mesmo_sistema", "senha123")
+    sessao_a.depositar(100.0)
+    assert primeiro.atualizar_saldo(sessao_a)
+    sessao_b.depositar(1.0)
+    assert not primeiro.atualizar_saldo(sessao_b) and primeiro.em_conflito(sessao_b)
+    assert primeiro.login("mesmo_sistema", "senha123").get_saldo() == 110.0 and primeiro.atualizar_saldo(sessao_a)
+    print("  - Segunda sessão no mesmo sistema também não sobrescreve a primeira")
+    
+    # Erro de disco: a gravação falha com um evento de erro e a próxima tentativa grava tudo
+    repositorio = sistema.repositorio
+    atualizar = repositorio.atualizar
+    def disco_cheio(*args, **kwargs):
+        raise OSError("disco cheio")
+    repositorio.atualizar = disco_cheio
+    usuario.depositar(7.0)
+    assert not sistema.atualizar_saldo(usuario) and eventos.recentes(1)[0].nome == "gravacao_falhou"
+    repositorio.atualizar = atualizar
+    assert sistema.atualizar_saldo(usuario) and repositorio.resumo("usuario_teste")["saldo"] == usuario.get_saldo()
+    print("  - Erro de disco avisado com um evento e regravado na tentativa seguinte")
+    primeiro.fechar()
+    segundo.fechar()
+    
     print("\n✅ TESTE DE AUTENTICAÇÃO CONCLUÍDO COM SUCESSO!")
     
-    import os
-    if os.path.exists("usuarios_teste.json"):
-        os.remove("usuarios_teste.json")
-        print("\n✓ Arquivo de teste removido")
+    sistema.fechar()
+    for arquivo in ["usuarios_teste.json", "usuarios_teste.json.diario", "usuarios_teste.json.trava",
+                    "conflito_teste.db"]:
+        if os.path.exists(arquivo):
+            os.remove(arquivo)
+            print(f"\n✓ Arquivo de teste removido: {arquivo}")
+
+
+def testar_diario():
+    print("\n" + "="*60)
+    print("TESTE 7: DIÁRIO (queda e falha de gravação)")
+    print("="*60)
+    
+    arquivo = "diario_teste.json"
+    sistema = SistemaAutenticacao(arquivo)
+    sistema.cadastrar("diario", "senha123")
+    usuario = sistema.login("diario", "senha123")
+    usuario.depositar(15.0)
+    assert sistema.atualizar_saldo(usuario)
+    sistema.fechar()
+    
+    # Queda no meio de uma gravação: a última linha do diário fica pela metade
+    with open(arquivo + ".diario", "ab") as diario:
+        diario.write(b'{"op":"atualizacao","nome":"diario","saldo":99')
+    sistema = SistemaAutenticacao(arquivo)
+    usuario = sistema.login("diario", "senha123")
+    assert usuario.get_saldo() == 25.0 and usuario.total_transacoes == 1
+    print("\n✓ Diário reaplicado após a queda, sem a linha incompleta")
+    
+    # Falha de disco: com o diário no lugar de um diretório, nenhuma gravação é aceita
+    os.replace(arquivo + ".diario", arquivo + ".diario.copia")
+    os.mkdir(arquivo + ".diario")
+    usuario.depositar(5.0)
+    gravador = GravadorAssincrono(sistema, intervalo=0.01)
+    gravador.marcar(usuario)
+    assert not gravador.descarregar() and not sistema.atualizar_saldo(usuario)
+    assert sistema.repositorio.resumo("diario")["saldo"] == 25.0
+    os.rmdir(arquivo + ".diario")
+    os.replace(arquivo + ".diario.copia", arquivo + ".diario")
+    assert sistema.atualizar_saldo(usuario) and sistema.repositorio.resumo("diario")["saldo"] == 30.0
+    print("✓ Falha de gravação informada e estado em memória preservado até regravar")
+    gravador.fechar()
+    
+    # Queda no meio da compactação: o diário já foi rotacionado para .antigo e o snapshot não foi escrito
+    repositorio = sistema.repositorio
+    diario = repositorio._diario
+    antigo = diario.arquivo_diario + ".antigo"
+    def queda(estado):
+        raise OSError("queda durante a compactação")
+    diario._escrever_snapshot = queda
+    usuario.depositar(1.0)
+    assert sistema.atualizar_saldo(usuario)
+    diario.compactar(repositorio._usuarios)
+    assert os.path.exists(antigo) and not os.path.exists(diario.arquivo_diario)
+    usuario.depositar(2.0)
+    assert sistema.atualizar_saldo(usuario)
+    # A segunda compactação encontra o .antigo que sobrou e junta o diário novo ao fim dele
+    diario.compactar(repositorio._usuarios)
+    assert os.path.exists(antigo) and not os.path.exists(diario.arquivo_diario)
+    usuario.depositar(4.0)
+    assert sistema.atualizar_saldo(usuario)
+    sistema.fechar()
+    
+    sistema = SistemaAutenticacao(arquivo)
+    reaberto = sistema.login("diario", "senha123")
+    assert reaberto.get_saldo() == 37.0 and reaberto.total_transacoes == usuario.total_transacoes == 5
+    assert not os.path.exists(antigo) and not os.path.exists(diario.arquivo_diario)
+    sistema.fechar()
+    sistema = SistemaAutenticacao(arquivo)
+    assert sistema.login("diario", "senha123").get_saldo() == 37.0
+    sistema.fechar()
+    print("✓ Reinício após queda no meio da rotação mantém todos os registros e conclui a compactação")
+    
+    # CPF e email normalizados são únicos nos dois repositórios, também ao atualizar o cadastro
+    for arquivo_indice in ("diario_teste_indice.json", "diario_teste_indice.db"):
+        repositorio = SistemaAutenticacao(arquivo_indice).repositorio
+        for nome, cpf, email in (("ana", "529.982.247-25", "Ana@Email.com"), ("bia", "", "bia@email.com")):
+            assert repositorio.inserir(nome, {"senha": "senha123", "saldo": 10.0, "cpf": cpf, "email": email,
+                                              "telefone": "", "chave_pix": "", "nome_completo": "",
+                                              "historico_transacoes": [], "historico_jogadas": []})
+        assert not repositorio.atualizar_cadastro("bia", {"email": "  ANA@email.com "})
+        assert not repositorio.atualizar_cadastro("bia", {"cpf": "52998224725"})
+        assert repositorio.buscar_por("email", "ana@email.com") == "ana"
+        assert repositorio.buscar_por("email", "bia@email.com") == "bia" and repositorio.buscar_por("cpf", "52998224725") == "ana"
+        assert repositorio.atualizar_cadastro("bia", {"email": "Bia.Nova@email.com"})
+        assert repositorio.buscar_por("email", "bia.nova@email.com") == "bia"
+        repositorio.fechar()
+    print("✓ Atualização para o CPF ou email normalizado de outro usuário recusada no JSON e no SQLite")
+    
+    for nome in os.listdir("."):
+        if nome.startswith("diario_teste"):
+            caminho = os.path.join(".", nome)
+            shutil.rmtree(caminho) if os.path.isdir(caminho) else os.remove(caminho)
+    
+    print("\n✅ TESTE DE DIÁRIO CONCLUÍDO COM SUCESSO!")
+
+
+def testar_servidor():
+    print("\n" + "="*60)
+    print("TESTE 8: SERVIDOR (protocolo JSON por linha)")
+    print("="*60)
+    
+    arquivo = "servidor_teste.json"
+    servidor = ServidorJogo(arquivo)
+    
+    async def conversar():
+        tcp = await asyncio.start_server(servidor.tratar_conexao, "127.0.0.1", 0)
+        leitor, escritor = await asyncio.open_connection(*tcp.sockets[0].getsockname()[:2])
+        
+        async def pedir(requisicao):
+            linha = requisicao if isinstance(requisicao, bytes) else json.dumps(requisicao).encode("utf-8")
+            escritor.write(linha + b"\n")
+            await escritor.drain()
+            return json.loads(await leitor.readline())
+        
+        respostas = {
+            "antes_login": await pedir({"op": "girar", "aposta": 1.0}),
+            "cadastro": await pedir({"op": "cadastrar", "nome": "jogador", "senha": "senha123"}),
+            "senha_errada": await pedir({"op": "login", "nome": "jogador", "senha": "errada"}),
+            "login": await pedir({"op": "login", "nome": "jogador", "senha": "senha123"}),
+            "giro": await pedir({"op": "girar", "aposta": 1.0}),
+            "aposta_bool": await pedir({"op": "girar", "aposta": True}),
+            "aposta_texto": await pedir({"op": "girar", "aposta": "1"}),
+            "aposta_nan": await pedir(b'{"op": "girar", "aposta": NaN}'),
+            "deposito_texto": await pedir({"op": "depositar", "valor": "10"}),
+            "deposito_enorme": await pedir({"op": "depositar", "valor": 10 ** 400}),
+            "json_quebrado": await pedir(b'{"op": "saldo"'),
+            "saldo": await pedir({"op": "saldo"}),
+            "sair": await pedir({"op": "sair"})
+        }
+        escritor.close()
+        await escritor.wait_closed()
+        tcp.close()
+        await tcp.wait_closed()
+        return respostas
+    
+    r = asyncio.run(conversar())
+    assert r["antes_login"] == {"ok": False, "erro": "Nenhum usuário logado."}
+    assert r["cadastro"]["ok"] and not r["senha_errada"]["ok"] and r["login"] == {"ok": True, "saldo": 10.0}
+    assert r["giro"]["ok"] and len(r["giro"]["simbolos"]) == 3
+    assert r["giro"]["saldo"] == 10.0 - 1.0 + r["giro"]["premio"] == r["saldo"]["saldo"]
+    for chave in ("aposta_bool", "aposta_texto", "deposito_texto"):
+        assert r[chave] == {"ok": False, "erro": "Parâmetros inválidos."}, chave
+    assert r["aposta_nan"] == {"ok": False, "erro": "Aposta inválida."}
+    assert r["deposito_enorme"] == {"ok": False, "erro": "Valor inválido."}
+    assert r["json_quebrado"] == {"ok": False, "erro": "Requisição inválida."} and r["sair"] == {"ok": True}
+    servidor.gravar_pendentes()
+    assert servidor._sistema_auth.repositorio.resumo("jogador")["saldo"] == r["saldo"]["saldo"]
+    print("\n✓ Cadastro, login, giro e saída pela conexão; true, textos, NaN e JSON quebrado recusados")
+    
+    async def sessao_direta():
+        sessao = Sessao()
+        pedir = lambda requisicao: servidor.processar(sessao, json.dumps(requisicao).encode("utf-8"))
+        await pedir({"op": "login", "nome": "jogador", "senha": "senha123"})
+        usuario = sessao.usuario
+        
+        # Giro que a liquidação recusa (prêmio fora da faixa do histórico): erro, sem símbolos
+        usuario.depositar(9e16)
+        for roleta in sessao.maquina.roletas:
+            roleta.definir_simbolos([DIAMANTE])
+        recusado = await pedir({"op": "girar", "aposta": 9e16})
+        
+        # Gravação da saída falhou: o usuário continua ativo e volta para a fila do gravador
+        atualizar = servidor._sistema_auth.atualizar_saldo
+        servidor._sistema_auth.atualizar_saldo = lambda usuario: False
+        await pedir({"op": "sair"})
+        await asyncio.sleep(0.5)
+        ativo_apos_falha = servidor._usuarios_ativos.get("jogador") is usuario
+        servidor._sistema_auth.atualizar_saldo = atualizar
+        
+        await pedir({"op": "login", "nome": "jogador", "senha": "senha123"})
+        mesmo_objeto = sessao.usuario is usuario
+        await pedir({"op": "sair"})
+        await asyncio.sleep(0.5)
+        return recusado, usuario, ativo_apos_falha, mesmo_objeto
+    
+    recusado, usuario, ativo_apos_falha, mesmo_objeto = asyncio.run(sessao_direta())
+    assert not recusado["ok"] and recusado["saldo"] == usuario.get_saldo() and "simbolos" not in recusado
+    assert ativo_apos_falha and mesmo_objeto and "jogador" not in servidor._usuarios_ativos
+    assert servidor._sistema_auth.repositorio.resumo("jogador")["saldo"] == usuario.get_saldo()
+    print("✓ Giro recusado pela liquidação vira erro; falha ao gravar na saída mantém o usuário ativo até regravar")
+    
+    servidor._gravador.fechar()
+    servidor._sistema_auth.fechar()
+    for nome in os.listdir("."):
+        if nome.startswith(arquivo):
+            os.remove(nome)
+    
+    print("\n✅ TESTE DE SERVIDOR CONCLUÍDO COM SUCESSO!")
 
 
 def executar_todos_testes():
     print("\n" + "🎰"*30)
     print("       INICIANDO TESTES DO JOGO DO LEÃOZINHO")
     print("🎰"*30)
+    mostrar_no_console()
     
     try:
         testar_simbolos()
         testar_usuario()
         testar_roleta()
         testar_maquina()
+        testar_tabela_resultados()
         testar_autenticacao()
+        testar_diario()
+        testar_servidor()
         
         print("\n" + "="*60)
         print("✅ TODOS OS TESTES FORAM CONCLUÍDOS COM SUCESSO!")
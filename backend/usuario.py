@@ -1,4 +1,8 @@
-from datetime import datetime
+import math
+import threading
+from .historico import HistoricoPaginado
+from .colunas import ColunasTransacoes, ColunasJogadas, agora_ms, cabe_em_centavos
+from .eventos import eventos, ConsoleEventos, INFO, AVISO
 
 
 class Usuario:
@@ -13,8 +17,9 @@ class Usuario:
         self._email = email
         self._telefone = telefone
         self._chave_pix = chave_pix
-        self._historico_transacoes = [] 
-        self._historico_jogadas = []
+        self._historico_transacoes = HistoricoPaginado(ColunasTransacoes)
+        self._historico_jogadas = HistoricoPaginado(ColunasJogadas)
+        self._trava = threading.RLock()
     
     @property
     def nome(self) -> str:
@@ -43,60 +48,149 @@ class Usuario:
     def atualizar_chave_pix(self, chave: str):
         self._chave_pix = chave
     
+    def atualizar_cadastro(self, cpf: str = None, email: str = None, telefone: str = None):
+        if cpf is not None:
+            self._cpf = cpf
+        if email is not None:
+            self._email = email
+        if telefone is not None:
+            self._telefone = telefone
+    
     def verificar_senha(self, senha: str) -> bool:
         return self._senha == senha
     
     def get_saldo(self) -> float:
         return self.__saldo
     
+    @property
+    def trava(self) -> threading.RLock:
+        return self._trava
+    
+    def movimentar(self, valor: float, tipo: str, saldo_esperado: float = None) -> bool:
+        # Lançamento atômico no saldo; com saldo_esperado funciona como compare-and-swap
+        with self._trava:
+            if saldo_esperado is not None and self.__saldo != saldo_esperado:
+                return False
+            novo_saldo = self.__saldo + valor
+            if novo_saldo < 0 or not (cabe_em_centavos(valor) and cabe_em_centavos(novo_saldo)):
+                return False
+            # A transação é codificada antes: se o registro for recusado, o saldo não muda
+            self._adicionar_transacao(tipo, valor, novo_saldo)
+            self.__saldo = novo_saldo
+            return True
+    
     def depositar(self, valor: float) -> bool:
-        if valor <= 0:
-            print("❌ Erro: O valor do depósito deve ser positivo.")
+        if not (valor > 0 and math.isfinite(valor)):
+            eventos.emitir(AVISO, "valor_invalido", mensagem="❌ Erro: O valor do depósito deve ser positivo.")
             return False
         
-        self.__saldo += valor
-        self._adicionar_transacao("Depósito", valor)
-        print(f"✅ Depósito de R$ {valor:.2f} realizado com sucesso!")
-        print(f"💰 Novo saldo: R$ {self.__saldo:.2f}")
+        if not self.movimentar(valor, "Depósito"):
+            eventos.emitir(AVISO, "valor_invalido", mensagem="❌ Erro: Valor de depósito inválido.")
+            return False
+        eventos.emitir(INFO, "deposito", usuario=self._nome, valor=valor, saldo=self.__saldo)
         return True
     
     def sacar(self, valor: float) -> bool:
-        if valor <= 0:
-            print("❌ Erro: O valor do saque deve ser positivo.")
+        if not (valor > 0 and math.isfinite(valor)):
+            eventos.emitir(AVISO, "valor_invalido", mensagem="❌ Erro: O valor do saque deve ser positivo.")
             return False
         
-        if self.__saldo < valor:
-            print(f"❌ Erro: Saldo insuficiente. Saldo atual: R$ {self.__saldo:.2f}")
+        if not self.movimentar(-valor, "Saque"):
+            eventos.emitir(AVISO, "saldo_insuficiente", usuario=self._nome, valor=valor, saldo=self.__saldo)
             return False
         
-        self.__saldo -= valor
-        self._adicionar_transacao("Saque", -valor)
+        eventos.emitir(INFO, "saque", usuario=self._nome, valor=valor, saldo=self.__saldo)
         return True
     
-    def _adicionar_transacao(self, tipo: str, valor: float):
+    def _adicionar_transacao(self, tipo: str, valor: float, saldo_apos: float):
         transacao = {
             "tipo": tipo,
             "valor": valor,
-            "data": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-            "saldo_apos": self.__saldo
+            "data": agora_ms(),
+            "saldo_apos": saldo_apos
         }
-        self._historico_transacoes.append(transacao)
+        self._historico_transacoes.adicionar(transacao)
     
     def registrar_jogada(self, aposta: float, premio: float, simbolos: list):
         jogada = {
             "aposta": aposta,
             "premio": premio,
             "lucro": premio - aposta,
-            "simbolos": [s.nome for s in simbolos],
-            "data": datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+            "simbolos": [s.id for s in simbolos],
+            "data": agora_ms()
         }
-        self._historico_jogadas.append(jogada)
+        self._historico_jogadas.adicionar(jogada)
+    
+    def registrar_lote(self, aposta: float, resultados) -> int:
+        """Liquida jogadas (prêmio, ids dos símbolos) em ordem até o saldo não cobrir a aposta; devolve quantas.
+        
+        Um resultado só é pedido ao iterável quando o saldo cobre a aposta dele; o lote também para,
+        sem liquidá-lo, num resultado cujo prêmio ou saldo não caberia no histórico.
+        """
+        data = agora_ms()
+        with self._trava:
+            return self._liquidar_lote(aposta, resultados, data)
+    
+    def _liquidar_lote(self, aposta: float, resultados, data: int) -> int:
+        saldo = self.__saldo
+        if saldo < aposta:
+            return 0
+        transacoes = []
+        jogadas = []
+        for premio, ids in resultados:
+            # Uma jogada cujo prêmio ou saldo não caberia no histórico encerra o lote sem ser liquidada
+            if not (cabe_em_centavos(premio) and cabe_em_centavos(saldo - aposta + premio)):
+                break
+            saldo -= aposta
+            transacoes.append({"tipo": "Apostado", "valor": -aposta, "data": data, "saldo_apos": saldo})
+            if premio > 0:
+                saldo += premio
+                transacoes.append({"tipo": "Ganho", "valor": premio, "data": data, "saldo_apos": saldo})
+            jogadas.append({
+                "aposta": aposta,
+                "premio": premio,
+                "lucro": premio - aposta,
+                "simbolos": ids,
+                "data": data
+            })
+            if saldo < aposta:
+                break
+        self._historico_transacoes.estender(transacoes)
+        self._historico_jogadas.estender(jogadas)
+        self.__saldo = saldo
+        return len(jogadas)
     
     def get_historico_transacoes(self) -> list:
-        return self._historico_transacoes.copy()
+        with self._trava:
+            return self._historico_transacoes.recentes()
     
     def get_historico_jogadas(self) -> list:
-        return self._historico_jogadas.copy()
+        with self._trava:
+            return self._historico_jogadas.recentes()
+    
+    def historico_transacoes(self, pagina: int = 0, tamanho: int = 20) -> list:
+        with self._trava:
+            return self._historico_transacoes.pagina(pagina, tamanho)
+    
+    def historico_jogadas(self, pagina: int = 0, tamanho: int = 20) -> list:
+        with self._trava:
+            return self._historico_jogadas.pagina(pagina, tamanho)
+    
+    def transacoes_recentes(self, deslocamento: int, quantidade: int) -> list:
+        with self._trava:
+            return self._historico_transacoes.mais_recentes(deslocamento, quantidade)
+    
+    def jogadas_recentes(self, deslocamento: int, quantidade: int) -> list:
+        with self._trava:
+            return self._historico_jogadas.mais_recentes(deslocamento, quantidade)
+    
+    @property
+    def total_transacoes(self) -> int:
+        return len(self._historico_transacoes)
+    
+    @property
+    def total_jogadas(self) -> int:
+        return len(self._historico_jogadas)
     
     def pode_apostar(self, valor_aposta: float) -> bool:
         return self.__saldo >= valor_aposta and valor_aposta > 0
@@ -106,3 +200,18 @@ class Usuario:
     
     def __repr__(self) -> str:
         return f"Usuario(nome='{self._nome}', saldo={self.__saldo})"
+
+
+@ConsoleEventos.formato("deposito")
+def _exibir_deposito(campos: dict) -> str:
+    return f"✅ Depósito de R$ {campos['valor']:.2f} realizado com sucesso!\n💰 Novo saldo: R$ {campos['saldo']:.2f}"
+
+
+@ConsoleEventos.formato("saque")
+def _exibir_saque(campos: dict) -> str:
+    return f"✅ Saque de R$ {campos['valor']:.2f} realizado com sucesso!\n💰 Novo saldo: R$ {campos['saldo']:.2f}"
+
+
+@ConsoleEventos.formato("saldo_insuficiente")
+def _exibir_saldo_insuficiente(campos: dict) -> str:
+    return f"❌ Saldo insuficiente! Saldo atual: R$ {campos['saldo']:.2f}"
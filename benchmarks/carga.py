@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import Maquina, SistemaAutenticacao, GravadorAssincrono
+from benchmarks.nucleo import metadados, resumir
+from benchmarks.repositorio import BACKENDS, tamanho_em_disco
+
+
+SENHA = "carga123"
+APOSTAS = (1.0, 2.0, 5.0, 10.0)
+
+
+def rss_bytes() -> int:
+    """Memória residente atual do processo (no Linux); nos outros sistemas, o pico."""
+    try:
+        with open("/proc/self/statm", 'r') as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+def nome_jogador(numero: int) -> str:
+    return f"jogador{numero:07d}"
+
+
+class Latencias:
+    """Tempos por operação, coletados por várias threads."""
+    
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._amostras = {}
+    
+    def medir(self, operacao: str, funcao, *args):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        duracao = time.perf_counter() - inicio
+        with self._trava:
+            self._amostras.setdefault(operacao, []).append(duracao)
+        return resultado
+    
+    def resumo(self) -> dict:
+        with self._trava:
+            return {operacao: resumir(amostras) for operacao, amostras in self._amostras.items()}
+
+
+class GeradorCarga:
+    """Popula o repositório com jogadores sintéticos e roda sessões de depósito, giros e saque."""
+    
+    def __init__(self, caminho: str, concorrencia: int = 8, historico_inicial: int = 50,
+                 jogadas_por_sessao: int = 20, chance_saque: float = 0.2, semente: int = 2024):
+        self._caminho = caminho
+        self._concorrencia = concorrencia
+        self._historico_inicial = historico_inicial
+        self._jogadas_por_sessao = jogadas_por_sessao
+        self._chance_saque = chance_saque
+        self._semente = semente
+        self._sistema = SistemaAutenticacao(caminho)
+        self._populacao = 0
+    
+    @property
+    def populacao(self) -> int:
+        return self._populacao
+    
+    def crescer(self, alvo: int) -> dict:
+        """Cadastra jogadores até a população chegar a `alvo`, em `concorrencia` threads."""
+        latencias = Latencias()
+        numeros = range(self._populacao, alvo)
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(self._concorrencia) as executor:
+            _aguardar([executor.submit(self._cadastrar_faixa, numeros[parte::self._concorrencia], latencias)
+                       for parte in range(self._concorrencia)])
+        duracao = time.perf_counter() - inicio
+        self._populacao = max(self._populacao, alvo)
+        return {
+            "cadastros": len(numeros),
+            "duracao_s": duracao,
+            "cadastros_por_segundo": len(numeros) / duracao if duracao else 0.0,
+            "latencias": latencias.resumo()
+        }
+    
+    def _cadastrar_faixa(self, numeros, latencias: Latencias):
+        maquina = Maquina(semente=self._semente)
+        for numero in numeros:
+            nome = nome_jogador(numero)
+            if self._sistema.repositorio.existe(nome):
+                continue  # --dados apontando para uma população gerada antes
+            cadastrado = latencias.medir("cadastro", self._sistema.cadastrar, nome, SENHA, f"Jogador {numero}",
+                                         f"{numero:011d}", f"{nome}@carga.teste", f"11{numero:09d}")
+            if not cadastrado or not self._historico_inicial:
+                continue
+            # Histórico antigo do jogador, liquidado e gravado de uma vez
+            usuario = self._sistema.login(nome, SENHA)
+            usuario.movimentar(self._historico_inicial * 10.0, "Depósito")
+            maquina.definir_usuario(usuario)
+            latencias.medir("historico_inicial", maquina.jogar_lote, self._historico_inicial, 1.0, self._sistema)
+    
+    def rodar_sessoes(self, sessoes: int) -> dict:
+        """Roda `sessoes` sessões em jogadores distintos por thread; as gravações são agrupadas como no servidor."""
+        latencias = Latencias()
+        gravador = GravadorAssincrono(self._sistema)
+        sorteio = random.Random(self._semente + self._populacao)
+        escolhidos = [sorteio.randrange(self._populacao) for _ in range(sessoes)]
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(self._concorrencia) as executor:
+            # Cada thread fica com jogadores próprios: duas sessões do mesmo jogador disputariam o saldo
+            _aguardar([executor.submit(self._sessoes_da_thread,
+                                       [numero for numero in escolhidos if numero % self._concorrencia == parte],
+                                       gravador, latencias, parte)
+                       for parte in range(self._concorrencia)])
+        gravador.descarregar()
+        duracao = time.perf_counter() - inicio
+        gravacao = gravador.estatisticas()
+        gravador.fechar()
+        resumo = latencias.resumo()
+        jogadas = resumo.get("jogar", {}).get("amostras", 0)
+        return {
+            "sessoes": sessoes,
+            "duracao_s": duracao,
+            "sessoes_por_segundo": sessoes / duracao if duracao else 0.0,
+            "jogadas_por_segundo": jogadas / duracao if duracao else 0.0,
+            "latencias": resumo,
+            "gravacao": gravacao
+        }
+    
+    def _sessoes_da_thread(self, jogadores: list, gravador: GravadorAssincrono, latencias: Latencias, parte: int):
+        sorteio = random.Random(self._semente * 31 + parte)
+        maquina = Maquina(semente=self._semente + parte)
+        for numero in jogadores:
+            usuario = latencias.medir("login", self._sistema.login, nome_jogador(numero), SENHA)
+            if usuario is None:
+                continue
+            maquina.definir_usuario(usuario)
+            aposta = sorteio.choice(APOSTAS)
+            latencias.medir("deposito", usuario.depositar, aposta * self._jogadas_por_sessao)
+            gravador.marcar(usuario)
+            for _ in range(self._jogadas_por_sessao):
+                if not usuario.pode_apostar(aposta):
+                    break
+                latencias.medir("jogar", maquina.jogar, aposta)
+                gravador.marcar(usuario)
+            if usuario.get_saldo() >= 50.0 and sorteio.random() < self._chance_saque:
+                latencias.medir("saque", usuario.sacar, round(usuario.get_saldo() / 2, 2))
+                gravador.marcar(usuario)
+            # O próximo login relê do repositório: a sessão termina com os dados gravados
+            gravador.descarregar()
+    
+    def medir_abertura(self) -> float:
+        self._sistema.fechar()
+        inicio = time.perf_counter()
+        self._sistema = SistemaAutenticacao(self._caminho)
+        return time.perf_counter() - inicio
+    
+    def fechar(self):
+        self._sistema.fechar()
+
+
+def _aguardar(futuros: list):
+    # result() repassa a exceção de uma thread em vez de deixá-la sumir no executor
+    for futuro in futuros:
+        futuro.result()
+
+
+def _lista_inteiros(texto: str) -> list:
+    return [int(item) for item in texto.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga com jogadores sintéticos")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="json")
+    parser.add_argument("--populacao", type=_lista_inteiros, default=[1000, 5000, 20000],
+                        help="tamanhos da população medidos em sequência (padrão: 1000,5000,20000)")
+    parser.add_argument("--sessoes", type=int, default=200, help="sessões rodadas em cada etapa")
+    parser.add_argument("--jogadas", type=int, default=20, help="giros por sessão")
+    parser.add_argument("--historico-inicial", type=int, default=50, help="jogadas gravadas no cadastro de cada jogador")
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--semente", type=int, default=2024)
+    parser.add_argument("--dados", default=None, help="arquivo do repositório (padrão: diretório temporário)")
+    parser.add_argument("--saida", default=None, metavar="ARQUIVO", help="grava as etapas em JSON")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = args.dados or os.path.join(pasta, "usuarios" + BACKENDS[args.backend])
+        gerador = GeradorCarga(caminho, args.concorrencia, args.historico_inicial, args.jogadas, semente=args.semente)
+        etapas = []
+        print(f"{'jogadores':>10} {'cad/s':>8} {'sessões/s':>10} {'giros/s':>9} {'login p50/p99 ms':>18} "
+              f"{'giro p99 ms':>12} {'abertura s':>11} {'disco MB':>9} {'RSS MB':>8}")
+        for alvo in sorted(args.populacao):
+            etapa = {"populacao": alvo, "cadastro": gerador.crescer(alvo)}
+            etapa["carga"] = gerador.rodar_sessoes(args.sessoes)
+            etapa["abertura_s"] = gerador.medir_abertura()
+            etapa["disco_bytes"] = tamanho_em_disco(os.path.dirname(os.path.abspath(caminho)))
+            etapa["rss_bytes"] = rss_bytes()
+            etapas.append(etapa)
+            
+            login = etapa["carga"]["latencias"].get("login", {})
+            giro = etapa["carga"]["latencias"].get("jogar", {})
+            print(f"{alvo:>10} {etapa['cadastro']['cadastros_por_segundo']:>8.0f} "
+                  f"{etapa['carga']['sessoes_por_segundo']:>10.1f} {etapa['carga']['jogadas_por_segundo']:>9.0f} "
+                  f"{login.get('por_chamada_us', 0) / 1000:>8.2f}/{login.get('p99_us', 0) / 1000:<9.2f} "
+                  f"{giro.get('p99_us', 0) / 1000:>12.3f} {etapa['abertura_s']:>11.3f} "
+                  f"{etapa['disco_bytes'] / 1e6:>9.1f} {(etapa['rss_bytes'] or 0) / 1e6:>8.1f}")
+        gerador.fechar()
+    
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump({"metadados": metadados(), "parametros": vars(args), "etapas": etapas},
+                      arquivo, ensure_ascii=False, indent=2)
+        print(f"✅ Etapas salvas em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import motor, repositorio, interface
+from benchmarks.nucleo import salvar, comparar
+
+
+GRUPOS = {"motor": motor, "repositorio": repositorio, "interface": interface}
+SAIDA_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados.json")
+
+
+def _lista(tipo):
+    return lambda texto: [tipo(item) for item in texto.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do motor, do repositório e da interface")
+    parser.add_argument("--grupos", type=_lista(str), default=list(GRUPOS), help="motor,repositorio,interface")
+    parser.add_argument("--backends", type=_lista(str), default=list(repositorio.BACKENDS), help="json,sqlite")
+    parser.add_argument("--tamanhos", type=_lista(int), default=list(repositorio.TAMANHOS),
+                        help="jogadas no histórico sintético (padrão: 10,10000,1000000)")
+    parser.add_argument("--historico-interface", type=int, default=interface.HISTORICO_INTERFACE)
+    parser.add_argument("--saida", default=SAIDA_PADRAO)
+    parser.add_argument("--comparar", default=None, metavar="ARQUIVO", help="resultados anteriores para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="piora aceita antes de acusar regressão")
+    args = parser.parse_args()
+    
+    resultados = {}
+    for nome in args.grupos:
+        print(f"⏱️ {nome}...")
+        resultados.update(GRUPOS[nome].executar(args))
+    
+    for nome, medida in resultados.items():
+        if "por_chamada_us" in medida:
+            print(f"  {nome:<48} {medida['por_chamada_us']:>14.2f} µs")
+        elif "bytes" in medida:
+            print(f"  {nome:<48} {medida['bytes'] / 1e6:>14.2f} MB")
+    salvar(args.saida, resultados)
+    print(f"✅ Resultados salvos em {args.saida}")
+    
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as arquivo:
+            anterior = json.load(arquivo)["resultados"]
+        linhas = comparar(anterior, resultados, args.tolerancia)
+        regressoes = [linha for linha in linhas if linha[3] > 1 + args.tolerancia]
+        for nome, antes, depois, razao in linhas:
+            marca = "❌" if razao > 1 + args.tolerancia else ("✅" if razao < 1 - args.tolerancia else "  ")
+            print(f"{marca} {nome:<48} {antes:>12.2f} → {depois:>12.2f} µs  ({razao:.2f}x)")
+        if regressoes:
+            print(f"❌ {len(regressoes)} caso(s) mais lento(s) que {args.comparar} além da tolerância.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+import time
+from itertools import cycle
+from .nucleo import medir, resumir
+from .repositorio import montar_repositorio
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORICO_INTERFACE = 10_000
+
+
+def tela_disponivel() -> bool:
+    try:
+        import tkinter
+        raiz = tkinter.Tk()
+        raiz.destroy()
+        return True
+    except Exception:
+        return False
+
+
+def executar(opcoes) -> dict:
+    from frontend.recursos import carregar_atlas
+    resultados = {}
+    assets = os.path.join(RAIZ, "assets")
+    
+    # O atlas não depende da janela: sem cache monta a partir dos PNGs, com cache só lê o arquivo
+    frios = []
+    for _ in range(3):
+        with tempfile.TemporaryDirectory() as cache:
+            inicio = time.perf_counter()
+            carregar_atlas(assets, diretorio_cache=cache)
+            frios.append(time.perf_counter() - inicio)
+    resultados["interface.atlas.sem_cache"] = resumir(frios)
+    with tempfile.TemporaryDirectory() as cache:
+        carregar_atlas(assets, diretorio_cache=cache)
+        resultados["interface.atlas.com_cache"] = medir(lambda: carregar_atlas(assets, diretorio_cache=cache))
+    
+    if not tela_disponivel():
+        print("⚠️ Sem display: telas da interface não medidas (rode com xvfb-run).")
+        resultados["interface.telas"] = {"pulado": "sem display"}
+        return resultados
+    
+    anterior = os.getcwd()
+    with tempfile.TemporaryDirectory() as pasta:
+        # A aplicação usa caminhos relativos (assets/ e dados/): roda numa cópia isolada
+        try:
+            os.symlink(assets, os.path.join(pasta, "assets"))
+        except OSError:
+            shutil.copytree(assets, os.path.join(pasta, "assets"))
+        os.makedirs(os.path.join(pasta, "dados"))
+        os.chdir(pasta)
+        try:
+            resultados.update(_medir_telas(opcoes))
+        finally:
+            os.chdir(anterior)
+    return resultados
+
+
+def _medir_telas(opcoes) -> dict:
+    from frontend.main_gui import AplicacaoJogo
+    resultados = {}
+    montar_repositorio(os.path.join("dados", "usuarios.json"), opcoes.historico_interface)
+    
+    inicio = time.perf_counter()
+    app = AplicacaoJogo()
+    app.update()
+    resultados["interface.primeira_pintura"] = {"por_chamada_us": (time.perf_counter() - inicio) * 1e6, "amostras": 1}
+    while not (app._recursos.pronto() and app._sistema.pronto()):
+        app.update()
+    app.update()
+    resultados["interface.inicializacao"] = {"por_chamada_us": (time.perf_counter() - inicio) * 1e6, "amostras": 1}
+    resultados["interface.carregar_imagens"] = medir(app._carregar_imagens, numero=3)
+    
+    app.usuario = app.sistema_auth.login("bench", "1234")
+    app.maquina.definir_usuario(app.usuario)
+    
+    inicio = time.perf_counter()
+    app._criar_tela_historico()
+    app.update_idletasks()
+    resultados["interface.historico.construcao"] = {"por_chamada_us": (time.perf_counter() - inicio) * 1e6, "amostras": 1}
+    
+    abas = cycle(["jogadas", "transacoes"])
+    
+    def trocar_aba():
+        app._trocar_tab_historico(next(abas))
+        app.update_idletasks()
+    resultados[f"interface.historico.troca_aba.{opcoes.historico_interface}"] = medir(trocar_aba, numero=4)
+    
+    def reabrir():
+        app._criar_tela_jogo()
+        app._criar_tela_historico()
+        app.update_idletasks()
+    resultados["interface.historico.reabrir"] = medir(reabrir, numero=4)
+    
+    app._fechar_janela()
+    return resultados
@@ -0,0 +1,32 @@
+import random
+from itertools import cycle
+from backend import Maquina, Roleta, Usuario
+from .nucleo import medir
+
+
+SEMENTE = 2024
+
+
+def executar(opcoes) -> dict:
+    resultados = {}
+    for modo in Roleta.MODOS:
+        roleta = Roleta(modo=modo)
+        resultados[f"motor.roleta_girar.{modo}"] = medir(roleta.girar)
+    resultados["motor.roleta_girar_indices.10k"] = medir(lambda: Roleta().girar_indices(10_000))
+    
+    maquina = Maquina(semente=SEMENTE)
+    usuario = Usuario("bench", "1234", saldo_inicial=1e12)
+    maquina.definir_usuario(usuario)
+    maquina.jogar(1.0)
+    
+    # Trincas sorteadas de antemão: o caso mede só a avaliação
+    sorteio = random.Random(SEMENTE)
+    fitas = [roleta.simbolos for roleta in maquina.roletas]
+    trincas = cycle([[sorteio.choice(fita) for fita in fitas] for _ in range(4096)])
+    paradas = cycle([tuple(sorteio.randrange(len(fita)) for fita in fitas) for _ in range(4096)])
+    resultados["motor.verificar_vitoria"] = medir(lambda: maquina._verificar_vitoria(next(trincas)))
+    resultados["motor.resolver_paradas"] = medir(lambda: maquina._resolver_paradas(*next(paradas)))
+    
+    resultados["motor.jogar"] = medir(lambda: maquina.jogar(1.0))
+    resultados["motor.jogar_lote.1k"] = medir(lambda: maquina.jogar_lote(1000, 1.0))
+    return resultados
@@ -0,0 +1,92 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+
+# Cada repetição roda a função o suficiente para durar pelo menos isso, como o timeit.autorange
+DURACAO_MINIMA = 0.05
+REPETICOES = 5
+
+
+def percentil(ordenadas: list, fracao: float) -> float:
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * fracao))]
+
+
+def resumir(amostras: list) -> dict:
+    """Estatísticas de uma lista de tempos por chamada, em segundos."""
+    ordenadas = sorted(amostras)
+    if not ordenadas:
+        return {"amostras": 0}
+    return {
+        "por_chamada_us": statistics.median(ordenadas) * 1e6,
+        "minimo_us": ordenadas[0] * 1e6,
+        "p95_us": percentil(ordenadas, 0.95) * 1e6,
+        "p99_us": percentil(ordenadas, 0.99) * 1e6,
+        "maximo_us": ordenadas[-1] * 1e6,
+        "desvio_us": (statistics.stdev(ordenadas) if len(ordenadas) > 1 else 0.0) * 1e6,
+        "amostras": len(ordenadas)
+    }
+
+
+def medir(funcao, repeticoes: int = REPETICOES, numero: int = None) -> dict:
+    """Mediana de `repeticoes` rodadas de `numero` chamadas; sem `numero`, calibra pela DURACAO_MINIMA."""
+    funcao()
+    if numero is None:
+        numero = 1
+        while True:
+            inicio = time.perf_counter()
+            for _ in range(numero):
+                funcao()
+            if time.perf_counter() - inicio >= DURACAO_MINIMA:
+                break
+            numero *= 2
+    
+    amostras = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(numero):
+            funcao()
+        amostras.append((time.perf_counter() - inicio) / numero)
+    resultado = resumir(amostras)
+    resultado["chamadas_por_rodada"] = numero
+    return resultado
+
+
+def metadados() -> dict:
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=raiz,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementacao": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "argv": sys.argv[1:]
+    }
+
+
+def salvar(caminho: str, resultados: dict):
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump({"metadados": metadados(), "resultados": resultados}, arquivo, ensure_ascii=False, indent=2)
+
+
+def comparar(anterior: dict, atual: dict, tolerancia: float = 0.10) -> list:
+    """(nome, antes_us, depois_us, razão) de cada caso medido nas duas rodadas, regressões primeiro."""
+    linhas = []
+    for nome, depois in atual.items():
+        antes = anterior.get(nome)
+        if not antes or "por_chamada_us" not in antes or "por_chamada_us" not in depois:
+            continue
+        razao = depois["por_chamada_us"] / max(antes["por_chamada_us"], 1e-9)
+        linhas.append((nome, antes["por_chamada_us"], depois["por_chamada_us"], razao))
+    return sorted(linhas, key=lambda linha: (linha[3] <= 1 + tolerancia, linha[0]))
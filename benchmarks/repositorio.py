@@ -0,0 +1,76 @@
+import os
+import tempfile
+import time
+from backend import Maquina, SistemaAutenticacao
+from .nucleo import medir, resumir
+
+
+BACKENDS = {"json": ".json", "sqlite": ".db"}
+TAMANHOS = (10, 10_000, 1_000_000)
+# Jogadas liquidadas e gravadas por vez ao montar o histórico sintético
+LOTE_MONTAGEM = 10_000
+ATUALIZACOES = 200
+SEMENTE = 2024
+
+
+def montar_repositorio(caminho: str, jogadas: int) -> float:
+    """Cria o usuário "bench" com `jogadas` jogadas gravadas; devolve quanto tempo levou."""
+    inicio = time.perf_counter()
+    sistema = SistemaAutenticacao(caminho)
+    sistema.cadastrar("bench", "1234", "Usuário de Benchmark", "529.982.247-25", "bench@exemplo.com", "11987654321")
+    usuario = sistema.login("bench", "1234")
+    usuario.depositar(1e12)
+    sistema.atualizar_saldo(usuario)
+    maquina = Maquina(semente=SEMENTE)
+    maquina.definir_usuario(usuario)
+    restantes = jogadas
+    while restantes > 0:
+        lote = min(LOTE_MONTAGEM, restantes)
+        maquina.jogar_lote(lote, 1.0, sistema)
+        restantes -= lote
+    sistema.fechar()
+    return time.perf_counter() - inicio
+
+
+def tamanho_em_disco(pasta: str) -> int:
+    return sum(os.path.getsize(os.path.join(raiz, nome)) for raiz, _, nomes in os.walk(pasta) for nome in nomes)
+
+
+def executar(opcoes) -> dict:
+    resultados = {}
+    for backend in opcoes.backends:
+        for tamanho in opcoes.tamanhos:
+            with tempfile.TemporaryDirectory() as pasta:
+                caminho = os.path.join(pasta, "usuarios" + BACKENDS[backend])
+                prefixo = f"repositorio.{backend}.{tamanho}"
+                montagem = montar_repositorio(caminho, tamanho)
+                resultados[prefixo + ".montagem"] = {"por_chamada_us": montagem * 1e6, "amostras": 1}
+                resultados[prefixo + ".disco"] = {"bytes": tamanho_em_disco(pasta)}
+                
+                aberturas = []
+                for _ in range(3):
+                    inicio = time.perf_counter()
+                    sistema = SistemaAutenticacao(caminho)
+                    aberturas.append(time.perf_counter() - inicio)
+                    sistema.fechar()
+                resultados[prefixo + ".abertura"] = resumir(aberturas)
+                
+                sistema = SistemaAutenticacao(caminho)
+                resultados[prefixo + ".login"] = medir(lambda: sistema.login("bench", "1234"), numero=5)
+                usuario = sistema.login("bench", "1234")
+                resultados[prefixo + ".pagina_antiga"] = medir(
+                    lambda: usuario.jogadas_recentes(max(usuario.total_jogadas - 50, 0), 50), numero=5
+                )
+                
+                # Cada gravação leva uma jogada nova; o giro fica fora da medida
+                maquina = Maquina(semente=SEMENTE)
+                maquina.definir_usuario(usuario)
+                amostras = []
+                for _ in range(ATUALIZACOES):
+                    maquina.jogar(1.0)
+                    inicio = time.perf_counter()
+                    sistema.atualizar_saldo(usuario)
+                    amostras.append(time.perf_counter() - inicio)
+                resultados[prefixo + ".atualizar_saldo"] = resumir(amostras)
+                sistema.fechar()
+    return resultados
@@ -0,0 +1,114 @@
+import time
+from backend.metricas import metricas
+
+
+class LinhaTempo:
+    """Animação de um widget: troca de quadro pelo tempo decorrido e para no instante definido."""
+    
+    def __init__(self, quadros: list, duracao: float, aplicar, final=None, ao_terminar=None,
+                 quadros_por_segundo: float = 20.0, fase: int = 0):
+        self._quadros = quadros
+        self._duracao = duracao
+        self._aplicar = aplicar
+        self._final = final
+        self._ao_terminar = ao_terminar
+        self._quadros_por_segundo = quadros_por_segundo
+        self._fase = fase
+        self._inicio = None
+        self._atual = None
+    
+    def iniciar(self, agora: float):
+        self._inicio = agora
+    
+    def avancar(self, agora: float) -> bool:
+        decorrido = agora - self._inicio
+        if decorrido >= self._duracao:
+            if self._final is not None:
+                self._aplicar(self._final)
+            if self._ao_terminar:
+                self._ao_terminar()
+            return True
+        
+        # O quadro sai do tempo decorrido, não de um contador: um atraso pula quadros em vez de esticar a animação
+        indice = (int(decorrido * self._quadros_por_segundo) + self._fase) % len(self._quadros)
+        if indice != self._atual:
+            self._atual = indice
+            self._aplicar(self._quadros[indice])
+        return False
+
+
+class RelogioAnimacao:
+    """Relógio único da interface, baseado em time.monotonic, que avança todas as linhas de tempo ativas."""
+    
+    def __init__(self, widget, intervalo: float = 1 / 60):
+        self._widget = widget
+        self._intervalo = intervalo
+        self._linhas = []
+        self._agendado = None
+        self._proximo = 0.0
+        self._anterior = None
+        self._quadros = 0
+        self._quadros_pulados = 0
+        self._intervalos = 0
+        self._soma_intervalos = 0.0
+        self._maior_intervalo = 0.0
+        self._soma_custos = 0.0
+        self._maior_custo = 0.0
+    
+    def adicionar(self, linha: LinhaTempo):
+        agora = time.monotonic()
+        linha.iniciar(agora)
+        self._linhas.append(linha)
+        if self._agendado is None:
+            self._proximo = agora
+            self._anterior = None
+            self._agendado = self._widget.after(0, self._tick)
+    
+    def parar(self):
+        if self._agendado is not None:
+            self._widget.after_cancel(self._agendado)
+            self._agendado = None
+        self._linhas = []
+    
+    def estatisticas(self) -> dict:
+        return {
+            "quadros": self._quadros,
+            "quadros_pulados": self._quadros_pulados,
+            "intervalo_medio_ms": self._soma_intervalos / max(self._intervalos, 1) * 1000,
+            "intervalo_maximo_ms": self._maior_intervalo * 1000,
+            "custo_medio_ms": self._soma_custos / max(self._quadros, 1) * 1000,
+            "custo_maximo_ms": self._maior_custo * 1000
+        }
+    
+    def _tick(self):
+        agora = time.monotonic()
+        if self._anterior is not None:
+            intervalo = agora - self._anterior
+            self._intervalos += 1
+            self._soma_intervalos += intervalo
+            self._maior_intervalo = max(self._maior_intervalo, intervalo)
+        self._anterior = agora
+        
+        for linha in list(self._linhas):
+            if linha.avancar(agora):
+                self._linhas.remove(linha)
+        
+        fim = time.monotonic()
+        custo = fim - agora
+        self._quadros += 1
+        self._soma_custos += custo
+        self._maior_custo = max(self._maior_custo, custo)
+        metricas.observar("quadro", custo)
+        
+        if not self._linhas:
+            self._agendado = None
+            return
+        
+        # Agenda pelo horário absoluto do próximo quadro, então o erro de um after() não se acumula
+        self._proximo += self._intervalo
+        if self._proximo <= fim:
+            pulados = int((fim - self._proximo) / self._intervalo) + 1
+            self._quadros_pulados += pulados
+            metricas.contar("quadros_pulados", pulados)
+            self._proximo += pulados * self._intervalo
+        self._agendado = self._widget.after(max(1, round((self._proximo - fim) * 1000)), self._tick)
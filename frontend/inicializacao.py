@@ -0,0 +1,59 @@
+import time
+
+
+# Do início de main.py até a tela de aviso aparecer, nos gabinetes
+META_PRIMEIRA_PINTURA_MS = 300.0
+
+
+class PerfilInicializacao:
+    """Tempos da abertura do jogo: fases em sequência e tarefas que terminam em segundo plano."""
+    
+    def __init__(self, inicio: float = None):
+        self._inicio = inicio if inicio is not None else time.perf_counter()
+        self._fases = []
+        self._fundo = []
+    
+    def marcar(self, fase: str):
+        """Encerra `fase`, que começou na marca anterior."""
+        self._fases.append((fase, time.perf_counter()))
+    
+    def registrar_fundo(self, tarefa: str, concluida_em: float):
+        self._fundo.append((tarefa, concluida_em))
+    
+    def ms_ate(self, fase: str) -> float:
+        for nome, momento in self._fases:
+            if nome == fase:
+                return (momento - self._inicio) * 1000
+        return None
+    
+    def para_dict(self) -> dict:
+        fases = []
+        anterior = self._inicio
+        for nome, momento in self._fases:
+            fases.append({"fase": nome, "duracao_ms": (momento - anterior) * 1000,
+                          "acumulado_ms": (momento - self._inicio) * 1000})
+            anterior = momento
+        return {
+            "fases": fases,
+            "segundo_plano": {nome: (momento - self._inicio) * 1000 for nome, momento in self._fundo}
+        }
+    
+    def relatorio(self, fase_pintura: str = "primeira pintura", meta_ms: float = META_PRIMEIRA_PINTURA_MS) -> tuple:
+        """(texto, dentro_da_meta) com as fases e o tempo até `fase_pintura` comparado com `meta_ms`."""
+        dados = self.para_dict()
+        linhas = ["⏱️  Inicialização (ms desde o início de main.py)",
+                  f"   {'fase':<28} {'duração':>9} {'acumulado':>10}"]
+        for fase in dados["fases"]:
+            linhas.append(f"   {fase['fase']:<28} {fase['duracao_ms']:>9.1f} {fase['acumulado_ms']:>10.1f}")
+        for nome, ms in dados["segundo_plano"].items():
+            linhas.append(f"   {nome + ' (segundo plano)':<28} {'':>9} {ms:>10.1f}")
+        
+        pintura = self.ms_ate(fase_pintura)
+        dentro = pintura is not None and pintura <= meta_ms
+        if pintura is None:
+            linhas.append(f"⚠️ A fase '{fase_pintura}' não foi alcançada.")
+        elif dentro:
+            linhas.append(f"✅ Primeira pintura em {pintura:.0f} ms (meta: {meta_ms:.0f} ms)")
+        else:
+            linhas.append(f"❌ Primeira pintura em {pintura:.0f} ms, acima da meta de {meta_ms:.0f} ms")
+        return "\n".join(linhas), dentro
@@ -0,0 +1,138 @@
+import sys
+import customtkinter as ctk
+
+
+class ListaVirtual(ctk.CTkFrame):
+    """Tabela rolável com um número fixo de linhas reaproveitadas; os dados são pedidos só para o trecho visível.
+    
+    colunas: [(titulo, largura, fonte)]
+    obter_total(): quantidade de linhas
+    obter_linhas(inicio, quantidade): lista de linhas, cada uma [(texto, cor ou None)] por coluna
+    """
+    
+    TAMANHO_BLOCO = 100
+    BLOCOS_EM_CACHE = 8
+    
+    def __init__(self, master, colunas: list, obter_total, obter_linhas, texto_vazio: str = "",
+                 altura_linha: int = 44, **kwargs):
+        super().__init__(master, **kwargs)
+        self._colunas = colunas
+        self._obter_total = obter_total
+        self._obter_linhas = obter_linhas
+        self._altura_linha = altura_linha
+        self._primeira = 0
+        self._total = 0
+        self._mostradas = 0
+        self._blocos = {}
+        self._desenho_agendado = False
+        
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        
+        cabecalho = ctk.CTkFrame(self, fg_color="#0f3460")
+        cabecalho.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(10, 10), padx=10)
+        for titulo, largura, fonte in colunas:
+            ctk.CTkLabel(cabecalho, text=titulo, font=(fonte[0], 14), width=largura).pack(side="left", padx=5, pady=10)
+        
+        self._corpo = ctk.CTkFrame(self, fg_color="transparent")
+        self._corpo.grid(row=1, column=0, sticky="nsew", padx=(10, 0))
+        self._corpo.pack_propagate(False)
+        self._barra = ctk.CTkScrollbar(self, command=self._rolar)
+        self._barra.grid(row=1, column=1, sticky="ns", padx=(0, 5))
+        
+        self._label_vazio = ctk.CTkLabel(self._corpo, text=texto_vazio, font=("Arial", 16))
+        self._linhas = []
+        self._corpo.bind("<Configure>", self._ajustar_linhas)
+        self._ligar_roda(self._corpo)
+    
+    def atualizar(self, voltar_ao_topo: bool = False):
+        # Os dados mudaram: descarta o cache e redesenha o trecho visível
+        self._blocos.clear()
+        if voltar_ao_topo:
+            self._primeira = 0
+        self._desenhar()
+    
+    def _ajustar_linhas(self, event=None):
+        visiveis = max(1, self._corpo.winfo_height() // self._altura_linha)
+        while len(self._linhas) < visiveis:
+            self._linhas.append(self._criar_linha())
+        self._agendar_desenho()
+    
+    def _criar_linha(self) -> tuple:
+        quadro = ctk.CTkFrame(self._corpo, fg_color="#16213e", height=self._altura_linha - 6)
+        labels = []
+        for _, largura, fonte in self._colunas:
+            label = ctk.CTkLabel(quadro, text="", font=fonte, width=largura)
+            label.pack(side="left", padx=5, pady=5)
+            labels.append(label)
+        self._ligar_roda(quadro)
+        for label in labels:
+            self._ligar_roda(label)
+        return quadro, labels
+    
+    def _ligar_roda(self, widget):
+        if sys.platform.startswith("linux"):
+            widget.bind("<Button-4>", lambda e: self._rolar("scroll", -1, "units"))
+            widget.bind("<Button-5>", lambda e: self._rolar("scroll", 1, "units"))
+        else:
+            widget.bind("<MouseWheel>", self._roda)
+    
+    def _roda(self, event):
+        passo = -int(event.delta / 120) if sys.platform.startswith("win") else -event.delta
+        self._rolar("scroll", passo or (-1 if event.delta > 0 else 1), "units")
+    
+    def _rolar(self, acao: str, valor, unidade: str = "units"):
+        visiveis = self._visiveis()
+        if acao == "moveto":
+            self._primeira = int(float(valor) * self._total)
+        elif unidade == "pages":
+            self._primeira += int(valor) * visiveis
+        else:
+            self._primeira += int(valor)
+        self._agendar_desenho()
+    
+    def _agendar_desenho(self):
+        # Vários eventos de rolagem no mesmo ciclo geram um único redesenho
+        if not self._desenho_agendado:
+            self._desenho_agendado = True
+            self.after_idle(self._desenhar)
+    
+    def _visiveis(self) -> int:
+        return max(1, min(len(self._linhas), self._corpo.winfo_height() // self._altura_linha))
+    
+    def _desenhar(self):
+        self._desenho_agendado = False
+        self._total = self._obter_total()
+        visiveis = self._visiveis()
+        self._primeira = max(0, min(self._primeira, self._total - visiveis))
+        
+        mostrar = min(visiveis, self._total - self._primeira)
+        if mostrar != self._mostradas:
+            # Só reempacota quando muda a quantidade de linhas, para manter a ordem na tela
+            for quadro, _ in self._linhas:
+                quadro.pack_forget()
+            for quadro, _ in self._linhas[:mostrar]:
+                quadro.pack(fill="x", pady=3)
+            self._mostradas = mostrar
+        
+        if self._total == 0:
+            self._label_vazio.pack(pady=50)
+            self._barra.set(0.0, 1.0)
+            return
+        self._label_vazio.pack_forget()
+        
+        for posicao, (_, labels) in enumerate(self._linhas[:mostrar]):
+            for label, (texto, cor) in zip(labels, self._linha(self._primeira + posicao)):
+                label.configure(text=texto, text_color=cor or "#ffffff")
+        
+        self._barra.set(self._primeira / self._total, min(1.0, (self._primeira + visiveis) / self._total))
+    
+    def _linha(self, indice: int) -> list:
+        bloco = indice // self.TAMANHO_BLOCO
+        if bloco not in self._blocos:
+            if len(self._blocos) >= self.BLOCOS_EM_CACHE:
+                self._blocos.pop(next(iter(self._blocos)))
+            self._blocos[bloco] = self._obter_linhas(bloco * self.TAMANHO_BLOCO, self.TAMANHO_BLOCO)
+        linhas = self._blocos[bloco]
+        deslocamento = indice - bloco * self.TAMANHO_BLOCO
+        return linhas[deslocamento] if deslocamento < len(linhas) else [("", None)] * len(self._colunas)
@@ -1,37 +1,100 @@
 import customtkinter as ctk
-from PIL import Image
 import sys
 import os
+import math
 from pathlib import Path
 from datetime import datetime
 import re
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backend import Usuario, Maquina, SistemaAutenticacao
+from backend.catalogo import CATALOGO, LEAO, nome_simbolo
+from backend.colunas import formatar_data
+from backend.indice_usuarios import ROTULOS_CAMPOS
+from backend.eventos import eventos, DEBUG, AVISO, ERRO
+from backend.metricas import metricas
+from frontend.recursos import CarregadorRecursos, TarefaFundo, TAMANHO_SIMBOLO, chave_imagem
+from frontend.lista_virtual import ListaVirtual
+from frontend.animacao import RelogioAnimacao, LinhaTempo
+
+# A primeira roleta para em DURACAO_GIRO segundos e cada uma das seguintes ESCALONAMENTO_PARADA depois
+DURACAO_GIRO = 1.4
+ESCALONAMENTO_PARADA = 0.3
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 
+def _montar_sistema(caminho: str) -> tuple:
+    # Importados aqui: o motor e os repositórios não entram no caminho até a primeira tela
+    from backend.autenticacao import SistemaAutenticacao
+    from backend.gravador import GravadorAssincrono
+    from backend.maquina import Maquina
+    sistema = SistemaAutenticacao(caminho)
+    return sistema, GravadorAssincrono(sistema), Maquina()
+
+
 class AplicacaoJogo(ctk.CTk):
     
-    def __init__(self):
+    def __init__(self, perfil=None):
         super().__init__()
+        if perfil:
+            perfil.marcar("janela")
         
         self.title("🦁 Jogo do Leãozinho")
         self.geometry("800x600")
         self.resizable(True, True)
         
         self.usuario = None
-        self.sistema_auth = SistemaAutenticacao("dados/usuarios.json")
-        self.maquina = Maquina()
+        self._maquina = None
         self.animacao_ativa = False
+        self.relogio = RelogioAnimacao(self)
         self.imagens = {}
+        self.imagens_simbolos = {}
+        self.gif_frames = []
         self.tela_atual = "aviso"  
-        self._carregar_imagens()
+        self._telas = {}
+        self._tela_visivel = None
+        self._fechamento_recusado = False
+        
+        self.protocol("WM_DELETE_WINDOW", self._fechar_janela)
         
+        # O aviso é montado antes de tudo; usuários e imagens carregam em segundo plano enquanto ele é lido
         self._criar_tela_aviso()
+        if perfil:
+            perfil.marcar("tela de aviso")
+        self._sistema = TarefaFundo(_montar_sistema, "dados/usuarios.json")
+        self._recursos = CarregadorRecursos()
+        self._aguardar_sistema()
+        self._carregar_imagens()
+    
+    @property
+    def sistema_auth(self):
+        return self._sistema.resultado()[0]
+    
+    @property
+    def gravador(self):
+        return self._sistema.resultado()[1]
+    
+    @property
+    def maquina(self):
+        if self._maquina is None:
+            self._maquina = self._sistema.resultado()[2]
+        return self._maquina
+    
+    @maquina.setter
+    def maquina(self, maquina):
+        self._maquina = maquina
+    
+    def _aguardar_sistema(self):
+        if not self._sistema.pronto():
+            self.after(30, self._aguardar_sistema)
+            return
+        try:
+            self._sistema.resultado()
+        except Exception as e:
+            eventos.emitir(ERRO, "sistema_indisponivel", mensagem=f"❌ Erro ao abrir os dados dos usuários: {e}")
+            self.destroy()
     
     def _validar_cpf(self, cpf: str) -> bool:
         cpf = re.sub(r'\D', '', cpf)
@@ -63,48 +126,60 @@ class AplicacaoJogo(ctk.CTk):
         return len(telefone) >= 10 and len(telefone) <= 11
     
     def _carregar_imagens(self):
-        simbolos = [
-            "cereja", "limao", "laranja", "uva", "melancia",
-            "sino", "estrela", "leao", "diamante", "loading"
-        ]
-        
-        for simbolo in simbolos:
-            caminho = f"assets/simbolos/{simbolo}.png"
-            if os.path.exists(caminho):
-                img = Image.open(caminho)
-                self.imagens[simbolo] = ctk.CTkImage(
-                    light_image=img,
-                    dark_image=img,
-                    size=(100, 100)
-                )
+        # As imagens são decodificadas em segundo plano; aqui só se espera elas ficarem prontas
+        if not self._recursos.pronto():
+            self.after(30, self._carregar_imagens)
+            return
         
-        self.gif_frames = []
-        caminho_gif = "assets/roleta_girando.gif"
-        if os.path.exists(caminho_gif):
-            try:
-                gif = Image.open(caminho_gif)
-                for i in range(gif.n_frames):
-                    gif.seek(i)
-                    frame = gif.copy()
-                    self.gif_frames.append(ctk.CTkImage(
-                        light_image=frame,
-                        dark_image=frame,
-                        size=(100, 100)
-                    ))
-                gif.close()
-            except Exception as e:
-                print(f"⚠️ Erro ao carregar GIF: {e}")
-                self.gif_frames = []
+        imagens, quadros = self._recursos.resultado()
+        escala = self._get_widget_scaling()
+        modo = ctk.get_appearance_mode().lower()
+        for nome, img in imagens.items():
+            self.imagens[nome] = self._criar_imagem(img, escala, modo)
+        # Mapa pelo id do símbolo, montado uma vez: o giro não precisa tratar nomes
+        for simbolo in CATALOGO:
+            if chave_imagem(simbolo.nome) in self.imagens:
+                self.imagens_simbolos[simbolo.id] = self.imagens[chave_imagem(simbolo.nome)]
+        self.gif_frames = [self._criar_imagem(frame, escala, modo) for frame in quadros]
+        
+        if self.tela_atual == "jogo" and not self.animacao_ativa:
+            for roleta in self.roletas:
+                roleta.configure(image=self.imagens.get("loading"))
+    
+    def _criar_imagem(self, img, escala, modo):
+        imagem = ctk.CTkImage(light_image=img, dark_image=img, size=TAMANHO_SIMBOLO)
+        # Gera a PhotoImage agora para a animação nunca redimensionar no meio do giro
+        imagem.create_scaled_photo_image(escala, modo)
+        return imagem
     
-    def _limpar_tela(self):
-        for widget in self.winfo_children():
-            widget.destroy()
+    def _mostrar_tela(self, nome, construir, atualizar=None):
+        # Cada tela é construída uma vez e depois só escondida; ao voltar, só os dados são atualizados
+        tela = self._telas.get(nome)
+        if tela is None:
+            tela = self._telas[nome] = construir()
+        if atualizar:
+            atualizar()
+        if self._tela_visivel is not tela:
+            if self._tela_visivel is not None:
+                self._tela_visivel.pack_forget()
+            tela.pack(fill="both", expand=True)
+            self._tela_visivel = tela
+        self.tela_atual = nome
+    
+    def _preparar_tela(self, nome, construir):
+        if nome not in self._telas:
+            self._telas[nome] = construir()
+    
+    def _limpar_campo(self, entry):
+        # Apagar um campo que mostra o placeholder faria o CTkEntry perder o show="•" da senha
+        if entry.get():
+            entry.delete(0, "end")
     
     def _criar_tela_aviso(self):
-        self._limpar_tela()
-        
+        self._mostrar_tela("aviso", self._construir_tela_aviso)
+    
+    def _construir_tela_aviso(self):
         frame = ctk.CTkFrame(self, fg_color="#0f3460")
-        frame.pack(fill="both", expand=True)
         
         ctk.CTkLabel(
             frame,
@@ -152,13 +227,20 @@ class AplicacaoJogo(ctk.CTk):
             text_color="#000",
             command=self._criar_tela_login
         ).pack(pady=20)
+        return frame
     
     def _criar_tela_login(self):
-        self._limpar_tela()
-        self.tela_atual = "login"
-        
+        self._mostrar_tela("login", self._construir_tela_login, self._atualizar_tela_login)
+        # Enquanto o jogador digita, a tela do jogo já fica pronta
+        self.after(100, lambda: self._preparar_tela("jogo", self._construir_tela_jogo))
+    
+    def _atualizar_tela_login(self):
+        self._limpar_campo(self.entry_usuario)
+        self._limpar_campo(self.entry_senha)
+        self.label_msg_login.configure(text="")
+    
+    def _construir_tela_login(self):
         frame = ctk.CTkFrame(self, fg_color="#0f3460")
-        frame.pack(fill="both", expand=True)
         frame.grid_columnconfigure(0, weight=1)
         
         ctk.CTkLabel(
@@ -226,6 +308,7 @@ class AplicacaoJogo(ctk.CTk):
         self.label_msg_login.grid(row=4, column=0, pady=10)
         
         self.entry_senha.bind("<Return>", lambda e: self._fazer_login())
+        return frame
     
     def _fazer_login(self):
         nome = self.entry_usuario.get().strip()
@@ -237,7 +320,6 @@ class AplicacaoJogo(ctk.CTk):
         
         usuario = self.sistema_auth.login(nome, senha)
         if usuario:
-            print(f"✅ Login realizado com sucesso! Bem-vindo, {nome}!")
             self.usuario = usuario
             self.maquina.definir_usuario(usuario)
             self._criar_tela_jogo()
@@ -245,11 +327,16 @@ class AplicacaoJogo(ctk.CTk):
             self._mostrar_msg_temporaria(self.label_msg_login, "❌ Usuário ou senha incorretos!")
 
     def _criar_tela_cadastro(self):
-        self._limpar_tela()
-        self.tela_atual = "cadastro"
-        
+        self._mostrar_tela("cadastro", self._construir_tela_cadastro, self._atualizar_tela_cadastro)
+    
+    def _atualizar_tela_cadastro(self):
+        for entry in (self.entry_nome_completo, self.entry_cpf, self.entry_email,
+                      self.entry_telefone, self.entry_usuario_cad, self.entry_senha_cad):
+            self._limpar_campo(entry)
+        self.label_msg_cadastro.configure(text="")
+    
+    def _construir_tela_cadastro(self):
         frame = ctk.CTkScrollableFrame(self, fg_color="#0f3460")
-        frame.pack(fill="both", expand=True)
         
         ctk.CTkLabel(
             frame,
@@ -308,6 +395,7 @@ class AplicacaoJogo(ctk.CTk):
         
         self.label_msg_cadastro = ctk.CTkLabel(frame, text="", font=("Arial Bold", 14), text_color="#ff4444")
         self.label_msg_cadastro.pack(pady=10)
+        return frame
     
     def _processar_cadastro(self):
         nome_completo = self.entry_nome_completo.get().strip()
@@ -343,33 +431,36 @@ class AplicacaoJogo(ctk.CTk):
             self._mostrar_msg_temporaria(self.label_msg_cadastro, "❌ Email inválido!")
             return
         
-        print(f"\n📝 === CADASTRANDO USUÁRIO ===")
-        print(f"Nome: {nome_completo}")
-        print(f"CPF: {cpf}")
-        print(f"Email: {email}")
-        print(f"Telefone: {telefone}")
-        print(f"Usuário: {usuario}")
+        eventos.emitir(DEBUG, "cadastro_solicitado", usuario=usuario, nome_completo=nome_completo,
+                       cpf=cpf, email=email, telefone=telefone)
         
         if self.sistema_auth.cadastrar(usuario, senha, nome_completo, cpf, email, telefone):
-            print("✅ Cadastro realizado com sucesso!")
             usr = self.sistema_auth.login(usuario, senha)
             if usr:
                 self.usuario = usr
                 self.maquina.definir_usuario(usr)
                 self._criar_tela_jogo()
         else:
-            print("❌ Erro: Usuário já existe.")
-            self._mostrar_msg_temporaria(self.label_msg_cadastro, "❌ Usuário já existe!")
+            self._mostrar_msg_temporaria(self.label_msg_cadastro, "❌ Usuário, CPF, email ou telefone já cadastrado!")
 
     def _criar_tela_jogo(self):
-        self._limpar_tela()
-        self.tela_atual = "jogo"
+        self._mostrar_tela("jogo", self._construir_tela_jogo, self._atualizar_tela_jogo)
+    
+    def _atualizar_tela_jogo(self):
         self.valor_aposta = 10.0
+        self.label_valor_aposta.configure(text=f"R$ {self.valor_aposta:.2f}")
+        self.label_usuario.configure(text=f"👤 {self.usuario.nome}")
+        self.label_saldo.configure(text=f"💰 Saldo: R$ {self.usuario.get_saldo():.2f}")
+        if not self.animacao_ativa:
+            for roleta in self.roletas:
+                roleta.configure(image=self.imagens.get("loading"))
+    
+    def _construir_tela_jogo(self):
+        tela = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        tela.grid_columnconfigure(0, weight=1)
+        tela.grid_rowconfigure(2, weight=1)
         
-        self.grid_columnconfigure(0, weight=1)
-        self.grid_rowconfigure(2, weight=1)
-        
-        header = ctk.CTkFrame(self, fg_color="#0f3460", corner_radius=0)
+        header = ctk.CTkFrame(tela, fg_color="#0f3460", corner_radius=0)
         header.grid(row=0, column=0, sticky="ew")
         header.grid_columnconfigure((0, 1, 2), weight=1)
         
@@ -380,12 +471,12 @@ class AplicacaoJogo(ctk.CTk):
             text_color="#d4af37"
         ).grid(row=0, column=0, columnspan=3, pady=20)
         
-        self.label_usuario = ctk.CTkLabel(header, text=f"👤 {self.usuario.nome}", font=("Arial", 16))
+        self.label_usuario = ctk.CTkLabel(header, text="", font=("Arial", 16))
         self.label_usuario.grid(row=1, column=0, pady=10, padx=20, sticky="w")
         
         self.label_saldo = ctk.CTkLabel(
             header,
-            text=f"💰 Saldo: R$ {self.usuario.get_saldo():.2f}",
+            text="",
             font=("Arial Bold", 24),
             text_color="#44ff44"
         )
@@ -412,7 +503,7 @@ class AplicacaoJogo(ctk.CTk):
             command=self._criar_tela_saque
         ).pack(side="left", padx=5)
         
-        frame_roletas = ctk.CTkFrame(self, fg_color="#1a1a2e")
+        frame_roletas = ctk.CTkFrame(tela, fg_color="#1a1a2e")
         frame_roletas.grid(row=1, column=0, sticky="nsew", padx=20, pady=20)
         frame_roletas.grid_columnconfigure((0, 1, 2), weight=1)
         
@@ -430,7 +521,7 @@ class AplicacaoJogo(ctk.CTk):
             label.place(relx=0.5, rely=0.5, anchor="center")
             self.roletas.append(label)
         
-        controle = ctk.CTkFrame(self, fg_color="#16213e", corner_radius=15)
+        controle = ctk.CTkFrame(tela, fg_color="#16213e", corner_radius=15)
         controle.grid(row=2, column=0, sticky="ew", padx=20, pady=(0, 20))
         controle.grid_columnconfigure((0, 1, 2, 3, 4), weight=1)
         
@@ -476,7 +567,7 @@ class AplicacaoJogo(ctk.CTk):
         )
         self.btn_girar.grid(row=0, column=4, pady=20, padx=20)
         
-        footer = ctk.CTkFrame(self, fg_color="#0f3460", corner_radius=0, height=50)
+        footer = ctk.CTkFrame(tela, fg_color="#0f3460", corner_radius=0, height=50)
         footer.grid(row=3, column=0, sticky="ew")
         footer.grid_columnconfigure((0, 1, 2), weight=1)
         
@@ -507,6 +598,7 @@ class AplicacaoJogo(ctk.CTk):
             hover_color="#cc0000",
             command=self._sair
         ).grid(row=0, column=2, pady=10, padx=20, sticky="e")
+        return tela
     
     def _aumentar_aposta(self):
         opcoes = [5.0, 10.0, 20.0, 50.0, 100.0]
@@ -530,9 +622,6 @@ class AplicacaoJogo(ctk.CTk):
             self._mostrar_dialog("❌ Saldo Insuficiente", "Você não tem saldo suficiente para esta aposta!")
             return
         
-        print(f"\n🎰 === NOVA JOGADA ===")
-        print(f"💰 Aposta: R$ {self.valor_aposta:.2f}")
-        
         self.animacao_ativa = True
         self.btn_girar.configure(state="disabled")
         
@@ -543,41 +632,45 @@ class AplicacaoJogo(ctk.CTk):
     def _animar_com_gif(self, resultado):
         simbolos = resultado['simbolos']
         
-        if hasattr(self, 'gif_frames') and self.gif_frames:
-            for roleta in self.roletas:
-                roleta.configure(image=self.gif_frames[0])
-            
-            self._animar_gif_frames(0, 40, lambda: self._mostrar_resultado_final(simbolos, resultado))
-        else:
+        if not self.gif_frames:
             self._mostrar_resultado_final(simbolos, resultado)
+            return
+        
+        restantes = [len(self.roletas)]
+        
+        def roleta_parou():
+            restantes[0] -= 1
+            if restantes[0] == 0:
+                self.after(300, lambda: self._finalizar_jogada(resultado))
+        
+        # Cada roleta tem sua própria linha de tempo e para um pouco depois da anterior
+        for i, roleta in enumerate(self.roletas):
+            self.relogio.adicionar(LinhaTempo(
+                self.gif_frames,
+                DURACAO_GIRO + i * ESCALONAMENTO_PARADA,
+                aplicar=lambda imagem, roleta=roleta: roleta.configure(image=imagem),
+                final=self._imagem_simbolo(simbolos[i]),
+                ao_terminar=roleta_parou,
+                fase=i * 3
+            ))
     
-    def _animar_gif_frames(self, frame_idx, max_frames, callback):
-        if frame_idx < max_frames and hasattr(self, 'gif_frames'):
-            frame = self.gif_frames[frame_idx % len(self.gif_frames)]
-            for roleta in self.roletas:
-                roleta.configure(image=frame)
-            self.after(50, lambda: self._animar_gif_frames(frame_idx + 1, max_frames, callback))
-        else:
-            callback()
+    def _imagem_simbolo(self, simbolo):
+        imagem = self.imagens_simbolos.get(simbolo.id)
+        if imagem is None:
+            eventos.emitir(AVISO, "imagem_ausente", simbolo=simbolo.nome,
+                           mensagem=f"⚠️ Imagem não encontrada para: {simbolo.nome}")
+        return imagem
     
+    @metricas.cronometrado("renderizacao_final")
     def _mostrar_resultado_final(self, simbolos, resultado):
-        import unicodedata
-        
         for i, roleta in enumerate(self.roletas):
-            simbolo_nome = simbolos[i].nome.lower()
-            
-            nome_arquivo = ''.join(
-                c for c in unicodedata.normalize('NFD', simbolo_nome)
-                if unicodedata.category(c) != 'Mn'
-            )
-            
-            if nome_arquivo in self.imagens:
-                roleta.configure(image=self.imagens[nome_arquivo])
-            else:
-                print(f"⚠️ Imagem não encontrada para: {simbolo_nome} -> {nome_arquivo}")
+            imagem = self._imagem_simbolo(simbolos[i])
+            if imagem is not None:
+                roleta.configure(image=imagem)
         
         self.after(300, lambda: self._finalizar_jogada(resultado))
     
+    @metricas.cronometrado("renderizacao_resultado")
     def _finalizar_jogada(self, resultado):
         self._mostrar_resultado(resultado)
         self.animacao_ativa = False
@@ -587,7 +680,7 @@ class AplicacaoJogo(ctk.CTk):
         self.label_saldo.configure(text=f"💰 Saldo: R$ {self.usuario.get_saldo():.2f}")
         
         if resultado['ganhou']:
-            tem_leao = any(s.nome == "Leão" for s in resultado['simbolos'])
+            tem_leao = any(s.id == LEAO.id for s in resultado['simbolos'])
             if tem_leao:
                 msg = f"🦁 LEÃO DA SORTE!\n\nGANHOU R$ {resultado['premio']:.2f}! 🦁"
             else:
@@ -596,14 +689,21 @@ class AplicacaoJogo(ctk.CTk):
         else:
             self._mostrar_dialog("😢 Não foi desta vez", "Tente novamente! A sorte está chegando! 🦁")
         
-        self.sistema_auth.atualizar_saldo(self.usuario)
+        self.gravador.marcar(self.usuario)
     
     def _criar_tela_saque(self):
-        self._limpar_tela()
-        self.tela_atual = "saque"
-        
+        self._mostrar_tela("saque", self._construir_tela_saque, self._atualizar_tela_saque)
+    
+    def _atualizar_tela_saque(self):
+        self.label_saldo_saque.configure(text=f"Saldo disponível: R$ {self.usuario.get_saldo():.2f}")
+        self._limpar_campo(self.entry_valor_saque)
+        self._limpar_campo(self.entry_chave_pix)
+        if hasattr(self.usuario, 'chave_pix') and self.usuario.chave_pix:
+            self.entry_chave_pix.insert(0, self.usuario.chave_pix)
+        self.label_msg_saque.configure(text="")
+    
+    def _construir_tela_saque(self):
         frame = ctk.CTkFrame(self, fg_color="#0f3460")
-        frame.pack(fill="both", expand=True)
         
         ctk.CTkLabel(
             frame,
@@ -612,12 +712,13 @@ class AplicacaoJogo(ctk.CTk):
             text_color="#d4af37"
         ).pack(pady=40)
         
-        ctk.CTkLabel(
+        self.label_saldo_saque = ctk.CTkLabel(
             frame,
-            text=f"Saldo disponível: R$ {self.usuario.get_saldo():.2f}",
+            text="",
             font=("Arial", 18),
             text_color="#44ff44"
-        ).pack(pady=5)
+        )
+        self.label_saldo_saque.pack(pady=5)
         
         ctk.CTkLabel(
             frame,
@@ -636,10 +737,6 @@ class AplicacaoJogo(ctk.CTk):
         ctk.CTkLabel(form, text="🔑 Chave PIX:", font=("Arial", 16)).pack(pady=(10, 5), padx=40, anchor="w")
         ctk.CTkLabel(form, text="Use seu CPF, email ou telefone cadastrado", font=("Arial", 11), text_color="#aaaaaa").pack(pady=(0, 5), padx=40, anchor="w")
         self.entry_chave_pix = ctk.CTkEntry(form, placeholder_text="Digite sua chave PIX", width=400, height=45, font=("Arial", 14))
-        
-        if hasattr(self.usuario, 'chave_pix') and self.usuario.chave_pix:
-            self.entry_chave_pix.insert(0, self.usuario.chave_pix)
-        
         self.entry_chave_pix.pack(pady=(0, 30), padx=40)
         
         btn_frame = ctk.CTkFrame(form, fg_color="transparent")
@@ -667,47 +764,31 @@ class AplicacaoJogo(ctk.CTk):
         
         self.label_msg_saque = ctk.CTkLabel(frame, text="", font=("Arial Bold", 14), text_color="#ff4444")
         self.label_msg_saque.pack(pady=10)
+        return frame
     
     def _processar_saque(self):
         valor_str = self.entry_valor_saque.get().strip()
         chave_pix = self.entry_chave_pix.get().strip()
         
-        print(f"\n💸 === PROCESSANDO SAQUE ===")
-        print(f"Valor digitado: '{valor_str}'")
-        print(f"Chave PIX digitada: '{chave_pix}'")
+        eventos.emitir(DEBUG, "saque_solicitado", usuario=self.usuario.nome, valor=valor_str, chave_pix=chave_pix)
         
         if self.usuario.get_saldo() < 50.0:
-            print(f"❌ Erro: Saldo mínimo não atingido. Saldo atual: R$ {self.usuario.get_saldo():.2f}")
+            eventos.emitir(AVISO, "saque_recusado", motivo="saldo_minimo",
+                           mensagem=f"❌ Erro: Saldo mínimo não atingido. Saldo atual: R$ {self.usuario.get_saldo():.2f}")
             self._mostrar_dialog("❌ Saldo Insuficiente", f"Você precisa ter no mínimo R$ 50,00 para realizar um saque.\n\nSeu saldo atual: R$ {self.usuario.get_saldo():.2f}")
             return
         
         if not chave_pix:
-            print("❌ Erro: Chave PIX não informada")
+            eventos.emitir(AVISO, "saque_recusado", motivo="sem_chave", mensagem="❌ Erro: Chave PIX não informada")
             self._mostrar_dialog("❌ Chave PIX Necessária", "Por favor, informe sua chave PIX para realizar o saque.")
             return
         
-        cpf_usuario = self.usuario.cpf.replace(".", "").replace("-", "").strip()
-        email_usuario = self.usuario.email.strip().lower()
-        telefone_usuario = self.usuario.telefone.replace("(", "").replace(")", "").replace("-", "").replace(" ", "").strip()
-        chave_pix_limpa = chave_pix.replace(".", "").replace("-", "").replace("(", "").replace(")", "").replace(" ", "").strip().lower()
-        
-        chave_valida = False
-        tipo_chave = ""
-        if cpf_usuario and chave_pix_limpa == cpf_usuario:
-            chave_valida = True
-            tipo_chave = "CPF"
-            print(f"✓ Chave PIX válida: CPF corresponde")
-        elif email_usuario and chave_pix_limpa == email_usuario:
-            chave_valida = True
-            tipo_chave = "Email"
-            print(f"✓ Chave PIX válida: Email corresponde")
-        elif telefone_usuario and chave_pix_limpa == telefone_usuario:
-            chave_valida = True
-            tipo_chave = "Telefone"
-            print(f"✓ Chave PIX válida: Telefone corresponde")
-        
-        if not chave_valida:
-            print("❌ Erro: Chave PIX não corresponde aos dados cadastrados")
+        # Consulta os índices do cadastro, já normalizados na gravação
+        campo_chave = self.sistema_auth.campo_chave_pix(self.usuario.nome, chave_pix)
+        tipo_chave = ROTULOS_CAMPOS.get(campo_chave, "")
+        if not campo_chave:
+            eventos.emitir(AVISO, "saque_recusado", motivo="chave_invalida",
+                           mensagem="❌ Erro: Chave PIX não corresponde aos dados cadastrados")
             self._mostrar_dialog(
                 "❌ Chave PIX Inválida", 
                 f"A chave PIX deve ser um dos seus dados cadastrados:\n\n"
@@ -720,38 +801,38 @@ class AplicacaoJogo(ctk.CTk):
         
         try:
             valor = float(valor_str)
-            print(f"Valor convertido: R$ {valor:.2f}")
             
-            if valor <= 0:
-                print("❌ Erro: Valor deve ser positivo")
+            if not (valor > 0 and math.isfinite(valor)):
+                eventos.emitir(AVISO, "saque_recusado", motivo="valor_invalido", mensagem="❌ Erro: Valor deve ser positivo")
                 self._mostrar_dialog("❌ Valor Inválido", "O valor do saque deve ser maior que zero.")
                 return
             
             if valor > self.usuario.get_saldo():
-                print(f"❌ Erro: Saldo insuficiente. Saldo: R$ {self.usuario.get_saldo():.2f}")
+                eventos.emitir(AVISO, "saldo_insuficiente", usuario=self.usuario.nome, valor=valor,
+                               saldo=self.usuario.get_saldo())
                 self._mostrar_dialog("❌ Saldo Insuficiente", f"Você não tem saldo suficiente.\n\nSaldo disponível: R$ {self.usuario.get_saldo():.2f}\nValor solicitado: R$ {valor:.2f}")
                 return
             
             if self.usuario.sacar(valor):
                 self.usuario.atualizar_chave_pix(chave_pix)
-                self.sistema_auth.atualizar_saldo(self.usuario)
-                print(f"✅ Saque realizado com sucesso!")
-                print(f"Chave PIX ({tipo_chave}): {chave_pix}")
+                self.gravador.marcar(self.usuario)
                 self._mostrar_dialog("✅ Saque Realizado", f"Saque de R$ {valor:.2f} realizado com sucesso!\n\nO valor será enviado para sua chave PIX ({tipo_chave}).")
                 self._criar_tela_jogo()
+            else:
+                self._mostrar_dialog("❌ Valor Inválido", "Não foi possível realizar o saque deste valor.")
         except ValueError:
-            print("❌ Erro: Valor não é um número válido")
+            eventos.emitir(AVISO, "saque_recusado", motivo="valor_invalido",
+                           mensagem="❌ Erro: Valor não é um número válido")
             self._mostrar_dialog("❌ Valor Inválido", "Por favor, digite um valor numérico válido.")
         except Exception as e:
-            print(f"❌ Erro inesperado: {e}")
+            eventos.emitir(ERRO, "saque_falhou", mensagem=f"❌ Erro inesperado: {e}")
             self._mostrar_dialog("❌ Erro", f"Ocorreu um erro ao processar o saque.\n\nTente novamente.")
     
     def _criar_tela_historico(self):
-        self._limpar_tela()
-        self.tela_atual = "historico"
-        
+        self._mostrar_tela("historico", self._construir_tela_historico, lambda: self._trocar_tab_historico("transacoes"))
+    
+    def _construir_tela_historico(self):
         frame = ctk.CTkFrame(self, fg_color="#0f3460")
-        frame.pack(fill="both", expand=True)
         
         ctk.CTkLabel(
             frame,
@@ -786,7 +867,7 @@ class AplicacaoJogo(ctk.CTk):
         )
         self.btn_tab_jogadas.pack(side="left", padx=10)
         
-        self.frame_historico_conteudo = ctk.CTkScrollableFrame(
+        self.frame_historico_conteudo = ctk.CTkFrame(
             frame,
             fg_color="#1a1a2e",
             corner_radius=20,
@@ -797,6 +878,38 @@ class AplicacaoJogo(ctk.CTk):
         )
         self.frame_historico_conteudo.pack(pady=15, padx=20, fill="both", expand=True)
         
+        self.lista_transacoes = ListaVirtual(
+            self.frame_historico_conteudo,
+            colunas=[
+                ("Data/Hora", 200, ("Arial", 12)),
+                ("Tipo", 150, ("Arial Bold", 12)),
+                ("Valor", 150, ("Arial", 12)),
+                ("Saldo Após", 150, ("Arial", 12))
+            ],
+            obter_total=lambda: self.usuario.total_transacoes,
+            obter_linhas=lambda inicio, quantidade: [
+                self._linha_transacao(t) for t in self.usuario.transacoes_recentes(inicio, quantidade)
+            ],
+            texto_vazio="Nenhuma transação registrada ainda.",
+            fg_color="transparent"
+        )
+        self.lista_jogadas = ListaVirtual(
+            self.frame_historico_conteudo,
+            colunas=[
+                ("Data/Hora", 180, ("Arial", 11)),
+                ("Aposta", 100, ("Arial", 11)),
+                ("Símbolos", 250, ("Arial", 11)),
+                ("Prêmio", 100, ("Arial", 11)),
+                ("Lucro", 100, ("Arial Bold", 11))
+            ],
+            obter_total=lambda: self.usuario.total_jogadas,
+            obter_linhas=lambda inicio, quantidade: [
+                self._linha_jogada(j) for j in self.usuario.jogadas_recentes(inicio, quantidade)
+            ],
+            texto_vazio="Nenhuma jogada registrada ainda.",
+            fg_color="transparent"
+        )
+        
         ctk.CTkButton(
             frame,
             text="← Voltar ao Jogo",
@@ -805,9 +918,7 @@ class AplicacaoJogo(ctk.CTk):
             font=("Arial Bold", 14),
             command=self._criar_tela_jogo
         ).pack(pady=15)
-        
-        self.tab_historico_atual = "transacoes"
-        self._atualizar_historico()
+        return frame
     
     def _trocar_tab_historico(self, tab):
         self.tab_historico_atual = tab
@@ -822,100 +933,44 @@ class AplicacaoJogo(ctk.CTk):
         self._atualizar_historico()
     
     def _atualizar_historico(self):
-        for widget in self.frame_historico_conteudo.winfo_children():
-            widget.destroy()
-        
+        # As duas listas são criadas uma vez; trocar de aba só troca qual aparece e relê os dados
         if self.tab_historico_atual == "transacoes":
-            self._mostrar_historico_transacoes()
+            visivel, oculta = self.lista_transacoes, self.lista_jogadas
         else:
-            self._mostrar_historico_jogadas()
+            visivel, oculta = self.lista_jogadas, self.lista_transacoes
+        oculta.pack_forget()
+        visivel.pack(fill="both", expand=True, padx=5, pady=5)
+        visivel.atualizar(voltar_ao_topo=True)
     
-    def _mostrar_historico_transacoes(self):
-        try:
-            transacoes = self.usuario.get_historico_transacoes()
-        except:
-            transacoes = []
-        
-        if not transacoes:
-            ctk.CTkLabel(
-                self.frame_historico_conteudo,
-                text="Nenhuma transação registrada ainda.",
-                font=("Arial", 16)
-            ).pack(pady=50)
-            return
-        
-        header = ctk.CTkFrame(self.frame_historico_conteudo, fg_color="#0f3460")
-        header.pack(fill="x", pady=(10, 20), padx=10)
-        
-        ctk.CTkLabel(header, text="Data/Hora", font=("Arial Bold", 14), width=200).pack(side="left", padx=10, pady=10)
-        ctk.CTkLabel(header, text="Tipo", font=("Arial Bold", 14), width=150).pack(side="left", padx=10, pady=10)
-        ctk.CTkLabel(header, text="Valor", font=("Arial Bold", 14), width=150).pack(side="left", padx=10, pady=10)
-        ctk.CTkLabel(header, text="Saldo Após", font=("Arial Bold", 14), width=150).pack(side="left", padx=10, pady=10)
-        
-        for trans in reversed(transacoes[-20:]): 
-            item = ctk.CTkFrame(self.frame_historico_conteudo, fg_color="#16213e")
-            item.pack(fill="x", pady=5, padx=10)
-            
-            data_hora = trans.get('data', 'N/A')
-            tipo = trans.get('tipo', 'N/A')
-            valor = trans.get('valor', 0)
-            saldo_apos = trans.get('saldo_apos', 0)
-            
-            if tipo.upper() == "DEPÓSITO":
-                cor_tipo = "#44ff44"
-            elif tipo.upper() == "GANHO":
-                cor_tipo = "#ffdd44"
-            elif tipo.upper() == "APOSTADO":
-                cor_tipo = "#ff8844"
-            else: 
-                cor_tipo = "#ff4444"
-            
-            ctk.CTkLabel(item, text=data_hora, font=("Arial", 12), width=200).pack(side="left", padx=10, pady=10)
-            ctk.CTkLabel(item, text=tipo, font=("Arial Bold", 12), text_color=cor_tipo, width=150).pack(side="left", padx=10, pady=10)
-            ctk.CTkLabel(item, text=f"R$ {valor:.2f}", font=("Arial", 12), width=150).pack(side="left", padx=10, pady=10)
-            ctk.CTkLabel(item, text=f"R$ {saldo_apos:.2f}", font=("Arial", 12), width=150).pack(side="left", padx=10, pady=10)
+    def _linha_transacao(self, trans):
+        data_hora = formatar_data(trans.get('data'))
+        tipo = trans.get('tipo', 'N/A')
+        valor = trans.get('valor', 0)
+        saldo_apos = trans.get('saldo_apos', 0)
+        
+        if tipo.upper() == "DEPÓSITO":
+            cor_tipo = "#44ff44"
+        elif tipo.upper() == "GANHO":
+            cor_tipo = "#ffdd44"
+        elif tipo.upper() == "APOSTADO":
+            cor_tipo = "#ff8844"
+        else: 
+            cor_tipo = "#ff4444"
+        
+        return [(data_hora, None), (tipo, cor_tipo), (f"R$ {valor:.2f}", None), (f"R$ {saldo_apos:.2f}", None)]
     
-    def _mostrar_historico_jogadas(self):
-        try:
-            jogadas = self.usuario.get_historico_jogadas()
-        except:
-            jogadas = []
-        
-        if not jogadas:
-            ctk.CTkLabel(
-                self.frame_historico_conteudo,
-                text="Nenhuma jogada registrada ainda.",
-                font=("Arial", 16)
-            ).pack(pady=50)
-            return
-        
-        header = ctk.CTkFrame(self.frame_historico_conteudo, fg_color="#0f3460")
-        header.pack(fill="x", pady=(10, 20), padx=10)
-        
-        ctk.CTkLabel(header, text="Data/Hora", font=("Arial Bold", 14), width=180).pack(side="left", padx=5, pady=10)
-        ctk.CTkLabel(header, text="Aposta", font=("Arial Bold", 14), width=100).pack(side="left", padx=5, pady=10)
-        ctk.CTkLabel(header, text="Símbolos", font=("Arial Bold", 14), width=250).pack(side="left", padx=5, pady=10)
-        ctk.CTkLabel(header, text="Prêmio", font=("Arial Bold", 14), width=100).pack(side="left", padx=5, pady=10)
-        ctk.CTkLabel(header, text="Lucro", font=("Arial Bold", 14), width=100).pack(side="left", padx=5, pady=10)
-        
-        for jog in reversed(jogadas[-20:]):
-            item = ctk.CTkFrame(self.frame_historico_conteudo, fg_color="#16213e")
-            item.pack(fill="x", pady=5, padx=10)
-            
-            data_hora = jog.get('data', 'N/A')
-            aposta = jog.get('aposta', 0)
-            simbolos = jog.get('simbolos', [])
-            premio = jog.get('premio', 0)
-            lucro = jog.get('lucro', 0)
-            
-            simbolos_str = " | ".join(simbolos) if simbolos else "N/A"
-            cor_lucro = "#44ff44" if lucro > 0 else ("#ff4444" if lucro < 0 else "#ffffff")
-            
-            ctk.CTkLabel(item, text=data_hora, font=("Arial", 11), width=180).pack(side="left", padx=5, pady=10)
-            ctk.CTkLabel(item, text=f"R$ {aposta:.2f}", font=("Arial", 11), width=100).pack(side="left", padx=5, pady=10)
-            ctk.CTkLabel(item, text=simbolos_str, font=("Arial", 11), width=250).pack(side="left", padx=5, pady=10)
-            ctk.CTkLabel(item, text=f"R$ {premio:.2f}", font=("Arial", 11), width=100).pack(side="left", padx=5, pady=10)
-            ctk.CTkLabel(item, text=f"R$ {lucro:+.2f}", font=("Arial Bold", 11), text_color=cor_lucro, width=100).pack(side="left", padx=5, pady=10)
+    def _linha_jogada(self, jog):
+        data_hora = formatar_data(jog.get('data'))
+        aposta = jog.get('aposta', 0)
+        simbolos = jog.get('simbolos', [])
+        premio = jog.get('premio', 0)
+        lucro = jog.get('lucro', 0)
+        
+        simbolos_str = " | ".join(nome_simbolo(s) for s in simbolos) if simbolos else "N/A"
+        cor_lucro = "#44ff44" if lucro > 0 else ("#ff4444" if lucro < 0 else "#ffffff")
+        
+        return [(data_hora, None), (f"R$ {aposta:.2f}", None), (simbolos_str, None),
+                (f"R$ {premio:.2f}", None), (f"R$ {lucro:+.2f}", cor_lucro)]
     
     def _abrir_deposito(self):
         dialog = ctk.CTkInputDialog(
@@ -927,13 +982,14 @@ class AplicacaoJogo(ctk.CTk):
         if valor_str:
             try:
                 valor = float(valor_str)
-                if valor > 0:
-                    self.usuario.depositar(valor)
-                    self.sistema_auth.atualizar_saldo(self.usuario)
+                if not (valor > 0 and math.isfinite(valor)):
+                    self._mostrar_dialog("❌ Erro", "Valor deve ser positivo!")
+                elif self.usuario.depositar(valor):
+                    self.gravador.marcar(self.usuario)
                     self.label_saldo.configure(text=f"💰 Saldo: R$ {self.usuario.get_saldo():.2f}")
                     self._mostrar_dialog("✅ Depósito Realizado", f"Depósito de R$ {valor:.2f} realizado com sucesso!")
                 else:
-                    self._mostrar_dialog("❌ Erro", "Valor deve ser positivo!")
+                    self._mostrar_dialog("❌ Erro", "Valor de depósito inválido!")
             except ValueError:
                 self._mostrar_dialog("❌ Erro", "Valor inválido!")
     
@@ -954,6 +1010,9 @@ class AplicacaoJogo(ctk.CTk):
         frame = ctk.CTkScrollableFrame(dialog, fg_color="#1a1a2e")
         frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
         
+        from backend.analisador import analisar_maquina, formatar_chance
+        analise = analisar_maquina(self.maquina)
+        
         ctk.CTkLabel(
             frame,
             text="💡 Combinações de 3 símbolos pagam 3x | 2 símbolos pagam 1x | 2 símbolos + 🦁 pagam 2x",
@@ -962,25 +1021,31 @@ class AplicacaoJogo(ctk.CTk):
             wraplength=600
         ).pack(pady=10)
         
-        premios = [
-            ("🦁 🦁 🦁 3 Leões", "60x", "(20 × 3)"),
-            ("💎 💎 💎 3 Diamantes", "150x", "(50 × 3)"),
-            ("⭐ ⭐ ⭐ 3 Estrelas", "15x", "(5 × 3)"),
-            ("🔔 🔔 🔔 3 Sinos", "15x", "(5 × 3)"),
-            ("🍉 🍉 🍉 3 Melancias", "12x", "(4 × 3)"),
-            ("🍇 🍇 🍇 3 Uvas", "10.5x", "(3.5 × 3)"),
-            ("🍊 🍊 🍊 3 Laranjas", "9x", "(3 × 3)"),
-            ("🍋 🍋 🍋 3 Limões", "7.5x", "(2.5 × 3)"),
-            ("🍒 🍒 🍒 3 Cerejas", "6x", "(2 × 3)"),
-            ("", "", ""),
-            ("🦁 🦁 Qualquer | 2 Leões", "20x", "(20 × 1)"),
-            ("💎 💎 Qualquer | 2 Diamantes", "50x", "(50 × 1)"),
-            ("⭐ ⭐ Qualquer | 2 Estrelas", "5x", "(5 × 1)"),
-            ("🔔 🔔 Qualquer | 2 Sinos", "5x", "(5 × 1)"),
-            ("🍉 🍉 Qualquer | 2 Melancias", "4x", "(4 × 1)"),
-            ("", "", ""),
-            ("🦁 Coringa", "🦁 = Qualquer símbolo", "2x bônus"),
-        ]
+        ctk.CTkLabel(
+            frame,
+            text=f"🎯 Chance de ganhar: {float(analise['frequencia_acertos']) * 100:.2f}%   |   "
+                 f"💰 Retorno ao jogador: {float(analise['rtp']) * 100:.2f}%",
+            font=("Arial Bold", 12),
+            text_color="#44ff44"
+        ).pack(pady=(0, 10))
+        
+        premios = []
+        classe_anterior = None
+        for linha in analise["linhas"]:
+            if linha["classe"] == "nenhum":
+                continue
+            if classe_anterior and linha["classe"] != classe_anterior:
+                premios.append(("", "", ""))
+            classe_anterior = linha["classe"]
+            
+            icone, nome = linha["icone"], linha["simbolo"]
+            if linha["classe"] == "trinca":
+                simbolo = f"{icone} {icone} {icone} 3 {nome}"
+            elif linha["classe"] == "coringa":
+                simbolo = f"{icone} {icone} 🦁 | 2 {nome} + Coringa"
+            else:
+                simbolo = f"{icone} {icone} Qualquer | 2 {nome}"
+            premios.append((simbolo, f"{linha['multiplicador']:g}x", formatar_chance(linha["probabilidade"])))
         
         for item_data in premios:
             if len(item_data) == 3:
@@ -1029,6 +1094,7 @@ class AplicacaoJogo(ctk.CTk):
             command=dialog.destroy
         ).pack(pady=10)
     
+    @metricas.cronometrado("renderizacao_dialogo")
     def _mostrar_dialog(self, titulo, mensagem):
         dialog = ctk.CTkToplevel(self)
         dialog.title(titulo)
@@ -1059,17 +1125,57 @@ class AplicacaoJogo(ctk.CTk):
         label.configure(text=mensagem)
         self.after(tempo, lambda: label.configure(text=""))
     
+    def _falha_ao_gravar(self) -> str:
+        # Grava o usuário antes de ele sair; devolve o motivo se a gravação falhou, ou None
+        self.gravador.marcar(self.usuario)
+        if self.gravador.descarregar(usuario=self.usuario):
+            return None
+        if self.sistema_auth.em_conflito(self.usuario):
+            return "Seu saldo foi alterado por outra sessão, então esta não pode mais ser salva."
+        return "Não foi possível salvar seu saldo e histórico."
+    
     def _sair(self):
         if self.usuario:
-            self.sistema_auth.atualizar_saldo(self.usuario)
+            # Conflito de saldo ou erro de disco: a sessão fica aberta em vez de perder saldo e histórico
+            falha = self._falha_ao_gravar()
+            if falha:
+                self._mostrar_dialog("❌ Erro ao Salvar", f"{falha}\n\nA sessão continua aberta. Tente sair novamente.")
+                return
             self.usuario = None
+            from backend.maquina import Maquina
             self.maquina = Maquina()
         self._criar_tela_login()
+    
+    def _fechar_janela(self):
+        if self.usuario and not self._fechamento_recusado:
+            falha = self._falha_ao_gravar()
+            if falha:
+                # Um segundo pedido de fechar sai mesmo assim: um disco com defeito não prende a janela
+                self._fechamento_recusado = True
+                self._mostrar_dialog("❌ Erro ao Salvar", f"{falha}\n\nFeche a janela de novo para sair sem salvar.")
+                return
+        self.relogio.parar()
+        self.gravador.fechar()
+        self.sistema_auth.fechar()
+        self.destroy()
 
 
-def main():
-    app = AplicacaoJogo()
-    app.mainloop()
+def main(perfil=None):
+    app = AplicacaoJogo(perfil)
+    if perfil is None:
+        app.mainloop()
+        return
+    
+    # Só a abertura: pinta a primeira tela, espera o segundo plano e fecha
+    app.update()
+    perfil.marcar("primeira pintura")
+    for nome, tarefa in (("usuários", app._sistema), ("imagens", app._recursos)):
+        try:
+            tarefa.resultado()
+        except Exception:
+            pass  # O erro já foi mostrado pelo evento correspondente
+        perfil.registrar_fundo(nome, tarefa.concluida_em)
+    app._fechar_janela()
 
 
 if __name__ == "__main__":
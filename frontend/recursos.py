@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import unicodedata
+from PIL import Image
+from backend.eventos import eventos, AVISO
+
+
+SIMBOLOS = [
+    "cereja", "limao", "laranja", "uva", "melancia",
+    "sino", "estrela", "leao", "diamante", "loading"
+]
+TAMANHO_SIMBOLO = (100, 100)
+DIRETORIO_CACHE = "dados/cache"
+VERSAO_ATLAS = 1
+
+
+def chave_imagem(nome: str) -> str:
+    # "Limão" -> "limao": o nome do arquivo é o nome do símbolo sem acentos
+    return ''.join(c for c in unicodedata.normalize('NFD', nome.lower()) if unicodedata.category(c) != 'Mn')
+
+
+def chave_atlas(caminhos: list, tamanho: tuple) -> str:
+    resumo = hashlib.sha256(f"{VERSAO_ATLAS}:{tamanho[0]}x{tamanho[1]}".encode())
+    for caminho in caminhos:
+        resumo.update(os.path.basename(caminho).encode())
+        with open(caminho, 'rb') as arquivo:
+            resumo.update(hashlib.sha256(arquivo.read()).digest())
+    return resumo.hexdigest()[:16]
+
+
+def carregar_atlas(diretorio_assets: str = "assets", tamanho: tuple = TAMANHO_SIMBOLO,
+                   diretorio_cache: str = DIRETORIO_CACHE) -> tuple:
+    """Retorna ({símbolo: imagem}, [quadros do GIF]) já no tamanho final, usando o atlas em disco se existir."""
+    fontes = [(nome, os.path.join(diretorio_assets, "simbolos", f"{nome}.png")) for nome in SIMBOLOS]
+    fontes = [(nome, caminho) for nome, caminho in fontes if os.path.exists(caminho)]
+    caminho_gif = os.path.join(diretorio_assets, "roleta_girando.gif")
+    caminhos = [caminho for _, caminho in fontes] + ([caminho_gif] if os.path.exists(caminho_gif) else [])
+    
+    chave = chave_atlas(caminhos, tamanho)
+    base = os.path.join(diretorio_cache, f"atlas-{chave}")
+    try:
+        with open(base + ".json", 'r', encoding='utf-8') as arquivo:
+            indice = json.load(arquivo)
+        atlas = Image.open(base + ".png")
+        atlas.load()
+    except (IOError, ValueError):
+        atlas, indice = _montar_atlas(fontes, caminho_gif if caminho_gif in caminhos else None, tamanho)
+        _salvar_atlas(atlas, indice, base)
+    
+    def recortar(posicao: int) -> Image.Image:
+        x = posicao * tamanho[0]
+        return atlas.crop((x, 0, x + tamanho[0], tamanho[1]))
+    
+    imagens = {nome: recortar(posicao) for nome, posicao in indice["simbolos"].items()}
+    quadros = [recortar(posicao) for posicao in indice["quadros"]]
+    return imagens, quadros
+
+
+def _montar_atlas(fontes: list, caminho_gif: str, tamanho: tuple) -> tuple:
+    sprites = []
+    indice = {"simbolos": {}, "quadros": []}
+    for nome, caminho in fontes:
+        with Image.open(caminho) as imagem:
+            indice["simbolos"][nome] = len(sprites)
+            sprites.append(imagem.convert("RGBA").resize(tamanho, Image.LANCZOS))
+    
+    if caminho_gif:
+        try:
+            with Image.open(caminho_gif) as gif:
+                for i in range(gif.n_frames):
+                    gif.seek(i)
+                    indice["quadros"].append(len(sprites))
+                    sprites.append(gif.convert("RGBA").resize(tamanho, Image.LANCZOS))
+        except Exception as e:
+            eventos.emitir(AVISO, "recurso_indisponivel", mensagem=f"⚠️ Erro ao carregar GIF: {e}")
+            del sprites[len(indice["simbolos"]):]
+            indice["quadros"] = []
+    
+    atlas = Image.new("RGBA", (tamanho[0] * max(len(sprites), 1), tamanho[1]))
+    for posicao, sprite in enumerate(sprites):
+        atlas.paste(sprite, (posicao * tamanho[0], 0))
+    return atlas, indice
+
+
+def _salvar_atlas(atlas: Image.Image, indice: dict, base: str):
+    try:
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        atlas.save(base + ".png.tmp", format="PNG")
+        os.replace(base + ".png.tmp", base + ".png")
+        # O índice é gravado por último: sem ele o atlas é remontado na próxima vez
+        with open(base + ".json.tmp", 'w', encoding='utf-8') as arquivo:
+            json.dump(indice, arquivo)
+        os.replace(base + ".json.tmp", base + ".json")
+    except OSError as e:
+        eventos.emitir(AVISO, "recurso_indisponivel", mensagem=f"⚠️ Aviso: Não foi possível salvar o cache de imagens: {e}")
+
+
+class TarefaFundo:
+    """Roda `funcao(*args)` em uma thread; `resultado()` espera e devolve o retorno ou repassa a exceção."""
+    
+    def __init__(self, funcao, *args):
+        self._retorno = None
+        self._erro = None
+        self._concluida_em = None
+        self._pronto = threading.Event()
+        self._thread = threading.Thread(target=self._executar, args=(funcao, args), daemon=True)
+        self._thread.start()
+    
+    def _executar(self, funcao, args: tuple):
+        try:
+            self._retorno = funcao(*args)
+        except BaseException as e:
+            self._erro = e
+        finally:
+            self._concluida_em = time.perf_counter()
+            self._pronto.set()
+    
+    @property
+    def concluida_em(self) -> float:
+        """Instante (em time.perf_counter) em que a tarefa terminou, ou None se ainda está rodando."""
+        return self._concluida_em
+    
+    def pronto(self) -> bool:
+        return self._pronto.is_set()
+    
+    def resultado(self):
+        self._pronto.wait()
+        if self._erro is not None:
+            raise self._erro
+        return self._retorno
+
+
+class CarregadorRecursos(TarefaFundo):
+    """Carrega o atlas de imagens em uma thread, sem bloquear a interface."""
+    
+    def __init__(self, diretorio_assets: str = "assets", tamanho: tuple = TAMANHO_SIMBOLO,
+                 diretorio_cache: str = DIRETORIO_CACHE):
+        super().__init__(self._carregar, diretorio_assets, tamanho, diretorio_cache)
+    
+    @staticmethod
+    def _carregar(diretorio_assets: str, tamanho: tuple, diretorio_cache: str) -> tuple:
+        try:
+            return carregar_atlas(diretorio_assets, tamanho, diretorio_cache)
+        except Exception as e:
+            eventos.emitir(AVISO, "recurso_indisponivel", mensagem=f"⚠️ Erro ao carregar imagens: {e}")
+            return {}, []
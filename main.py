@@ -1,11 +1,60 @@
+import time
+
+INICIO = time.perf_counter()
+
+import argparse
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from frontend.main_gui import main
+from backend.eventos import mostrar_no_console
+from backend.metricas import metricas, ServidorMetricas
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jogo do Leãozinho")
+    parser.add_argument("--metricas", type=int, default=None, metavar="PORTA",
+                        help="serve as métricas em http://127.0.0.1:PORTA/metrics (formato Prometheus)")
+    parser.add_argument("--metricas-json", default=None, metavar="ARQUIVO",
+                        help="grava um instantâneo JSON das métricas ao fechar o jogo")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="abre o jogo só até a primeira tela, mostra o tempo de cada fase e fecha")
+    args = parser.parse_args()
+    
+    perfil = None
+    if args.profile_startup:
+        from frontend.inicializacao import PerfilInicializacao
+        perfil = PerfilInicializacao(INICIO)
+        perfil.marcar("imports iniciais")
+    
     print("\n🦁 Iniciando Jogo do Leãozinho...")
     print("🎰 Carregando interface gráfica...\n")
-    main()
+    mostrar_no_console()
+    
+    # A interface é importada só aqui: customtkinter e PIL são a maior parte da abertura
+    import customtkinter
+    if perfil:
+        perfil.marcar("import customtkinter")
+    from frontend.main_gui import main
+    if perfil:
+        perfil.marcar("import frontend.main_gui")
+    
+    servidor_metricas = None
+    if args.metricas is not None or args.metricas_json:
+        metricas.ativar()
+    if args.metricas is not None:
+        servidor_metricas = ServidorMetricas(metricas, args.metricas)
+        print(f"📊 Métricas em {servidor_metricas.endereco}")
+    dentro_da_meta = True
+    try:
+        main(perfil)
+    finally:
+        if servidor_metricas is not None:
+            servidor_metricas.fechar()
+        if args.metricas_json:
+            metricas.salvar_json(args.metricas_json)
+        if perfil:
+            # Mostrado mesmo se a janela não abrir: as fases alcançadas ainda dizem onde foi o tempo
+            texto, dentro_da_meta = perfil.relatorio()
+            print(texto)
+    sys.exit(0 if dentro_da_meta else 1)
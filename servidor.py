@@ -0,0 +1,309 @@
+import argparse
+import asyncio
+import functools
+import json
+import math
+import os
+import signal
+import sys
+import weakref
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend import Maquina, SistemaAutenticacao, GravadorAssincrono, ArquivoEventos
+from backend.eventos import eventos, ERRO
+from backend.metricas import metricas, ServidorMetricas
+
+
+SALDO_MINIMO_SAQUE = 50.0
+INTERVALO_GRAVACAO = 0.2
+
+
+def _valor_positivo(valor) -> float:
+    # Só números JSON: true e "10" viram "Parâmetros inválidos" em vez de uma aposta
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise TypeError(f"Valor não numérico: {valor!r}")
+    # json.loads aceita Infinity, NaN e inteiros enormes: esses valores nunca chegam ao saldo
+    try:
+        valor = float(valor)
+    except OverflowError:
+        return None
+    return valor if math.isfinite(valor) and valor > 0 else None
+
+
+class Sessao:
+    def __init__(self):
+        self.usuario = None
+        self.maquina = Maquina()
+
+
+class ServidorJogo:
+    """Servidor asyncio com um único SistemaAutenticacao e uma Maquina por sessão.
+    
+    Protocolo: uma requisição JSON por linha ({"op": "login", ...}) e uma resposta JSON por linha.
+    """
+    
+    def __init__(self, arquivo_dados: str = "dados/usuarios.json"):
+        self._sistema_auth = SistemaAutenticacao(arquivo_dados)
+        # Agrupa as gravações de todas as sessões em vez de gravar a cada giro, fora do laço de eventos
+        self._gravador = GravadorAssincrono(self._sistema_auth, INTERVALO_GRAVACAO)
+        # Um único objeto Usuario por conta, compartilhado por todas as sessões dela
+        self._usuarios_ativos = {}
+        self._sessoes_por_usuario = {}
+        # Um login por conta de cada vez: a conta não pode ser ativada por outra conexão enquanto este lê o disco
+        self._travas_login = weakref.WeakValueDictionary()
+        self._operacoes = {
+            "cadastrar": self._cadastrar,
+            "login": self._login,
+            "saldo": self._saldo,
+            "girar": self._girar,
+            "depositar": self._depositar,
+            "sacar": self._sacar,
+            "sair": self._sair
+        }
+    
+    async def tratar_conexao(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        sessao = Sessao()
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                resposta = await self.processar(sessao, linha)
+                escritor.write(json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n")
+                await escritor.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._encerrar_sessao(sessao)
+            escritor.close()
+    
+    async def processar(self, sessao: Sessao, linha: bytes) -> dict:
+        try:
+            requisicao = json.loads(linha)
+            operacao = self._operacoes[requisicao["op"]]
+        except (ValueError, KeyError, TypeError):
+            return {"ok": False, "erro": "Requisição inválida."}
+        
+        if operacao not in (self._cadastrar, self._login) and sessao.usuario is None:
+            return {"ok": False, "erro": "Nenhum usuário logado."}
+        
+        try:
+            with metricas.cronometro("op_" + requisicao["op"]):
+                resposta = operacao(sessao, requisicao)
+                # Cadastro e login vão ao disco: são corrotinas que esperam uma thread
+                return await resposta if asyncio.iscoroutine(resposta) else resposta
+        except (ValueError, KeyError, TypeError):
+            return {"ok": False, "erro": "Parâmetros inválidos."}
+        except Exception as e:
+            # Uma falha inesperada responde com erro em vez de derrubar a conexão
+            eventos.emitir(ERRO, "requisicao_falhou", op=requisicao["op"], erro=repr(e),
+                           mensagem=f"❌ Erro ao processar '{requisicao['op']}': {e}")
+            return {"ok": False, "erro": "Erro interno."}
+    
+    async def _cadastrar(self, sessao: Sessao, requisicao: dict) -> dict:
+        argumentos = (
+            requisicao["nome"], requisicao["senha"],
+            requisicao.get("nome_completo", ""), requisicao.get("cpf", ""),
+            requisicao.get("email", ""), requisicao.get("telefone", "")
+        )
+        ok = await asyncio.get_running_loop().run_in_executor(None, self._sistema_auth.cadastrar, *argumentos)
+        return {"ok": ok} if ok else {"ok": False, "erro": "Cadastro recusado."}
+    
+    async def _login(self, sessao: Sessao, requisicao: dict) -> dict:
+        nome, senha = requisicao["nome"], requisicao["senha"]
+        trava = self._travas_login.get(nome)
+        if trava is None:
+            trava = self._travas_login[nome] = asyncio.Lock()
+        
+        async with trava:
+            usuario = self._usuarios_ativos.get(nome)
+            if usuario is not None and self._sistema_auth.em_conflito(usuario):
+                self._usuarios_ativos.pop(nome)
+                usuario = None
+            if usuario is not None:
+                # Conta já ativa: só a senha é conferida, sem reler o disco
+                if not usuario.verificar_senha(senha):
+                    usuario = None
+            else:
+                usuario = await asyncio.get_running_loop().run_in_executor(None, self._sistema_auth.login, nome, senha)
+            
+            if usuario is None:
+                return {"ok": False, "erro": "Usuário ou senha incorretos."}
+            
+            self._encerrar_sessao(sessao)
+            self._usuarios_ativos[nome] = usuario
+            self._sessoes_por_usuario[nome] = self._sessoes_por_usuario.get(nome, 0) + 1
+            sessao.usuario = usuario
+            sessao.maquina.definir_usuario(usuario)
+            return {"ok": True, "saldo": usuario.get_saldo()}
+    
+    def _saldo(self, sessao: Sessao, requisicao: dict) -> dict:
+        return {"ok": True, "saldo": sessao.usuario.get_saldo()}
+    
+    def _girar(self, sessao: Sessao, requisicao: dict) -> dict:
+        aposta = _valor_positivo(requisicao["aposta"])
+        if aposta is None:
+            return {"ok": False, "erro": "Aposta inválida."}
+        if not sessao.usuario.pode_apostar(aposta):
+            return {"ok": False, "erro": "Saldo insuficiente.", "saldo": sessao.usuario.get_saldo()}
+        
+        resultado = sessao.maquina.jogar_lote(1, aposta)
+        if resultado["jogadas"] == 0:
+            # A liquidação recusou o giro: saldo que mudou no meio ou prêmio fora da faixa do histórico
+            return {"ok": False, "erro": "Aposta inválida.", "saldo": resultado["saldo"]}
+        self._marcar_pendente(sessao.usuario)
+        roletas = sessao.maquina.roletas
+        paradas = list(resultado["paradas"])
+        return {
+            "ok": True,
+            "simbolos": [roleta.simbolos[parada].nome for roleta, parada in zip(roletas, paradas)],
+            "premio": resultado["total_premios"],
+            "saldo": resultado["saldo"]
+        }
+    
+    def _depositar(self, sessao: Sessao, requisicao: dict) -> dict:
+        valor = _valor_positivo(requisicao["valor"])
+        if valor is None or not sessao.usuario.depositar(valor):
+            return {"ok": False, "erro": "Valor inválido."}
+        self._marcar_pendente(sessao.usuario)
+        return {"ok": True, "saldo": sessao.usuario.get_saldo()}
+    
+    def _sacar(self, sessao: Sessao, requisicao: dict) -> dict:
+        usuario = sessao.usuario
+        valor = _valor_positivo(requisicao["valor"])
+        chave_pix = str(requisicao.get("chave_pix", ""))
+        
+        if valor is None:
+            return {"ok": False, "erro": "Valor inválido."}
+        if usuario.get_saldo() < SALDO_MINIMO_SAQUE:
+            return {"ok": False, "erro": f"Saldo mínimo para saque: R$ {SALDO_MINIMO_SAQUE:.2f}."}
+        if self._sistema_auth.campo_chave_pix(usuario.nome, chave_pix) is None:
+            return {"ok": False, "erro": "A chave PIX deve ser o CPF, email ou telefone cadastrado."}
+        if not usuario.sacar(valor):
+            return {"ok": False, "erro": "Valor inválido ou saldo insuficiente."}
+        
+        usuario.atualizar_chave_pix(chave_pix)
+        self._marcar_pendente(usuario)
+        return {"ok": True, "saldo": usuario.get_saldo()}
+    
+    def _sair(self, sessao: Sessao, requisicao: dict) -> dict:
+        self._encerrar_sessao(sessao)
+        return {"ok": True}
+    
+    def _marcar_pendente(self, usuario):
+        self._gravador.marcar(usuario)
+    
+    def _encerrar_sessao(self, sessao: Sessao):
+        usuario = sessao.usuario
+        if usuario is None:
+            return
+        
+        self._gravador.marcar(usuario)
+        restantes = self._sessoes_por_usuario.get(usuario.nome, 1) - 1
+        if restantes <= 0:
+            self._sessoes_por_usuario.pop(usuario.nome, None)
+            self._liberar_apos_gravacao(usuario)
+        else:
+            self._sessoes_por_usuario[usuario.nome] = restantes
+        sessao.usuario = None
+        sessao.maquina = Maquina()
+    
+    def _liberar_apos_gravacao(self, usuario):
+        # O objeto continua ativo até a gravação terminar: um login nesse meio tempo segue com ele em vez de
+        # reler do repositório um saldo antigo. A espera fica numa thread, fora do laço de eventos.
+        try:
+            laco = asyncio.get_running_loop()
+        except RuntimeError:
+            self._concluir_gravacao(usuario, self._gravador.descarregar(usuario=usuario))
+            return
+        gravacao = laco.run_in_executor(None, functools.partial(self._gravador.descarregar, usuario=usuario))
+        gravacao.add_done_callback(lambda futuro: self._concluir_gravacao(
+            usuario, not futuro.cancelled() and futuro.exception() is None and futuro.result()))
+    
+    def _concluir_gravacao(self, usuario, gravado: bool):
+        if gravado:
+            self._liberar(usuario)
+            return
+        # A gravação falhou: o objeto continua ativo, e um login segue com o saldo da memória em vez do
+        # que ficou no disco; a marcação faz o gravador tentar de novo
+        self._gravador.marcar(usuario)
+    
+    def _liberar(self, usuario):
+        if usuario.nome not in self._sessoes_por_usuario and self._usuarios_ativos.get(usuario.nome) is usuario:
+            del self._usuarios_ativos[usuario.nome]
+    
+    def gravar_pendentes(self):
+        self._gravador.descarregar()
+    
+    @property
+    def estatisticas_gravacao(self) -> dict:
+        return self._gravador.estatisticas()
+    
+    async def executar(self, host: str = "127.0.0.1", porta: int = 8765, caminho_unix: str = None):
+        if caminho_unix:
+            servidor = await asyncio.start_unix_server(self.tratar_conexao, path=caminho_unix)
+            endereco = caminho_unix
+        else:
+            servidor = await asyncio.start_server(self.tratar_conexao, host, porta)
+            endereco = f"{host}:{porta}"
+        
+        parada = asyncio.Event()
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                asyncio.get_running_loop().add_signal_handler(sinal, parada.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: Ctrl+C continua gerando KeyboardInterrupt
+        
+        print(f"🦁 Servidor do Jogo do Leãozinho ouvindo em {endereco}")
+        try:
+            async with servidor:
+                await parada.wait()
+        finally:
+            self._gravador.fechar()
+            self._sistema_auth.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor headless do Jogo do Leãozinho")
+    parser.add_argument("--dados", default="dados/usuarios.json")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="caminho de um socket Unix (em vez de TCP)")
+    parser.add_argument("--eventos", default=None, help="arquivo JSON Lines para os eventos do jogo")
+    parser.add_argument("--metricas", type=int, default=None, metavar="PORTA",
+                        help="serve as métricas em http://127.0.0.1:PORTA/metrics (formato Prometheus)")
+    parser.add_argument("--metricas-json", default=None, metavar="ARQUIVO",
+                        help="grava um instantâneo JSON das métricas ao encerrar")
+    args = parser.parse_args()
+    
+    servidor_metricas = None
+    if args.metricas is not None or args.metricas_json:
+        metricas.ativar()
+    if args.metricas is not None:
+        servidor_metricas = ServidorMetricas(metricas, args.metricas)
+        print(f"📊 Métricas em {servidor_metricas.endereco}")
+    
+    arquivo_eventos = None
+    if args.eventos:
+        arquivo_eventos = ArquivoEventos(args.eventos)
+        eventos.assinar(arquivo_eventos)
+    
+    servidor = ServidorJogo(args.dados)
+    try:
+        asyncio.run(servidor.executar(args.host, args.porta, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if servidor_metricas is not None:
+            servidor_metricas.fechar()
+        if args.metricas_json:
+            metricas.salvar_json(args.metricas_json)
+        if arquivo_eventos is not None:
+            eventos.cancelar(arquivo_eventos)
+            arquivo_eventos.fechar()
+    print("\n👋 Servidor encerrado.")
+
+
+if __name__ == "__main__":
+    main()